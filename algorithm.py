@@ -0,0 +1,165 @@
+'''
+This file contains the algorithm compiler that turns move strings written in
+cube notation into a single sticker permutation
+
+An algorithm string may use any move accepted by Rubiks_Cube.move, wide
+moves written as Rw, moves repeated with a number (R3 is the same as R'),
+and brackets that can be nested, repeated and inverted, such as
+"F (R U R' U')2 F'" or "(R U R' U')3". Moves that cancel or combine are
+simplified, including across other moves on the same axis (R L R' is L),
+and the result is composed into one permutation so applying an algorithm
+of any length costs one gather. Compiled algorithms are cached by their text.
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+import re
+from functools import lru_cache
+from operator import itemgetter
+
+from move_tables import move_perms, compose, identity
+
+axes = {'R':'x', 'L':'x', 'M':'x', 'r':'x', 'l':'x', 'x':'x',
+        'U':'y', 'D':'y', 'E':'y', 'u':'y', 'd':'y', 'y':'y',
+        'F':'z', 'B':'z', 'S':'z', 'f':'z', 'b':'z', 'z':'z'}
+''' maps each move letter to the axis it turns around, moves on the same axis commute '''
+
+suffixes = {1:'', 2:'2', 3:"'"}
+''' maps a number of clockwise quarter turns to its suffix in cube notation '''
+
+token_pattern = re.compile(r"\s*(?:([RLFBUDMSExyzrlfbud])(w?)(\d*)('?)|(\()|(\))(\d*)('?)|(\S))")
+''' matches one move, opening bracket or closing bracket with its repeat count '''
+
+def parse(algorithm):
+    ''' Read an algorithm string into a list of moves
+        Parameters:
+            algorithm - moves in cube notation, with optional brackets
+        Returns: list of (move letter, clockwise quarter turns 1-3) pairs
+        Raises: ValueError if the string is not valid cube notation '''
+
+    stack = [[]]
+    position = 0
+    algorithm = algorithm.rstrip()
+
+    while position < len(algorithm):
+        match = token_pattern.match(algorithm, position)
+        letter, wide, count, prime, opening, closing, group_count, group_prime, bad = match.groups()
+        if bad is not None:
+            raise ValueError('unexpected ' + repr(bad) + ' at position ' + str(match.start(9)))
+
+        if letter is not None:
+            if wide:
+                if letter not in 'RLFBUD':
+                    raise ValueError('only face moves can be wide, at position ' + str(match.start(1)))
+                letter = letter.lower()
+            turns = (int(count) if count else 1) * (-1 if prime else 1) % 4
+            if turns:
+                stack[-1].append((letter, turns))
+        elif opening is not None:
+            stack.append([])
+        else:
+            if len(stack) == 1:
+                raise ValueError('unmatched ) at position ' + str(match.start(6)))
+            group = stack.pop()
+            if group_prime:
+                group = invert(group)
+            stack[-1].extend(group * (int(group_count) if group_count else 1))
+
+        position = match.end()
+
+    if len(stack) != 1:
+        raise ValueError('unmatched ( in ' + repr(algorithm))
+    return stack[0]
+
+def invert(moves):
+    ''' Get the moves that undo a list of moves
+        Parameters:
+            moves - list of (move letter, quarter turns) pairs
+        Returns: list of (move letter, quarter turns) pairs '''
+
+    return [(letter, 4 - turns) for letter, turns in reversed(moves)]
+
+def simplify(moves):
+    ''' Combine and cancel moves that follow each other on the same axis,
+        so R R' disappears, U U2 becomes U' and R L R' becomes L
+        Parameters:
+            moves - list of (move letter, quarter turns) pairs
+        Returns: simplified list of (move letter, quarter turns) pairs '''
+
+    result = []
+    for letter, turns in moves:
+        axis = axes[letter]
+        i = len(result) - 1
+        while i >= 0 and axes[result[i][0]] == axis and result[i][0] != letter:
+            i -= 1
+
+        if i >= 0 and result[i][0] == letter:
+            turns = (result[i][1] + turns) % 4
+            if turns:
+                result[i] = (letter, turns)
+            else:
+                del result[i]
+        else:
+            result.append((letter, turns))
+
+    return result
+
+def to_moves(moves):
+    ''' Write a list of (move letter, quarter turns) pairs as move strings
+        that Rubiks_Cube.move accepts '''
+
+    return [letter + suffixes[turns] for letter, turns in moves]
+
+class Algorithm:
+    ''' This class represents an algorithm that has been parsed, simplified
+        and compiled into one sticker permutation '''
+
+    def __init__(self, algorithm):
+        ''' Compile the passed algorithm
+            Parameters:
+                algorithm - moves in cube notation, with optional brackets
+            Raises: ValueError if the string is not valid cube notation '''
+
+        self.text = algorithm
+        self.moves = to_moves(simplify(parse(algorithm)))
+
+        perm = identity
+        for move in self.moves:
+            perm = compose(perm, move_perms[move])
+        self.perm = perm
+        self.gather = itemgetter(*perm)
+
+    def __str__(self):
+        ''' Returns the simplified algorithm in cube notation '''
+
+        return ' '.join(self.moves)
+
+    def __len__(self):
+        ''' Returns the number of moves in the simplified algorithm '''
+
+        return len(self.moves)
+
+    def inverse(self):
+        ''' Returns the compiled algorithm that undoes this one '''
+
+        return compile_algorithm(' '.join(to_moves(invert(parse(str(self))))))
+
+    def apply(self, cube):
+        ''' Apply the whole algorithm to a cube with a single gather
+            Parameters:
+                cube - Rubiks_Cube to turn '''
+
+        cube.state[:] = self.gather(cube.state)
+
+@lru_cache(maxsize = 4096)
+def compile_algorithm(algorithm):
+    ''' Compile an algorithm string, reusing the result every time the
+        same string is compiled again
+        Parameters:
+            algorithm - moves in cube notation, with optional brackets
+        Returns: Algorithm
+        Raises: ValueError if the string is not valid cube notation '''
+
+    return Algorithm(algorithm)
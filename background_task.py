@@ -0,0 +1,94 @@
+'''
+This file contains the Background_Task class which runs slow work such as
+solving or finding hints on a worker thread while the Tk window stays usable
+
+Tk widgets may only be touched from the thread running mainloop, so the
+worker never calls back into the GUI. It leaves its result behind and the
+main loop checks for it with root.after every few milliseconds, showing
+progress while it waits.
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+import threading
+from time import perf_counter
+
+class Background_Task:
+    ''' This class represents one function call running on a worker thread
+        whose result is handed back to the Tk main loop '''
+
+    def __init__(self, root, function, on_done, on_error = None, on_progress = None,
+                 on_cancel = None, poll_ms = 50):
+        ''' Start running the function on a worker thread
+            Parameters:
+                root - Tk root whose after method is used to check on the task
+                function - function with no parameters to run on the worker
+                on_done - called on the main loop with the function's result
+                on_error - called on the main loop with the exception if the
+                    function raised one
+                on_progress - called on the main loop every poll with the
+                    seconds the task has been running
+                on_cancel - called when the task is cancelled, to tell the
+                    function to stop early
+                poll_ms - milliseconds between checks on the worker '''
+
+        self.root = root
+        self.function = function
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.poll_ms = poll_ms
+
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self.handed_over = False
+        self.finished = threading.Event()
+        self.start = perf_counter()
+
+        self.thread = threading.Thread(target = self.run, daemon = True)
+        self.thread.start()
+        self.root.after(self.poll_ms, self.poll)
+
+    def run(self):
+        ''' Call the function on the worker thread and keep its result '''
+
+        try:
+            self.result = self.function()
+        except Exception as error:
+            self.error = error
+        self.finished.set()
+
+    def poll(self):
+        ''' Check on the worker from the main loop, handing over the result
+            once it is ready and checking again later if it isn't '''
+
+        if self.cancelled:
+            return
+        if not self.finished.is_set():
+            if self.on_progress is not None:
+                self.on_progress(perf_counter() - self.start)
+            self.root.after(self.poll_ms, self.poll)
+        else:
+            self.handed_over = True
+            if self.error is not None:
+                if self.on_error is not None:
+                    self.on_error(self.error)
+            else:
+                self.on_done(self.result)
+
+    def is_running(self):
+        ''' Returns True until the result has been handed over or the task is cancelled '''
+
+        # a finished task is still running until the main loop has its result
+        return not self.cancelled and not self.handed_over
+
+    def cancel(self):
+        ''' Stop waiting for the task, its result will be thrown away '''
+
+        self.cancelled = True
+        if self.on_cancel is not None:
+            self.on_cancel()
@@ -0,0 +1,178 @@
+'''
+This file contains the headless batch runner that applies a stream of
+scrambles to Rubiks_Cube models on every core and writes one JSON result
+per scramble
+
+Scrambles are read one per line from a file or stdin, in any notation
+accepted by algorithm.compile_algorithm. Lines are sent to a process pool in
+chunks, and only a few chunks per worker are in flight at a time, so memory
+stays flat no matter how long the input is. Results are written in the same
+order as the input.
+
+Usage:
+    python batch_runner.py scrambles.txt -o results.jsonl --hint --solve --cfop
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from rubix_cube import Rubiks_Cube
+
+worker_options = {}
+''' options of the current run, set in each worker by init_worker '''
+
+solution_cache = None
+''' State_Cache of the solutions found by the current worker, so repeated
+    positions and their rotations are only solved once '''
+
+def init_worker(options):
+    ''' Set up a worker process, loading the solver tables once up front
+        Parameters:
+            options - dictionary of the run's options '''
+
+    global solution_cache
+    worker_options.update(options)
+    if options.get('solve'):
+        import two_phase_solver
+        two_phase_solver.get_tables()
+        if options.get('cache_size'):
+            from state_cache import State_Cache
+            solution_cache = State_Cache(options['cache_size'])
+    if options.get('cfop'):
+        import cfop_solver
+        cfop_solver.get_solver()
+
+def process_line(line_number, text):
+    ''' Scramble a cube with one input line and describe the result
+        Parameters:
+            line_number - line of the input the scramble came from
+            text - scramble in cube notation
+        Returns: dictionary of results '''
+
+    result = {'line': line_number, 'scramble': text}
+    cube = Rubiks_Cube()
+    try:
+        cube.apply_algorithm(text)
+    except (ValueError, KeyError) as error:
+        result['error'] = str(error)
+        return result
+
+    result['state'] = ''.join(str(color) for color in cube.state)
+    if worker_options.get('hint'):
+        result['hint'] = cube.get_hint()
+    if worker_options.get('cfop'):
+        import cfop_solver
+        result['cfop'] = [list(step) for step in cfop_solver.solve(cube)]
+    if worker_options.get('solve'):
+        import two_phase_solver
+        solution = two_phase_solver.solve(cube, worker_options['max_length'], worker_options['max_time'], solution_cache)
+        result['solution'] = ' '.join(solution) if solution is not None else None
+    return result
+
+def process_chunk(chunk):
+    ''' Process a chunk of input lines in a worker
+        Parameters:
+            chunk - list of (line number, scramble) pairs
+        Returns: list of JSON lines '''
+
+    return [json.dumps(process_line(line_number, text)) for line_number, text in chunk]
+
+def read_chunks(lines, chunk_size):
+    ''' Group non-blank input lines into chunks
+        Parameters:
+            lines - iterable of input lines
+            chunk_size - number of scrambles per chunk
+        Returns: generator of lists of (line number, scramble) pairs '''
+
+    chunk = []
+    for line_number, line in enumerate(lines, 1):
+        text = line.strip()
+        if text:
+            chunk.append((line_number, text))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def run(lines, output, options, workers = None, chunk_size = 1000):
+    ''' Process every scramble and write the results in input order
+        Parameters:
+            lines - iterable of input lines
+            output - file to write JSON lines to
+            options - dictionary with 'hint', 'solve', 'cfop', 'max_length',
+                'max_time' and 'cache_size'
+            workers - number of worker processes, all cores if None, and
+                1 to run in this process
+            chunk_size - number of scrambles sent to a worker at a time
+        Returns: number of scrambles processed '''
+
+    workers = workers or os.cpu_count() or 1
+    count = 0
+
+    if workers == 1:
+        init_worker(options)
+        for chunk in read_chunks(lines, chunk_size):
+            output.write('\n'.join(process_chunk(chunk)) + '\n')
+            count += len(chunk)
+        return count
+
+    # a bounded queue of pending chunks keeps memory flat and the output in order
+    pending = deque()
+    with ProcessPoolExecutor(workers, initializer = init_worker, initargs = (options,)) as pool:
+        for chunk in read_chunks(lines, chunk_size):
+            if len(pending) >= 2 * workers:
+                results = pending.popleft().result()
+                output.write('\n'.join(results) + '\n')
+                count += len(results)
+            pending.append(pool.submit(process_chunk, chunk))
+        while pending:
+            results = pending.popleft().result()
+            output.write('\n'.join(results) + '\n')
+            count += len(results)
+
+    return count
+
+def main(argv = None):
+    ''' Run the batch runner from the command line
+        Parameters:
+            argv - command line arguments, sys.argv if None
+        Returns: exit status '''
+
+    parser = argparse.ArgumentParser(description = 'Apply scrambles to cube models on every core and write JSON lines.')
+    parser.add_argument('input', nargs = '?', default = '-', help = 'file with one scramble per line, - for stdin')
+    parser.add_argument('-o', '--output', default = '-', help = 'file to write JSON lines to, - for stdout')
+    parser.add_argument('--hint', action = 'store_true', help = 'include the hint for each scrambled cube')
+    parser.add_argument('--solve', action = 'store_true', help = 'include a two-phase solution for each scrambled cube')
+    parser.add_argument('--cfop', action = 'store_true', help = 'include the CFOP stages (stage, AUF, algorithm) for each scrambled cube')
+    parser.add_argument('--max-length', type = int, default = 22, help = 'most moves in a solution')
+    parser.add_argument('--max-time', type = float, default = 3.0, help = 'seconds to search for each solution')
+    parser.add_argument('--cache-size', type = int, default = 100000,
+                        help = 'solutions each worker remembers for repeated positions, 0 to turn off')
+    parser.add_argument('-j', '--workers', type = int, default = None, help = 'number of worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type = int, default = 1000, help = 'scrambles sent to a worker at a time')
+    args = parser.parse_args(argv)
+
+    options = {'hint': args.hint, 'solve': args.solve, 'cfop': args.cfop, 'max_length': args.max_length, 'max_time': args.max_time,
+               'cache_size': args.cache_size}
+    source = sys.stdin if args.input == '-' else open(args.input)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        run(source, output, options, args.workers, args.chunk_size)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,237 @@
+'''
+This file contains the benchmark suite for the hot paths of the cube model
+and its GUI
+
+Each benchmark runs its operation in a loop for a short while, a few times
+over, and reports the best rate in operations per second. Results can be
+written as JSON, saved as a baseline, and compared against a saved baseline,
+in which case the exit status is 1 if any benchmark got slower than the
+allowed threshold.
+
+Usage:
+    python benchmarks.py --save-baseline baseline.json
+    python benchmarks.py --baseline baseline.json --threshold 0.2 --json results.json
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+from algorithm import compile_algorithm
+from rubix_cube import Rubiks_Cube
+
+move_types = {
+    'face': ['R', 'L', 'F', 'B', 'U', 'D'],
+    'slice': ['M', 'S', 'E'],
+    'wide': ['r', 'l', 'f', 'b', 'u', 'd'],
+    'rotation': ['x', 'y', 'z'],
+    'prime': ["R'", "U'", "F'", "M'", "r'", "x'"],
+    'double': ['R2', 'U2', 'F2', 'M2', 'r2', 'x2'],
+}
+''' move tokens timed for each type of move '''
+
+hint_algorithms = ["R U R' U R U2 R'", "F R U R' U' F'", "r U R' U' r' F R F'",
+                   "R U2 R2 F R F' U2 R' F R F'", "F R U R' U' R U R' U' F'"]
+''' algorithms undone on a solved cube to make the fixed OLL states for get_hint '''
+
+gui_benchmarks = ('generate_scramble', 'display_cube')
+''' benchmarks that need a Tk display '''
+
+def fixed_scrambles(count = 100, length = 20, seed = 2022):
+    ''' Make the same list of random face-turn scrambles on every run '''
+
+    rng = random.Random(seed)
+    moves = [face + suffix for face in 'RLFBUD' for suffix in ('', "'", '2')]
+    return [[rng.choice(moves) for i in range(length)] for j in range(count)]
+
+def time_rate(operation, operations_per_call = 1, min_time = 0.2, repeats = 3):
+    ''' Measure how many operations per second a function performs
+        Parameters:
+            operation - function with no parameters to call repeatedly
+            operations_per_call - number of operations one call performs
+            min_time - seconds each timing run should last at least
+            repeats - number of timing runs, the best one is kept
+        Returns: operations per second '''
+
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for i in range(calls):
+            operation()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10:
+            break
+        calls *= 10
+    calls = max(1, int(calls * min_time / elapsed))
+
+    best = 0.0
+    for i in range(repeats):
+        start = time.perf_counter()
+        for j in range(calls):
+            operation()
+        elapsed = time.perf_counter() - start
+        best = max(best, calls * operations_per_call / elapsed)
+    return best
+
+def bench_moves(min_time):
+    ''' Time Rubiks_Cube.move for every type of move token '''
+
+    results = {}
+    cube = Rubiks_Cube()
+    for move_type, moves in move_types.items():
+        def operation():
+            for move in moves:
+                cube.move(move)
+        results['move_' + move_type] = (time_rate(operation, len(moves), min_time), 'moves/s')
+    return results
+
+def bench_model(min_time):
+    ''' Time clone, scramble and get_hint '''
+
+    results = {}
+    cube = Rubiks_Cube()
+    cube.scramble(fixed_scrambles(1)[0])
+    results['clone'] = (time_rate(cube.clone, 1, min_time), 'clones/s')
+
+    scrambles = fixed_scrambles()
+    def scramble():
+        for moves in scrambles:
+            cube.scramble(moves)
+    results['scramble_20'] = (time_rate(scramble, len(scrambles), min_time), 'scrambles/s')
+
+    hint_cubes = []
+    for algorithm in hint_algorithms:
+        hint_cube = Rubiks_Cube()
+        compile_algorithm(algorithm).inverse().apply(hint_cube)
+        hint_cubes.append(hint_cube)
+    def get_hints():
+        for hint_cube in hint_cubes:
+            hint_cube.get_hint()
+    results['get_hint_OLL'] = (time_rate(get_hints, len(hint_cubes), min_time), 'hints/s')
+    return results
+
+def bench_interface(min_time):
+    ''' Time Cube_Interface.generate_scramble and display_cube on a
+        withdrawn Tk window
+        Returns: (results, skipped) dictionaries '''
+
+    try:
+        from cube_interface import Cube_Interface
+        interface = Cube_Interface(Rubiks_Cube())
+    except Exception as error:
+        reason = type(error).__name__ + ': ' + str(error)
+        return {}, {name: reason for name in gui_benchmarks}
+
+    results = {}
+    try:
+        interface.root.withdraw()
+        results['generate_scramble'] = (time_rate(interface.generate_scramble, 1, min_time), 'scrambles/s')
+
+        moves = ['R', 'U', "F'", 'D2']
+        def display():
+            for move in moves:
+                interface.cube.move(move)
+                interface.display_cube()
+        results['display_cube'] = (time_rate(display, len(moves), min_time), 'redraws/s')
+    finally:
+        interface.root.destroy()
+    return results, {}
+
+def run_benchmarks(min_time = 0.2, include_gui = True):
+    ''' Run every benchmark
+        Parameters:
+            min_time - seconds each timing run should last at least
+            include_gui - whether to time the Tk interface
+        Returns: dictionary with the results and any skipped benchmarks '''
+
+    results = {}
+    results.update(bench_moves(min_time))
+    results.update(bench_model(min_time))
+    if include_gui:
+        gui_results, skipped = bench_interface(min_time)
+        results.update(gui_results)
+    else:
+        skipped = {name: 'run with --no-gui' for name in gui_benchmarks}
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'benchmarks': {name: {'rate': rate, 'unit': unit} for name, (rate, unit) in results.items()},
+        'skipped': skipped,
+    }
+
+def compare(results, baseline, threshold):
+    ''' Find the benchmarks that got slower than a baseline allows
+        Parameters:
+            results - results of run_benchmarks
+            baseline - results of an earlier run
+            threshold - fraction a rate may drop by before it counts as a regression
+        Returns: (list of (name, baseline rate, current rate) for each
+            regression, list of the names in the baseline that were neither
+            run nor skipped) '''
+
+    regressions = []
+    missing = []
+    for name, old in baseline['benchmarks'].items():
+        new = results['benchmarks'].get(name)
+        if new is None:
+            # a renamed or dropped benchmark would otherwise never be compared again
+            if name not in results['skipped']:
+                missing.append(name)
+        elif new['rate'] < old['rate'] * (1 - threshold):
+            regressions.append((name, old['rate'], new['rate']))
+    return regressions, missing
+
+def main(argv = None):
+    ''' Run the benchmark suite from the command line
+        Parameters:
+            argv - command line arguments, sys.argv if None
+        Returns: exit status, 1 if there were regressions or baseline
+            benchmarks that weren't run '''
+
+    parser = argparse.ArgumentParser(description = 'Benchmark the cube model and GUI hot paths.')
+    parser.add_argument('--json', help = 'file to write the results to as JSON')
+    parser.add_argument('--baseline', help = 'results file to compare against')
+    parser.add_argument('--save-baseline', help = 'file to save the results to as the new baseline')
+    parser.add_argument('--threshold', type = float, default = 0.2,
+                        help = 'fraction a rate may drop by before it is a regression (default: 0.2)')
+    parser.add_argument('--min-time', type = float, default = 0.2, help = 'seconds per timing run')
+    parser.add_argument('--no-gui', action = 'store_true', help = 'skip the Tk interface benchmarks')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.min_time, not args.no_gui)
+
+    for name, result in results['benchmarks'].items():
+        print('{:<20} {:>14,.0f} {}'.format(name, result['rate'], result['unit']))
+    for name, reason in results['skipped'].items():
+        print('{:<20} skipped ({})'.format(name, reason))
+
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, 'w') as file:
+                json.dump(results, file, indent = 2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions, missing = compare(results, baseline, args.threshold)
+        for name, old, new in regressions:
+            print('REGRESSION {}: {:,.0f} -> {:,.0f} ({:.0%})'.format(name, old, new, new / old - 1))
+        for name in baseline['benchmarks']:
+            if name in results['skipped']:
+                print('NOT COMPARED {}: in the baseline but skipped ({})'.format(name, results['skipped'][name]))
+        for name in missing:
+            print('MISSING {}: in the baseline but not run'.format(name))
+        if regressions or missing:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,334 @@
+'''
+This file contains the CFOP_Solver class which solves a Rubiks_Cube one
+stage at a time the way a person would: the cross on the D face, the four
+F2L pairs, then OLL and PLL on the U face
+
+Every stage is a table lookup. The cross comes from a table holding how many
+moves every position of the four cross edges is from solved. Each F2L pair
+is inserted with triggers such as R U R' and F' U F that only move the U
+layer and one slot, so they can't break the cross or a solved pair, and a
+table built by a breadth-first search over the 576 positions of a pair gives
+the next trigger to use. OLL and PLL come from the last-layer case index.
+The cross table and F2L tables are built once and kept by table_store.
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+from algorithm import compile_algorithm
+from cubie_cube import from_state, move_cross, move_names, move_pair, solved_cross, solved_pairs
+from move_history import inverse_move
+from table_store import load_or_build
+
+table_version = 1
+''' version of the saved tables, to be raised whenever build_tables changes '''
+
+tables = None
+''' tables shared by every solver, filled in by get_tables '''
+
+slot_names = ('FR', 'FL', 'BL', 'BR')
+''' names of the F2L slots, in the order of cubie_cube.F2L_slots '''
+
+slot_openers = (('R', "F'"), ("L'", 'F'), ('L', "B'"), ("R'", 'B'))
+''' the two moves that lift each slot into the U layer '''
+
+def build_triggers():
+    ''' List the moves the F2L search is made of: turns of the U face, and
+        each slot lifted into the U layer, turned with U and put back
+        Returns: list of (slot it opens or None, move strings) '''
+
+    triggers = [(None, [turn]) for turn in ('U', "U'", 'U2')]
+    for slot, openers in enumerate(slot_openers):
+        for opener in openers:
+            for turn in ('U', "U'", 'U2'):
+                triggers.append((slot, [opener, turn, inverse_move(opener)]))
+    return triggers
+
+triggers = build_triggers()
+''' (slot it opens or None, move strings) of every F2L trigger '''
+
+trigger_inverses = [triggers.index((slot, [inverse_move(move) for move in reversed(moves)]))
+                    for slot, moves in triggers]
+''' index of the trigger that undoes each trigger '''
+
+move_indices = {move: i for i, move in enumerate(move_names)}
+''' maps a face turn to its index in cubie_cube.move_names '''
+
+def build_trigger_table():
+    ''' Work out where every pair coordinate goes for each trigger
+        Returns: list with a tuple of 576 pair coordinates for each trigger '''
+
+    table = []
+    for slot, moves in triggers:
+        row = []
+        for pair in range(576):
+            for move in moves:
+                pair = move_pair(pair, move_indices[move])
+            row.append(pair)
+        table.append(tuple(row))
+    return table
+
+trigger_pairs = build_trigger_table()
+''' trigger_pairs[trigger][pair] is the pair coordinate after the trigger '''
+
+def build_cross_table():
+    ''' Find how many moves every position of the cross edges is from a
+        solved cross with a breadth-first search
+        Returns: bytearray indexed by the get_cross coordinate, 255 where unreachable '''
+
+    table = bytearray(b'\xff') * (24 ** 4)
+    table[solved_cross] = 0
+    frontier = [solved_cross]
+    depth = 0
+
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for cross in frontier:
+            for move in range(18):
+                neighbour = move_cross(cross, move)
+                if table[neighbour] == 255:
+                    table[neighbour] = depth
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+
+    return table
+
+def F2L_index(slot, open_slots, pair):
+    ''' Returns the entry of the F2L tables for a pair
+        Parameters:
+            slot - slot the pair belongs in
+            open_slots - bit mask of the slots that aren't solved, the
+                triggers of the others may not be used
+            pair - get_pair coordinate of the pair '''
+
+    return (16 * slot + open_slots) * 576 + pair
+
+def build_F2L_tables():
+    ''' Find the shortest series of triggers that solves every pair, for
+        every set of slots whose triggers may be used, with a breadth-first
+        search outward from each solved pair
+        Returns: (bytearray of the number of triggers needed, bytearray of
+            the first trigger to use), 255 where the pair can't be solved '''
+
+    distance = bytearray(b'\xff') * (4 * 16 * 576)
+    first = bytearray(b'\xff') * (4 * 16 * 576)
+
+    for slot in range(4):
+        for open_slots in range(16):
+            if not open_slots & 1 << slot:
+                continue
+            usable = [i for i, (opens, moves) in enumerate(triggers) if opens is None or open_slots & 1 << opens]
+
+            start = F2L_index(slot, open_slots, solved_pairs[slot])
+            distance[start] = 0
+            frontier = [solved_pairs[slot]]
+            depth = 0
+            while frontier:
+                depth += 1
+                next_frontier = []
+                for pair in frontier:
+                    for trigger in usable:
+                        neighbour = trigger_pairs[trigger][pair]
+                        index = F2L_index(slot, open_slots, neighbour)
+                        if distance[index] == 255:
+                            distance[index] = depth
+                            first[index] = trigger_inverses[trigger]
+                            next_frontier.append(neighbour)
+                frontier = next_frontier
+
+    return distance, first
+
+def build_tables():
+    ''' Build every table the solver uses
+        Returns: dictionary mapping table names to arrays '''
+
+    built = {'cross_distance': build_cross_table()}
+    built['F2L_distance'], built['F2L_first'] = build_F2L_tables()
+    return built
+
+def get_tables():
+    ''' Get the shared solver tables, opening them from the table store
+        or building and saving them on first use
+        Returns: dictionary mapping table names to arrays '''
+
+    global tables
+    if tables is None:
+        tables = load_or_build('cfop', table_version, build_tables)
+    return tables
+
+def step_to_str(step):
+    ''' Write a solution step as a hint, such as "F2L FR: (U) R U' R'"
+        Parameters:
+            step - (stage, AUF, algorithm)
+        Returns: hint string '''
+
+    stage, AUF, algorithm = step
+    parts = [stage + ':']
+    if AUF:
+        parts.append('(' + AUF + ')')
+    if algorithm:
+        parts.append(algorithm)
+    return ' '.join(parts)
+
+class CFOP_Solver:
+    ''' This class represents a stage-by-stage CFOP solver for Rubik's Cube states '''
+
+    def __init__(self, tables = None):
+        ''' Initializes the solver
+            Parameters:
+                tables - tables from build_tables, the shared tables are used if not passed '''
+
+        tables = tables if tables is not None else get_tables()
+        self.cross_distance = tables['cross_distance']
+        self.F2L_distance = tables['F2L_distance']
+        self.F2L_first = tables['F2L_first']
+
+    def solve_cross(self, cross):
+        ''' Find the shortest moves that solve the cross
+            Parameters:
+                cross - get_cross coordinate of the cube
+            Returns: list of move strings '''
+
+        moves = []
+        distance = self.cross_distance[cross]
+        while distance > 0:
+            for move in range(18):
+                turned = move_cross(cross, move)
+                if self.cross_distance[turned] < distance:
+                    break
+            moves.append(move_names[move])
+            cross = turned
+            distance -= 1
+        return moves
+
+    def solve_pairs(self, pairs):
+        ''' Solve the F2L pairs of a cube whose cross is solved, always
+            taking the pair that needs the fewest triggers next
+            Parameters:
+                pairs - get_pair coordinate of each slot, these are updated
+            Returns: list of (slot, move strings) for each pair '''
+
+        steps = []
+        open_slots = sum(1 << slot for slot in range(4) if pairs[slot] != solved_pairs[slot])
+        while open_slots:
+            slot = min((slot for slot in range(4) if open_slots & 1 << slot),
+                       key = lambda slot: self.F2L_distance[F2L_index(slot, open_slots, pairs[slot])])
+            if self.F2L_distance[F2L_index(slot, open_slots, pairs[slot])] == 255:
+                raise ValueError('F2L pair ' + slot_names[slot] + ' can not be solved')
+
+            moves = []
+            while pairs[slot] != solved_pairs[slot]:
+                trigger = self.F2L_first[F2L_index(slot, open_slots, pairs[slot])]
+                moves.extend(triggers[trigger][1])
+                for other in range(4):
+                    pairs[other] = trigger_pairs[trigger][pairs[other]]
+
+            steps.append((slot, compile_algorithm(' '.join(moves)).moves))
+            open_slots &= ~(1 << slot)
+        return steps
+
+    def solve(self, cube):
+        ''' Solve a cube stage by stage
+            Parameters:
+                cube - Rubiks_Cube to solve, it is not changed
+            Returns: list of (stage, AUF, algorithm) steps, where stage is
+                'Cross', 'F2L FR' and so on, 'OLL', 'PLL' or 'AUF', AUF is a
+                U turn to make before the algorithm and algorithm is a string
+                in cube notation
+            Raises: ValueError if the cube can't be solved '''
+
+        import last_layer
+
+        cubie = from_state(cube.state)
+        problem = cubie.verify()
+        if problem is not None:
+            raise ValueError('cube can not be solved: ' + problem)
+
+        steps = []
+        cross_moves = self.solve_cross(cubie.get_cross())
+        if cross_moves:
+            steps.append(('Cross', '', ' '.join(cross_moves)))
+            for move in cross_moves:
+                cubie.move(move_indices[move])
+
+        pairs = [cubie.get_pair(slot) for slot in range(4)]
+        for slot, moves in self.solve_pairs(pairs):
+            if moves and moves[0] in ('U', "U'", 'U2'):
+                steps.append(('F2L ' + slot_names[slot], moves[0], ' '.join(moves[1:])))
+            else:
+                steps.append(('F2L ' + slot_names[slot], '', ' '.join(moves)))
+
+        solved = cube.clone()
+        for stage, AUF, algorithm in steps:
+            solved.apply_algorithm(AUF + ' ' + algorithm)
+
+        for stage, find in (('OLL', last_layer.find_OLL), ('PLL', last_layer.find_PLL)):
+            case = find(solved.state)
+            if case is None:
+                raise ValueError('no ' + stage + ' case matches the cube')
+            name, before, algorithm, after = case
+            if before or algorithm:
+                steps.append((stage, before, algorithm))
+            if after:
+                steps.append(('AUF', after, ''))
+            solved.apply_algorithm(before + ' ' + algorithm + ' ' + after)
+
+        return steps
+
+    def next_step(self, cube):
+        ''' Find the next stage to do on a cube
+            Parameters:
+                cube - Rubiks_Cube to look at
+            Returns: (stage, AUF, algorithm), or None if it is solved '''
+
+        steps = self.solve(cube)
+        return steps[0] if steps else None
+
+    def solve_cross_edge(self, cube):
+        ''' Find the moves that solve one more cross edge, without breaking
+            the ones already solved
+            Parameters:
+                cube - Rubiks_Cube to look at
+            Returns: list of move strings, empty if the cross is solved '''
+
+        cubie = from_state(cube.state)
+        cross = cubie.get_cross()
+        moves = self.solve_cross(cross)
+
+        def solved_edges(cross):
+            return sum(cross // 24 ** i % 24 == solved_cross // 24 ** i % 24 for i in range(4))
+
+        # the first part of the shortest cross solution that gains an edge
+        target = solved_edges(cross) + 1
+        for length, move in enumerate(moves, 1):
+            cross = move_cross(cross, move_indices[move])
+            if solved_edges(cross) >= target:
+                return moves[:length]
+        return moves
+
+solver = None
+''' solver shared by the module functions '''
+
+def get_solver():
+    ''' Returns the shared CFOP_Solver, made on first use '''
+
+    global solver
+    if solver is None:
+        solver = CFOP_Solver()
+    return solver
+
+def solve(cube):
+    ''' Solve a cube stage by stage with the shared CFOP_Solver, see CFOP_Solver.solve '''
+
+    return get_solver().solve(cube)
+
+def get_hint(cube):
+    ''' Describe the next stage to do on a cube, such as "F2L FR: (U) R U' R'"
+        Parameters:
+            cube - Rubiks_Cube to look at
+        Returns: hint string '''
+
+    step = get_solver().next_step(cube)
+    return step_to_str(step) if step is not None else 'Cube is solved!'
@@ -0,0 +1,162 @@
+'''
+This file contains the Cube_Batch class which turns and checks many
+Rubik's Cube states at once using NumPy
+
+Each row of the batch is one cube stored with the same 54 sticker layout
+as Rubiks_Cube.state (U, F, R, B, L, D order, 9 squares per face), so states
+can be passed between the two without any conversion.
+
+Requires NumPy.
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+from functools import lru_cache
+
+import numpy as np
+
+from algorithm import compile_algorithm
+from move_tables import move_perms, compose, identity
+from rubix_cube import Rubiks_Cube, solved_state
+
+move_names = list(move_perms)
+''' every move token, in the order of the rows of perm_matrix '''
+
+move_indices = {move: i for i, move in enumerate(move_names)}
+''' maps a move token to its row in perm_matrix '''
+
+perm_matrix = np.array([move_perms[move] for move in move_names], dtype = np.intp)
+''' one row per move token holding its sticker permutation '''
+
+top_layer_names = ('OLL1', 'OLL2', 'PLL')
+''' maps the codes returned by Cube_Batch.check_top_layer to the strings
+    returned by Rubiks_Cube.check_top_layer '''
+
+@lru_cache(maxsize = 4096)
+def compose_sequence(moves):
+    ''' Compose a sequence of moves into one permutation, keeping the most
+        recently used sequences
+        Parameters:
+            moves - tuple of move strings
+        Returns: permutation as an index array '''
+
+    composed = identity
+    for move in moves:
+        composed = compose(composed, move_perms[move])
+    return np.array(composed, dtype = np.intp)
+
+def sequence_perm(moves):
+    ''' Compose a sequence of moves into one permutation
+        Parameters:
+            moves - list of move strings
+        Returns: permutation as an index array '''
+
+    return compose_sequence(tuple(moves))
+
+class Cube_Batch:
+    ''' This class represents N cube states held as an (N, 54) array
+        that are all turned and checked together '''
+
+    def __init__(self, states = 1):
+        ''' Initializes the batch
+            Parameters:
+                states - number of solved cubes to start with, or an
+                    (N, 54) array of sticker values to copy '''
+
+        if isinstance(states, int):
+            self.states = np.tile(np.frombuffer(solved_state, dtype = np.uint8), (states, 1))
+        else:
+            self.states = np.array(states, dtype = np.uint8).reshape(-1, 54)
+
+    def __len__(self):
+        ''' Returns the number of cubes in the batch '''
+
+        return len(self.states)
+
+    def __getitem__(self, i):
+        ''' Returns cube i of the batch as a separate Rubiks_Cube '''
+
+        cube = Rubiks_Cube()
+        cube.set_state(self.states[i].tobytes())
+        return cube
+
+    def to_cubes(self):
+        ''' Returns a list with a Rubiks_Cube for every state in the batch '''
+
+        return [self[i] for i in range(len(self))]
+
+    def move(self, move):
+        ''' Make the same move on every cube in the batch
+            Parameters:
+                move - Specified move as a string in cube notation '''
+
+        self.states = self.states[:, perm_matrix[move_indices[move]]]
+
+    def scramble(self, scramble):
+        ''' Apply a list of moves to every cube in the batch with a single gather
+            Parameters:
+                scramble - list of move strings, or an algorithm string in
+                    the notation accepted by algorithm.compile_algorithm '''
+
+        if isinstance(scramble, str):
+            scramble = compile_algorithm(scramble).moves
+        self.states = self.states[:, sequence_perm(scramble)]
+
+    def move_each(self, moves):
+        ''' Make a different move on every cube in the batch
+            Parameters:
+                moves - one move per cube, either as move strings or as
+                    indices into move_names '''
+
+        moves = np.asarray(moves)
+        if moves.dtype.kind not in 'iu':
+            moves = np.array([move_indices[move] for move in moves], dtype = np.intp)
+
+        rows = np.arange(len(self.states))[:, None]
+        self.states = self.states[rows, perm_matrix[moves]]
+
+    def scramble_each(self, scrambles):
+        ''' Apply a different move sequence to every cube in the batch
+            Parameters:
+                scrambles - (N, length) array of indices into move_names
+                    or a list of N equal length lists of move strings '''
+
+        scrambles = np.asarray(scrambles)
+        for column in range(scrambles.shape[1]):
+            self.move_each(scrambles[:, column])
+
+    def faces(self):
+        ''' Returns an (N, 6, 9) view of the states split into faces '''
+
+        return self.states.reshape(-1, 6, 9)
+
+    def is_solved(self):
+        ''' Check which cubes have every face a single color
+            Returns: boolean array with one entry per cube '''
+
+        faces = self.faces()
+        return (faces == faces[:, :, 4:5]).all(axis = (1, 2))
+
+    def check_F2L(self):
+        ''' Check which cubes have the first 2 layers solved in the same way
+            as Rubiks_Cube.check_F2L
+            Returns: boolean array with one entry per cube '''
+
+        sides = self.faces()[:, 1:5, 3:]
+        return (sides == sides[:, :, :1]).all(axis = (1, 2))
+
+    def check_top_layer(self):
+        ''' Check the state of the top layer in the same way as
+            Rubiks_Cube.check_top_layer
+            Returns: array of codes indexing top_layer_names, 0 for 'OLL1',
+                1 for 'OLL2' and 2 for 'PLL' '''
+
+        top = self.faces()[:, 0]
+        matches = top == top[:, 4:5]
+
+        codes = np.zeros(len(top), dtype = np.uint8)
+        codes[matches[:, [1, 3, 5, 7]].all(axis = 1)] = 1
+        codes[matches.all(axis = 1)] = 2
+        return codes
@@ -6,20 +6,61 @@ Author: Henry Ham
 Version: 2022.04.25
 '''
 
-from cross_solver_try2 import Cross_Solver
 from rubix_cube import Rubiks_Cube
+from two_phase_solver import Two_Phase_Solver
+from background_task import Background_Task
+import cfop_solver
+from math import isqrt
+from scrambler import Scrambler
+from move_history import Move_History
 from tkinter import *
-import random
+
+colors_dict = {0:'white', 1:'green', 2:'red', 3:'blue', 4:'orange', 5:'yellow', -1:'black'}
+''' maps the color values of the cube to the fill color of a square '''
+
+face_layout = ((3, 103, 3, 2), (0, 103, 103, 0), (4, 3, 103, 1), (2, 203, 103, 3), (1, 103, 203, 0), (5, 103, 303, 0))
+''' (face index, x, y, number of 90° clockwise rotations) of each face in the display '''
+
+face_size = 99
+''' width of a face in the display, shared between its n x n squares '''
+
+def build_screen_map(n = 3):
+    ''' Work out where every sticker of an n x n x n cube is drawn
+        Parameters:
+            n - number of squares along each edge of the cube
+        Returns: list of (sticker index, x, y) for the top-left corner of each square '''
+    
+    size = face_size // n
+    screen_map = []
+    for face, x1, y1, rotation in face_layout:
+        turn = list(range(n * n))
+        for i in range(rotation):
+            # square (r, c) shows what was at (n - 1 - c, r) before a clockwise turn
+            turn = [turn[(n - 1 - i % n) * n + i // n] for i in range(n * n)]
+        for i in range(n * n):
+            screen_map.append((n * n * face + turn[i], x1 + size * (i % n), y1 + size * (i // n)))
+    return screen_map
+
+screen_map = build_screen_map()
+''' fixed position of every sticker of a 3x3 cube in the display '''
 
 class Cube_Interface:
     ''' This class represents a GUI for interacting with a Rubik's Cube puzzle
         Model and functionality of the cube are handled in a separate class '''
     
-    def __init__(self, cube = Rubiks_Cube()):
+    def __init__(self, cube = None):
         ''' Initializes the GUI as a window by displaying the state of the cube
-            and providing buttons to turn or scramble the cube '''
+            and providing buttons to turn or scramble the cube
+            Parameters:
+                cube - Rubiks_Cube, or NxN_Cube of any size, to show, a new
+                    solved Rubiks_Cube if None '''
         
-        self.cube = cube
+        self.cube = cube if cube is not None else Rubiks_Cube()
+        self.n = isqrt(len(self.cube.state) // 6)
+        self.screen_map = screen_map if self.n == 3 else build_screen_map(self.n)
+        self.scrambler = Scrambler()
+        self.history = Move_History(self.cube)
+        self.task = None
         
         self.root = Tk()
         self.root.title('AntiSledgeCubing Interactive Model')
@@ -33,6 +74,13 @@ class Cube_Interface:
         self.hint_canvas = Canvas(self.root, width = 200, height = 50)
         self.hint_canvas.place(x = 300, y = 560, anchor = CENTER)
         
+        self.scramble_canvas = Canvas(self.root, width = 450, height = 50)
+        self.scramble_canvas.place(x = 100, y = 0, anchor = NW)
+        
+        # canvas items of the squares and the colors they currently show
+        self.squares = []
+        self.shown = []
+        
         self.display_cube()
         
     def new_scramble(self):
@@ -41,6 +89,8 @@ class Cube_Interface:
         
         self.cube.reset()
         self.scramble_cube(self.generate_scramble())
+        # undo goes back to the scrambled cube, not to solved
+        self.history.clear()
         
         
     def scramble_to_str(self, scramble):
@@ -92,113 +142,178 @@ class Cube_Interface:
         hint_button = Button(self.root, text = 'HINT', command = self.get_hint, width = 4, height = 1).place(x = 300, y = 520, anchor = CENTER)
         new_scramble_button = Button(self.root, text = 'New Scramble', command = self.new_scramble).place(x = 300, y = 60, anchor = N)
         solve_cross_button = Button(self.root, text = 'Solve 1 cross-edge', command = self.solve_cross_edge).place(x = 400, y = 50)
+        solve_button = Button(self.root, text = 'Solve', command = self.solve_cube).place(x = 400, y = 80)
+        cancel_button = Button(self.root, text = 'Cancel', command = self.cancel_task).place(x = 450, y = 80)
+        undo_button = Button(self.root, text = 'Undo', command = self.undo_move, width = 3, height = 2).place(x = 500, y = 450)
+        redo_button = Button(self.root, text = 'Redo', command = self.redo_move, width = 3, height = 2).place(x = 550, y = 450)
         
     def solve_cross_edge(self):
-        ''' Create a Cross_Solver object to solve one edge on the bottom-layer cross '''
+        ''' Solve one more edge of the bottom-layer cross with the CFOP solver,
+            searching on a worker thread '''
         
-        cross_solver = Cross_Solver(self.cube)
-        cross_solver.insert_edge()
-        moves = cross_solver.cross_moves
-        self.cube.scramble(moves)
-        self.canvas.delete('all')
-        self.display_cube()
+        self.run_task(lambda cube: cfop_solver.get_solver().solve_cross_edge(cube), self.apply_moves, 'Solving cross edge')
         
-    
-    def get_hint(self):
-        ''' Post the most relevant hint on the window '''
+    def solve_cube(self):
+        ''' Find a full solution with the two-phase solver on a worker thread,
+            then post it on the window and apply it to the cube '''
         
-        self.hint_canvas.delete('all')
-        self.hint_canvas.create_text(100, 25, text = self.cube.get_hint(), anchor = CENTER)
+        # the solver is made on the worker, since the first one may have to build its tables
+        solvers = []
+        cancelled = []
         
-    def generate_scramble(self):
-        ''' Generates a random sequence of 20 moves and return it
-            as a list
-            Returns: generated list '''
+        def find_solution(cube):
+            solvers.append(Two_Phase_Solver())
+            # Cancel was pressed while the tables were being built
+            if cancelled:
+                return None
+            return solvers[0].solve(cube)
         
-        moves_list = ["R", "R'", "R2", "L", "L'", "L2", "F", "F'", "F2", "B", "B'", "B2", "U", "U'", "U2", "D", "D'", "D2"]
+        def stop():
+            cancelled.append(True)
+            for solver in solvers:
+                solver.cancel()
         
+        def show_solution(solution):
+            self.post_message(' '.join(solution) if solution else 'No solution found in time')
+            self.apply_moves(solution)
         
-        scramble = [moves_list[random.randrange(len(moves_list))] for i in range(20)]
+        self.run_task(find_solution, show_solution, 'Solving', stop)
         
-        no_repeats = False
-        while no_repeats == False:
-            repeats = False
-            prev = -1
-            for move in scramble:
-                temp = move
-                if prev != -1:
-                    if move[0] == prev[0]:
-                        scramble[scramble.index(move)] = moves_list[random.randrange(len(moves_list))]
-                        repeats = True
-                prev = temp
-            if repeats == False:
-                no_repeats = True
+    def get_hint(self):
+        ''' Find the next CFOP stage on a worker thread and post it on the window '''
         
-        return scramble
+        self.run_task(cfop_solver.get_hint, self.post_message, 'Finding hint')
         
+    def run_task(self, function, on_done, label, on_cancel = None):
+        ''' Run a search on a copy of the cube on a worker thread, replacing
+            any search still running, and show its progress until it is done
+            Parameters:
+                function - takes the copy of the cube and returns the result
+                on_done - called with the result if the cube hasn't changed since
+                label - text shown while the search runs
+                on_cancel - tells the function to stop early when cancelled '''
+        
+        self.cancel_task()
+        if self.n != 3:
+            self.post_message('The solvers only work on a 3x3 cube')
+            return
+        
+        cube = self.cube.clone()
+        state = cube.get_state()
+        
+        def done(result):
+            if self.task is task:
+                self.task = None
+            self.post_message('')
+            # the cube was turned while searching, so the result no longer applies
+            if self.cube.get_state() != state:
+                self.post_message('Cube changed, ' + label.lower() + ' stopped')
+                return
+            on_done(result)
+        
+        def failed(error):
+            if self.task is task:
+                self.task = None
+            self.post_message(str(error))
+        
+        def progress(seconds):
+            self.post_message(label + '... ' + format(seconds, '.1f') + ' s')
+        
+        task = Background_Task(self.root, lambda: function(cube), done, failed, progress, on_cancel)
+        self.task = task
+        
+    def cancel_task(self):
+        ''' Cancel the search running in the background, if there is one '''
+        
+        if self.task is not None:
+            if self.task.is_running():
+                self.post_message('Cancelled')
+            self.task.cancel()
+        self.task = None
+        
+    def apply_moves(self, moves):
+        ''' Apply moves found by a search to the cube and show it
+            Parameters:
+                moves - list of move strings, or None if nothing was found '''
         
-    def display_cube(self):
-        ''' Displays the current state of the cube on
-            the canvas by drawing all faces '''
-        
-        self.create_face(self.cube.B, 103, 3, rotation = 2)
-        self.create_face(self.cube.U, 103, 103)
-        self.create_face(self.cube.L, 3, 103, rotation = 1)
-        self.create_face(self.cube.R, 203, 103, rotation = 3)
-        self.create_face(self.cube.F, 103, 203)
-        self.create_face(self.cube.D, 103, 303)
-        
-    def create_face(self, face, x1, y1, rotation = 0):
-        ''' Draws the given face of the cube as 9 connected
-            and properly colored squares
+        if moves:
+            self.history.apply(moves)
+        self.display_cube()
+        
+    def undo_move(self):
+        ''' Undo the last move made on the cube '''
+        
+        if self.history.undo() is not None:
+            self.display_cube()
+        
+    def redo_move(self):
+        ''' Redo the last move that was undone '''
+        
+        if self.history.redo() is not None:
+            self.display_cube()
+        
+    def post_message(self, text):
+        ''' Replace the text shown under the cube
             Parameters:
-                face - Specified face taken from cube
-                x1 - x value of the first square of the face
-                y1 - y value of the first square of the face
-                rotation - number of 90° clockwise rotations to
-                    correctly orient the given face in the display'''
+                text - hint, solution or status to show '''
         
-        colors_dict = {0:'white', 1:'green', 2:'red', 3:'blue', 4:'orange', 5:'yellow', -1:'black'}
+        self.hint_canvas.delete('all')
+        self.hint_canvas.create_text(100, 25, text = text, anchor = CENTER, width = 200)
         
-        for i in range(rotation):
-            self.cube.move(self.cube.get_face(face))
-        rot_face = self.cube.copy_face(face)
-        for i in range(rotation):
-            self.cube.move(self.cube.get_face(face) + "'")
-        
-        x = x1
-        y = y1
-        for square in rot_face:
-            self.canvas.create_rectangle(x, y, x + 33, y + 33, outline = 'black', fill = colors_dict[square])
-            x += 33 if x != x1 + 66 else -(x - x1)
-            y += 33 if x == x1 else 0
+    def generate_scramble(self):
+        ''' Generates a random sequence of 20 moves where no moves
+            cancel or combine and return it as a list
+            Returns: generated list '''
+        
+        return self.scrambler.random_moves(20)
+        
+    def display_cube(self):
+        ''' Displays the current state of the cube on the canvas
+
+            The squares are drawn the first time, after that only
+            squares whose color changed are recolored '''
+        
+        if not self.squares:
+            self.create_squares()
+        
+        state = self.cube.state
+        for i, (sticker, x, y) in enumerate(self.screen_map):
+            if state[sticker] != self.shown[i]:
+                self.shown[i] = state[sticker]
+                self.canvas.itemconfig(self.squares[i], fill = colors_dict[state[sticker]])
+        
+    def create_squares(self):
+        ''' Draws the squares of the cube once, in the order of its screen map,
+            so that display_cube only has to color them '''
+        
+        size = face_size // self.n
+        for sticker, x, y in self.screen_map:
+            self.squares.append(self.canvas.create_rectangle(x, y, x + size, y + size, outline = 'black', fill = colors_dict[-1]))
+            self.shown.append(-1)
             
     def scramble_cube(self, scramble):
         ''' Read the scramble sequence and pass it into the
             cube's scramble method
             Parameters:
-                scramble - sequence of moves (can be a string or a list) '''
-        
-        scramble_list = None
-        
-        if type(scramble) is str:
-            scramble_list = scramble.split(sep = ' ')
-        else:
-            scramble_list = scramble
-            scramble_canvas = Canvas(self.root, width = 450, height = 50)
-            scramble_canvas.place(x = 100, y = 0, anchor = NW)
-            scramble_canvas.create_text(5, 10, text = self.scramble_to_str(scramble), anchor = NW, font = ('Times', 20), justify = CENTER)
-            
-            
-        self.cube.scramble(scramble_list)
-        
-        self.canvas.delete('all')
+                scramble - sequence of moves (can be an algorithm string or a list) '''
+
+        if type(scramble) is not str:
+            self.scramble_canvas.delete('all')
+            self.scramble_canvas.create_text(5, 10, text = self.scramble_to_str(scramble), anchor = NW, font = ('Times', 20), justify = CENTER)
+
+        try:
+            self.history.apply(scramble)
+        except ValueError as error:
+            # such as M on an even sized cube
+            self.post_message(str(error))
+
         self.display_cube()
-        
 
-a_cube = Rubiks_Cube()
-#a_cube.scramble(['U', 'R', "D'", 'L2', "D'", 'R2', 'F2', 'D', 'F2', "D'", 'B2', 'R2', "U'", 'L', 'R', 'F', 'D', 'L2', 'R2', "B'"])
-#Cross_Solver(a_cube)
-inter = Cube_Interface(a_cube)
 
-inter.root.mainloop()
+if __name__ == '__main__':
+    a_cube = Rubiks_Cube()
+    #a_cube.scramble(['U', 'R', "D'", 'L2', "D'", 'R2', 'F2', 'D', 'F2', "D'", 'B2', 'R2', "U'", 'L', 'R', 'F', 'D', 'L2', 'R2', "B'"])
+    #Cross_Solver(a_cube)
+    inter = Cube_Interface(a_cube)
+    
+    inter.root.mainloop()
@@ -0,0 +1,495 @@
+'''
+This file contains the Cubie_Cube class which describes a Rubik's Cube by the
+position and orientation of its 8 corner and 12 edge pieces instead of by its
+54 stickers
+
+Corners: URF, UFL, ULB, UBR, DFR, DLF, DBL, DRB (0-7)
+Edges: UR, UF, UL, UB, DR, DF, DL, DB, FR, FL, BL, BR (0-11)
+
+cp[i] is the corner sitting in corner position i and co[i] its twist
+(0-2), ep[i] is the edge sitting in edge position i and eo[i] its flip (0-1).
+
+Stage checks for the cross, F2L pairs and last layer compare small integer
+coordinates, and corner_moves and edge_moves turn those coordinates directly
+for each of the 18 face turns, so a search can run on them without building
+any cubes.
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+from math import comb
+
+from move_tables import move_perms
+from rubix_cube import Rubiks_Cube, solved_state
+
+U, F, R, B, L, D = 0, 1, 2, 3, 4, 5
+''' face indices, in the same order as Rubiks_Cube.cube '''
+
+corner_facelets = ((8, 18, 11), (6, 9, 38), (0, 36, 29), (2, 27, 20),
+                   (47, 17, 24), (45, 44, 15), (51, 35, 42), (53, 26, 33))
+''' sticker indices of each corner position, starting on the U or D face
+    and going clockwise '''
+
+corner_colors = ((U, R, F), (U, F, L), (U, L, B), (U, B, R),
+                 (D, F, R), (D, L, F), (D, B, L), (D, R, B))
+''' faces each corner belongs to, in the same order as corner_facelets '''
+
+edge_facelets = ((5, 19), (7, 10), (3, 37), (1, 28), (50, 25), (46, 16),
+                 (48, 43), (52, 34), (14, 21), (12, 41), (32, 39), (30, 23))
+''' sticker indices of each edge position '''
+
+edge_colors = ((U, R), (U, F), (U, L), (U, B), (D, R), (D, F),
+               (D, L), (D, B), (F, R), (F, L), (B, L), (B, R))
+''' faces each edge belongs to, in the same order as edge_facelets '''
+
+face_moves = ('U', 'R', 'F', 'D', 'L', 'B')
+''' faces in the order used to number the 18 face turns '''
+
+move_names = [face + suffix for face in face_moves for suffix in ('', '2', "'")]
+''' the 18 face turns, move i turns face_moves[i // 3] (i % 3 + 1) times '''
+
+cross_edges = (4, 5, 6, 7)
+''' the DR, DF, DL and DB edges that make up the cross '''
+
+F2L_slots = ((4, 8), (5, 9), (6, 10), (7, 11))
+''' the (corner, edge) pair of each F2L slot: FR, FL, BL and BR '''
+
+phase_2_moves = (0, 1, 2, 4, 7, 9, 10, 11, 13, 16)
+''' indices of the moves that keep a cube inside the phase 2 group:
+    U, U2, U', R2, F2, D, D2, D', L2, B2 '''
+
+def perm_rank(perm):
+    ''' Rank a permutation of 0 ... n - 1 so the identity has rank 0
+        Parameters:
+            perm - sequence of distinct values from 0 to n - 1
+        Returns: rank from 0 to n! - 1 '''
+
+    rank = 0
+    n = len(perm)
+    for i in range(n):
+        smaller = 0
+        for j in range(i + 1, n):
+            if perm[j] < perm[i]:
+                smaller += 1
+        rank = rank * (n - i) + smaller
+    return rank
+
+def perm_unrank(rank, n):
+    ''' Build the permutation of 0 ... n - 1 with the passed rank
+        Parameters:
+            rank - rank returned by perm_rank
+            n - length of the permutation
+        Returns: permutation as a list '''
+
+    digits = [0] * n
+    for i in range(n - 1, -1, -1):
+        digits[i] = rank % (n - i)
+        rank //= n - i
+
+    values = list(range(n))
+    return [values.pop(digit) for digit in digits]
+
+class Cubie_Cube:
+    ''' This class represents a cube as permutations and orientations of
+        its corner and edge pieces '''
+
+    def __init__(self, cp = None, co = None, ep = None, eo = None):
+        ''' Initializes the cube, into a solved state unless pieces are passed
+            Parameters:
+                cp - corner permutation
+                co - corner orientations
+                ep - edge permutation
+                eo - edge orientations '''
+
+        self.cp = list(cp) if cp is not None else list(range(8))
+        self.co = list(co) if co is not None else [0] * 8
+        self.ep = list(ep) if ep is not None else list(range(12))
+        self.eo = list(eo) if eo is not None else [0] * 12
+
+    def __eq__(self, other):
+        ''' Two cubes are equal when every piece matches '''
+
+        if not isinstance(other, Cubie_Cube):
+            return NotImplemented
+        return self.cp == other.cp and self.co == other.co and self.ep == other.ep and self.eo == other.eo
+
+    def clone(self):
+        ''' Returns a separate copy of this cube '''
+
+        return Cubie_Cube(self.cp, self.co, self.ep, self.eo)
+
+    def multiply(self, other):
+        ''' Apply the pieces of another cube on top of this one, so that
+            multiplying by a move's cube makes that move
+            Parameters:
+                other - cube to multiply by '''
+
+        self.co = [(self.co[other.cp[i]] + other.co[i]) % 3 for i in range(8)]
+        self.cp = [self.cp[other.cp[i]] for i in range(8)]
+        self.eo = [(self.eo[other.ep[i]] + other.eo[i]) % 2 for i in range(12)]
+        self.ep = [self.ep[other.ep[i]] for i in range(12)]
+
+    def move(self, move):
+        ''' Make one of the 18 face turns
+            Parameters:
+                move - index into move_names '''
+
+        self.multiply(move_cubes[move])
+
+    def inverse(self):
+        ''' Returns the cube that undoes this one '''
+
+        result = Cubie_Cube()
+        for i in range(8):
+            result.cp[self.cp[i]] = i
+        for i in range(8):
+            result.co[i] = -self.co[result.cp[i]] % 3
+        for i in range(12):
+            result.ep[self.ep[i]] = i
+        for i in range(12):
+            result.eo[i] = self.eo[result.ep[i]]
+        return result
+
+    def corner_parity(self):
+        ''' Returns 1 if the corner permutation is odd, otherwise 0 '''
+
+        return perm_parity(self.cp)
+
+    def edge_parity(self):
+        ''' Returns 1 if the edge permutation is odd, otherwise 0 '''
+
+        return perm_parity(self.ep)
+
+    def verify(self):
+        ''' Check that the cube can be solved
+            Returns: None if solvable, otherwise a string saying why not '''
+
+        if sorted(self.cp) != list(range(8)) or sorted(self.ep) != list(range(12)):
+            return 'some pieces are missing or appear twice'
+        if sum(self.co) % 3 != 0:
+            return 'a corner is twisted'
+        if sum(self.eo) % 2 != 0:
+            return 'an edge is flipped'
+        if self.corner_parity() != self.edge_parity():
+            return 'two pieces are swapped'
+        return None
+
+    def get_twist(self):
+        ''' Returns the corner orientation coordinate (0-2186), 0 when solved '''
+
+        twist = 0
+        for i in range(7):
+            twist = 3 * twist + self.co[i]
+        return twist
+
+    def set_twist(self, twist):
+        ''' Set the corner orientations from a twist coordinate '''
+
+        total = 0
+        for i in range(6, -1, -1):
+            self.co[i] = twist % 3
+            total += self.co[i]
+            twist //= 3
+        self.co[7] = -total % 3
+
+    def get_flip(self):
+        ''' Returns the edge orientation coordinate (0-2047), 0 when solved '''
+
+        flip = 0
+        for i in range(11):
+            flip = 2 * flip + self.eo[i]
+        return flip
+
+    def set_flip(self, flip):
+        ''' Set the edge orientations from a flip coordinate '''
+
+        total = 0
+        for i in range(10, -1, -1):
+            self.eo[i] = flip % 2
+            total += self.eo[i]
+            flip //= 2
+        self.eo[11] = total % 2
+
+    def get_slice_sorted(self):
+        ''' Returns the coordinate (0-11879) of the positions and order of the
+            FR, FL, BL and BR edges, 0 when solved. Divided by 24 it gives the
+            positions alone (0-494), and it is below 24 whenever all four are
+            back in the middle slice '''
+
+        positions = 0
+        found = 0
+        for j in range(11, -1, -1):
+            if self.ep[j] >= 8:
+                positions += comb(11 - j, found + 1)
+                found += 1
+        order = [edge - 8 for edge in self.ep if edge >= 8]
+        return 24 * positions + perm_rank(order)
+
+    def set_slice_sorted(self, index):
+        ''' Place the FR, FL, BL and BR edges from a slice coordinate and fill
+            the other positions with the remaining edges '''
+
+        positions, order = divmod(index, 24)
+        slice_edges = [edge + 8 for edge in perm_unrank(order, 4)]
+        other_edges = list(range(8))
+
+        left = 4
+        for j in range(12):
+            if left > 0 and positions >= comb(11 - j, left):
+                positions -= comb(11 - j, left)
+                self.ep[j] = slice_edges[4 - left]
+                left -= 1
+            else:
+                self.ep[j] = other_edges.pop(0)
+
+    def get_corners(self):
+        ''' Returns the corner permutation coordinate (0-40319), 0 when solved '''
+
+        return perm_rank(self.cp)
+
+    def set_corners(self, index):
+        ''' Set the corner permutation from a corner coordinate '''
+
+        self.cp = perm_unrank(index, 8)
+
+    def get_ud_edges(self):
+        ''' Returns the permutation coordinate (0-40319) of the 8 edges in the
+            U and D layers, only meaningful when none of them is in the middle slice '''
+
+        return perm_rank(self.ep[:8])
+
+    def set_ud_edges(self, index):
+        ''' Set the U and D layer edges from an edge coordinate and put the
+            middle slice edges back in place '''
+
+        self.ep = perm_unrank(index, 8) + [8, 9, 10, 11]
+
+    def get_corner(self, corner):
+        ''' Returns the coordinate (0-23) of where one corner is and how it
+            is twisted, 3 * position + twist, equal to 3 * corner when solved '''
+
+        position = self.cp.index(corner)
+        return 3 * position + self.co[position]
+
+    def get_edge(self, edge):
+        ''' Returns the coordinate (0-23) of where one edge is and how it is
+            flipped, 2 * position + flip, equal to 2 * edge when solved '''
+
+        position = self.ep.index(edge)
+        return 2 * position + self.eo[position]
+
+    def get_cross(self):
+        ''' Returns the coordinate (0-331775) of the four cross edges,
+            equal to solved_cross when the cross is solved '''
+
+        cross = 0
+        for edge in cross_edges:
+            cross = 24 * cross + self.get_edge(edge)
+        return cross
+
+    def get_pair(self, slot):
+        ''' Returns the coordinate (0-575) of the corner and edge of an F2L
+            slot, equal to solved_pairs[slot] when the pair is solved '''
+
+        corner, edge = F2L_slots[slot]
+        return 24 * self.get_corner(corner) + self.get_edge(edge)
+
+    def is_solved(self):
+        ''' Returns True if every piece is in place and oriented '''
+
+        return self.get_twist() == 0 and self.get_flip() == 0 \
+            and self.get_corners() == 0 and perm_rank(self.ep) == 0
+
+    def is_cross_solved(self):
+        ''' Returns True if the four D layer edges are in place and oriented '''
+
+        return self.get_cross() == solved_cross
+
+    def get_solved_pairs(self):
+        ''' Returns the list of F2L slots (0-3) whose pairs are solved '''
+
+        return [slot for slot in range(4) if self.get_pair(slot) == solved_pairs[slot]]
+
+    def is_F2L_solved(self):
+        ''' Returns True if the cross and all four F2L pairs are solved '''
+
+        return self.is_cross_solved() and len(self.get_solved_pairs()) == 4
+
+    def check_top_layer(self):
+        ''' Check the top layer in the same way as Rubiks_Cube.check_top_layer,
+            for a cube with F2L solved
+            Returns: 'OLL1' if the top edges are not all oriented, 'OLL2' if
+                only the top corners are left to orient, or 'PLL' if the
+                whole top layer is oriented '''
+
+        if self.eo[0] | self.eo[1] | self.eo[2] | self.eo[3]:
+            return 'OLL1'
+        if self.co[0] | self.co[1] | self.co[2] | self.co[3]:
+            return 'OLL2'
+        return 'PLL'
+
+def perm_parity(perm):
+    ''' Returns 1 if the passed permutation is odd, otherwise 0 '''
+
+    parity = 0
+    for i in range(len(perm)):
+        for j in range(i + 1, len(perm)):
+            if perm[j] < perm[i]:
+                parity ^= 1
+    return parity
+
+def from_state(state):
+    ''' Read the pieces of a sticker state
+
+        Colors are matched to faces by the center of each face, so a cube
+        that has been turned with x, y, z or slice moves is read relative
+        to where its centers are now.
+        Parameters:
+            state - 54 color values in Rubiks_Cube.state order
+        Returns: Cubie_Cube of the state
+        Raises: ValueError if some stickers don't form real pieces '''
+
+    face_of = {}
+    for face in range(6):
+        face_of[state[9 * face + 4]] = face
+    if len(face_of) != 6:
+        raise ValueError('two centers have the same color')
+
+    try:
+        faces = [face_of[color] for color in state]
+    except KeyError:
+        raise ValueError('a sticker has a color that no center has')
+
+    cube = Cubie_Cube()
+    for i, facelets in enumerate(corner_facelets):
+        for twist in range(3):
+            if faces[facelets[twist]] in (U, D):
+                break
+        else:
+            raise ValueError('corner ' + str(i) + ' has no U or D sticker')
+        colors = (faces[facelets[twist]], faces[facelets[(twist + 1) % 3]], faces[facelets[(twist + 2) % 3]])
+        if colors not in corner_index:
+            raise ValueError('corner ' + str(i) + ' is not a real corner')
+        cube.cp[i] = corner_index[colors]
+        cube.co[i] = twist
+
+    for i, (first, second) in enumerate(edge_facelets):
+        colors = (faces[first], faces[second])
+        if colors in edge_index:
+            cube.ep[i] = edge_index[colors]
+            cube.eo[i] = 0
+        elif colors[::-1] in edge_index:
+            cube.ep[i] = edge_index[colors[::-1]]
+            cube.eo[i] = 1
+        else:
+            raise ValueError('edge ' + str(i) + ' is not a real edge')
+
+    return cube
+
+def from_cube(cube):
+    ''' Read the pieces of a Rubiks_Cube along with the colors of its
+        centers, so that to_cube gives back exactly the same stickers
+        Parameters:
+            cube - Rubiks_Cube to read
+        Returns: (Cubie_Cube, center colors in U, F, R, B, L, D order)
+        Raises: ValueError if some stickers don't form real pieces '''
+
+    return from_state(cube.state), bytes(cube.state[4::9])
+
+def to_cube(cubie, centers = solved_state[4::9]):
+    ''' Build a Rubiks_Cube from its pieces
+        Parameters:
+            cubie - Cubie_Cube to write
+            centers - color of each face's center in U, F, R, B, L, D order
+        Returns: Rubiks_Cube '''
+
+    cube = Rubiks_Cube()
+    cube.set_state(to_state(cubie, centers))
+    return cube
+
+def to_state(cube, centers = solved_state[4::9]):
+    ''' Write the stickers of a cube
+        Parameters:
+            cube - Cubie_Cube to write
+            centers - color of each face's center in U, F, R, B, L, D order
+        Returns: 54 color values in Rubiks_Cube.state order '''
+
+    state = bytearray(54)
+    for face in range(6):
+        state[9 * face + 4] = centers[face]
+    for i in range(8):
+        colors = corner_colors[cube.cp[i]]
+        for n in range(3):
+            state[corner_facelets[i][(n + cube.co[i]) % 3]] = centers[colors[n]]
+    for i in range(12):
+        colors = edge_colors[cube.ep[i]]
+        for n in range(2):
+            state[edge_facelets[i][(n + cube.eo[i]) % 2]] = centers[colors[n]]
+    return bytes(state)
+
+corner_index = {colors: i for i, colors in enumerate(corner_colors)}
+''' maps the faces of a corner, read clockwise from its U or D sticker, to that corner '''
+
+edge_index = {colors: i for i, colors in enumerate(edge_colors)}
+''' maps the faces of an edge to that edge '''
+
+def build_move_cubes():
+    ''' Read the 18 face turns off the sticker permutations in move_tables
+        Returns: list of Cubie_Cube, one per entry of move_names '''
+
+    return [from_state(bytes(solved_state[i] for i in move_perms[move])) for move in move_names]
+
+move_cubes = build_move_cubes()
+''' Cubie_Cube of each of the 18 face turns, in move_names order '''
+
+
+def build_piece_moves(move, size):
+    ''' Work out where a single corner or edge goes for one face turn
+        Parameters:
+            move - Cubie_Cube of the face turn
+            size - 3 for corners or 2 for edges
+        Returns: bytes mapping a coordinate from get_corner or get_edge to
+            the coordinate after the turn '''
+
+    perm, orientation = (move.cp, move.co) if size == 3 else (move.ep, move.eo)
+    table = bytearray(size * len(perm))
+    for i, position in enumerate(perm):
+        for twist in range(size):
+            table[size * position + twist] = size * i + (twist + orientation[i]) % size
+    return bytes(table)
+
+corner_moves = [build_piece_moves(move, 3) for move in move_cubes]
+''' for each of the 18 face turns, maps a get_corner coordinate to where the corner ends up '''
+
+edge_moves = [build_piece_moves(move, 2) for move in move_cubes]
+''' for each of the 18 face turns, maps a get_edge coordinate to where the edge ends up '''
+
+solved_cross = Cubie_Cube().get_cross()
+''' get_cross coordinate of a solved cross '''
+
+solved_pairs = [Cubie_Cube().get_pair(slot) for slot in range(4)]
+''' get_pair coordinate of each solved F2L pair '''
+
+def move_cross(cross, move):
+    ''' Turn a get_cross coordinate without building a cube
+        Parameters:
+            cross - coordinate of the cross edges
+            move - index into move_names
+        Returns: cross coordinate after the move '''
+
+    table = edge_moves[move]
+    result = 0
+    for shift in (13824, 576, 24, 1):
+        result = 24 * result + table[cross // shift % 24]
+    return result
+
+def move_pair(pair, move):
+    ''' Turn a get_pair coordinate without building a cube
+        Parameters:
+            pair - coordinate of an F2L pair
+            move - index into move_names
+        Returns: pair coordinate after the move '''
+
+    return 24 * corner_moves[move][pair // 24] + edge_moves[move][pair % 24]
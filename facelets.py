@@ -0,0 +1,319 @@
+'''
+This file contains the import and export of the standard 54 character
+facelet string, and the bulk validation of cube states read from files
+
+A facelet string lists the stickers of the U, R, F, D, L and B faces, each
+read row by row the same way as the faces of Rubiks_Cube.state, with every
+sticker written as the letter of the face whose color it has when solved:
+U white (0), F green (1), R red (2), B blue (3), L orange (4) and D yellow
+(5). Converting is a translation and a reordering of bytes, and validation
+checks the color counts, that the centers are a real orientation of the
+cube, and that the pieces are real, untwisted, unflipped and not swapped,
+using small tables for each corner and edge instead of building a
+Cubie_Cube. Files are streamed through worker processes in chunks, so
+memory stays flat however many states they hold.
+
+Usage:
+    python facelets.py validate states.txt -j 4
+    python facelets.py convert states.txt --to state -o states.digits
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+from cubie_cube import corner_colors, corner_facelets, edge_colors, edge_facelets
+from move_tables import move_perms
+from rubix_cube import Rubiks_Cube, solved_state
+
+facelet_faces = 'URFDLB'
+''' order of the faces in a facelet string '''
+
+face_letters = 'UFRBLD'
+''' letter of each face in Rubiks_Cube.state order, so also of each color code '''
+
+letter_codes = bytes(face_letters.index(chr(byte)) if chr(byte) in face_letters else 255 for byte in range(256))
+code_letters = bytes(ord(face_letters[byte]) if byte < 6 else ord('?') for byte in range(256))
+digit_codes = bytes(byte - ord('0') if ord('0') <= byte <= ord('5') else 255 for byte in range(256))
+code_digits = bytes(ord('0') + byte if byte < 10 else ord('?') for byte in range(256))
+''' translation tables between letters, digits and color codes, 255 or ? for anything else '''
+
+facelet_order = itemgetter(*[9 * facelet_faces.index(face) + square for face in face_letters for square in range(9)])
+state_order = itemgetter(*[9 * face_letters.index(face) + square for face in facelet_faces for square in range(9)])
+''' gather a state from a facelet string, and a facelet string from a state '''
+
+def build_valid_centers():
+    ''' Find the center colors of all 24 orientations of the cube
+        Returns: set of 6 byte strings in U, F, R, B, L, D order '''
+
+    centers = {bytes(solved_state)}
+    frontier = list(centers)
+    while frontier:
+        state = frontier.pop()
+        for rotation in ('x', 'y'):
+            turned = bytes(state[i] for i in move_perms[rotation])
+            if turned not in centers:
+                centers.add(turned)
+                frontier.append(turned)
+    return {state[4::9] for state in centers}
+
+valid_centers = build_valid_centers()
+''' center colors of every orientation of the cube, mirror images excluded '''
+
+def build_piece_lookup(colors, size):
+    ''' Map the faces of a piece's stickers to which piece it is and how it sits
+        Parameters:
+            colors - corner_colors or edge_colors
+            size - 3 for corners or 2 for edges
+        Returns: bytes indexed by the faces read as a base 6 number, holding
+            size * piece + orientation, or 255 for no real piece '''
+
+    lookup = bytearray(b'\xff') * (6 ** size)
+    for piece, faces in enumerate(colors):
+        for orientation in range(size):
+            # turned by orientation, the piece's first face is read at that sticker
+            read = [faces[(n - orientation) % size] for n in range(size)]
+            key = 0
+            for face in read:
+                key = 6 * key + face
+            lookup[key] = size * piece + orientation
+    return bytes(lookup)
+
+corner_lookup = build_piece_lookup(corner_colors, 3)
+edge_lookup = build_piece_lookup(edge_colors, 2)
+''' what piece each set of sticker faces is, see build_piece_lookup '''
+
+piece_of = {size: bytes(code // size for code in range(256)) for size in (2, 3)}
+orientation_of = {size: bytes(code % size for code in range(256)) for size in (2, 3)}
+''' translation tables splitting a lookup value into the piece and its orientation '''
+
+sorted_colors = bytes(sorted(solved_state))
+''' the stickers of any cube with 9 of each color, once sorted '''
+
+corner_stickers = itemgetter(*[facelet for facelets in corner_facelets for facelet in facelets])
+edge_stickers = itemgetter(*[facelet for facelets in edge_facelets for facelet in facelets])
+''' gather the stickers of every corner and every edge '''
+
+def from_facelets(facelets):
+    ''' Read a facelet string
+        Parameters:
+            facelets - 54 letters in U, R, F, D, L, B order, as str or bytes
+        Returns: 54 color values in Rubiks_Cube.state order, as bytes
+        Raises: ValueError if it isn't 54 face letters '''
+
+    if isinstance(facelets, str):
+        facelets = facelets.encode()
+    elif not isinstance(facelets, bytes):
+        raise ValueError('a facelet string is text, not ' + type(facelets).__name__)
+    if len(facelets) != 54:
+        raise ValueError('a facelet string has 54 letters, not ' + str(len(facelets)))
+    codes = facelets.translate(letter_codes)
+    if 255 in codes:
+        raise ValueError('a facelet string only has the letters ' + facelet_faces)
+    return bytes(facelet_order(codes))
+
+def to_facelets(state):
+    ''' Write a state as a facelet string
+        Parameters:
+            state - 54 color values in Rubiks_Cube.state order
+        Returns: facelet string '''
+
+    return bytes(state_order(bytes(state))).translate(code_letters).decode()
+
+def from_digits(digits):
+    ''' Read a state written as 54 color digits in Rubiks_Cube.state order
+        Raises: ValueError if it isn't 54 digits from 0 to 5 '''
+
+    if isinstance(digits, str):
+        digits = digits.encode()
+    elif not isinstance(digits, bytes):
+        raise ValueError('a state is text, not ' + type(digits).__name__)
+    state = digits.translate(digit_codes)
+    if len(state) != 54 or 255 in state:
+        raise ValueError('a state has 54 color digits from 0 to 5')
+    return state
+
+def to_digits(state):
+    ''' Returns a state written as 54 color digits '''
+
+    return bytes(state).translate(code_digits).decode()
+
+def read_state(text):
+    ''' Read a state written either as a facelet string or as 54 color digits
+        Returns: 54 color values in Rubiks_Cube.state order, as bytes
+        Raises: ValueError if it is neither '''
+
+    if not isinstance(text, (str, bytes)):
+        raise ValueError('a state is text, not ' + type(text).__name__)
+    text = text.strip()
+    if text[:1].isdigit():
+        return from_digits(text)
+    return from_facelets(text)
+
+def to_cube(facelets):
+    ''' Returns a new Rubiks_Cube with the stickers of a facelet string '''
+
+    cube = Rubiks_Cube()
+    cube.set_state(from_facelets(facelets))
+    return cube
+
+def permutation_parity(pieces):
+    ''' Returns 1 if a permutation is odd, otherwise 0, by counting the
+        pairs in the wrong order '''
+
+    # bit p is set once piece p has been seen, so the set bits above a
+    # piece count the pieces before it that should come after it
+    seen = 0
+    inversions = 0
+    for piece in pieces:
+        inversions += (seen >> piece).bit_count()
+        seen |= 1 << piece
+    return inversions & 1
+
+def validate_state(state):
+    ''' Check that a state is a cube that can be solved
+        Parameters:
+            state - 54 color values in Rubiks_Cube.state order
+        Returns: None if it can be solved, otherwise a string saying why not '''
+
+    state = bytes(state)
+    if bytes(sorted(state)) != sorted_colors:
+        for color in range(6):
+            if state.count(color) != 9:
+                return 'there are ' + str(state.count(color)) + ' stickers of color ' + str(color) + ', not 9'
+        return 'there are colors other than 0 to 5'
+
+    centers = state[4::9]
+    if centers not in valid_centers:
+        return 'the centers are not in the order of a real cube'
+    # the same as from_state: each color stands for the face whose center it is
+    faces = state.translate(bytes.maketrans(centers, bytes(range(6))))
+
+    sticker = iter(corner_stickers(faces))
+    corners = bytes([corner_lookup[36 * first + 6 * second + third] for first, second, third in zip(sticker, sticker, sticker)])
+    if 255 in corners:
+        return 'corner ' + str(corners.index(255)) + ' is not a real corner'
+    sticker = iter(edge_stickers(faces))
+    edges = bytes([edge_lookup[6 * first + second] for first, second in zip(sticker, sticker)])
+    if 255 in edges:
+        return 'edge ' + str(edges.index(255)) + ' is not a real edge'
+
+    twist = sum(corners.translate(orientation_of[3]))
+    flip = sum(edges.translate(orientation_of[2]))
+    corners = corners.translate(piece_of[3])
+    edges = edges.translate(piece_of[2])
+    if len(set(corners)) != 8 or len(set(edges)) != 12:
+        return 'some pieces are missing or appear twice'
+    if twist % 3:
+        return 'a corner is twisted'
+    if flip % 2:
+        return 'an edge is flipped'
+    if permutation_parity(corners) != permutation_parity(edges):
+        return 'two pieces are swapped'
+    return None
+
+def check_line(text):
+    ''' Read and validate one line of input
+        Returns: (state or None, error string or None) '''
+
+    try:
+        state = read_state(text)
+    except ValueError as error:
+        return None, str(error)
+    return state, validate_state(state)
+
+def process_chunk(chunk, convert = None):
+    ''' Validate, and optionally convert, a chunk of input lines in a worker
+        Parameters:
+            chunk - list of (line number, text) pairs
+            convert - 'facelets' or 'state' to write each valid state in
+                that form, or None to only validate
+        Returns: list of (line number, error or None, converted text or None) '''
+
+    results = []
+    for line_number, text in chunk:
+        state, error = check_line(text)
+        converted = None
+        if error is None and convert is not None:
+            converted = to_facelets(state) if convert == 'facelets' else to_digits(state)
+        results.append((line_number, error, converted))
+    return results
+
+def process_lines(lines, convert = None, workers = None, chunk_size = 10000):
+    ''' Validate a stream of lines on every core, keeping the input order
+        Parameters:
+            lines - iterable of lines, each a facelet string or 54 color digits
+            convert - see process_chunk
+            workers - number of worker processes, all cores if None, and
+                1 to run in this process
+            chunk_size - lines sent to a worker at a time
+        Returns: generator of (line number, error or None, converted text or None) '''
+
+    from batch_runner import read_chunks
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk in read_chunks(lines, chunk_size):
+            yield from process_chunk(chunk, convert)
+        return
+
+    # a bounded queue of pending chunks keeps memory flat and the output in order
+    pending = deque()
+    with ProcessPoolExecutor(workers) as pool:
+        for chunk in read_chunks(lines, chunk_size):
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+            pending.append(pool.submit(process_chunk, chunk, convert))
+        while pending:
+            yield from pending.popleft().result()
+
+def main(argv = None):
+    ''' Validate or convert a file of states from the command line
+        Parameters:
+            argv - command line arguments, sys.argv if None
+        Returns: exit status, 1 if any state was invalid '''
+
+    parser = argparse.ArgumentParser(description = 'Validate and convert cube states written as facelet strings or color digits.')
+    commands = parser.add_subparsers(dest = 'command', required = True)
+    validate = commands.add_parser('validate', help = 'report every line that is not a solvable cube')
+    convert = commands.add_parser('convert', help = 'write every valid state in another form, reporting the others')
+    convert.add_argument('--to', choices = ('facelets', 'state'), default = 'state',
+                         help = 'facelet strings or 54 color digits in Rubiks_Cube.state order')
+    for command in (validate, convert):
+        command.add_argument('input', nargs = '?', default = '-', help = 'file with one state per line, - for stdin')
+        command.add_argument('-o', '--output', default = '-', help = 'file to write to, - for stdout')
+        command.add_argument('-j', '--workers', type = int, default = None, help = 'number of worker processes (default: all cores)')
+        command.add_argument('--chunk-size', type = int, default = 10000, help = 'lines sent to a worker at a time')
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.input == '-' else open(args.input)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    checked = 0
+    invalid = 0
+    try:
+        for line_number, error, converted in process_lines(source, getattr(args, 'to', None), args.workers, args.chunk_size):
+            checked += 1
+            if error is not None:
+                invalid += 1
+                # converted states go to the output, so errors go to stderr
+                print('line ' + str(line_number) + ': ' + error, file = output if args.command == 'validate' else sys.stderr)
+            elif converted is not None:
+                output.write(converted + '\n')
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+    print('{:,} states, {:,} invalid'.format(checked, invalid), file = sys.stderr)
+    return 1 if invalid else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+'''
+This file contains optional instrumentation of the hot paths of the cube
+model and solvers
+
+enable() swaps the instrumented methods for wrappers that count calls and
+moves and add up the time spent, and disable() puts the original methods
+back. Nothing is changed until enable() is called, so turned off the
+instrumentation costs nothing at all, not even a check per move. Times are
+inclusive, so the time of scramble() also counts inside the time of the
+moves it makes.
+
+Counted:
+    moves made, by move token, including moves applied as algorithms
+    calls and seconds spent in move, scramble, apply_algorithm, clone,
+        get_hint and the solvers
+    lookups into the last-layer case indexes, by index, the table lookups
+        that replaced the probe moves of the old hint code
+
+Usage:
+    instrumentation.enable()
+    ...
+    instrumentation.export('stats.prom')
+    instrumentation.export('stats.json', 'json')
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+import json
+from collections import Counter
+from functools import wraps
+from importlib import import_module
+from time import perf_counter
+
+timed_methods = [
+    ('rubix_cube', 'Rubiks_Cube', 'scramble'),
+    ('rubix_cube', 'Rubiks_Cube', 'clone'),
+    ('rubix_cube', 'Rubiks_Cube', 'get_hint'),
+    ('two_phase_solver', 'Two_Phase_Solver', 'solve'),
+    ('cfop_solver', 'CFOP_Solver', 'solve'),
+]
+''' (module, class, method) of every method whose calls and time are counted
+    besides move, apply_algorithm and the last-layer lookups '''
+
+move_counts = Counter()
+call_counts = Counter()
+seconds = Counter()
+lookup_counts = Counter()
+''' counters filled in while the instrumentation is enabled '''
+
+originals = []
+''' (owner, attribute name, original value) of everything enable() replaced '''
+
+def is_enabled():
+    ''' Returns True if the instrumentation is turned on '''
+
+    return bool(originals)
+
+def replace(owner, name, wrapper):
+    ''' Swap an attribute for its wrapper, remembering the original '''
+
+    originals.append((owner, name, owner.__dict__[name]))
+    setattr(owner, name, wrapper)
+
+def timed(label, function):
+    ''' Wrap a function to count its calls and time
+        Parameters:
+            label - name the calls are counted under
+            function - function to wrap
+        Returns: wrapped function '''
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            seconds[label] += perf_counter() - start
+            call_counts[label] += 1
+    return wrapper
+
+def enable():
+    ''' Turn the instrumentation on, doing nothing if it is already on '''
+
+    if originals:
+        return
+
+    from algorithm import compile_algorithm
+    import last_layer
+    from rubix_cube import Rubiks_Cube
+
+    move = Rubiks_Cube.move
+    def counted_move(self, token):
+        move_counts[token] += 1
+        move(self, token)
+    replace(Rubiks_Cube, 'move', timed('Rubiks_Cube.move', counted_move))
+
+    apply_algorithm = Rubiks_Cube.apply_algorithm
+    def counted_apply_algorithm(self, algorithm):
+        move_counts.update(compile_algorithm(algorithm).moves)
+        apply_algorithm(self, algorithm)
+    replace(Rubiks_Cube, 'apply_algorithm', timed('Rubiks_Cube.apply_algorithm', counted_apply_algorithm))
+
+    lookup = last_layer.lookup
+    def counted_lookup(index_name, key, state):
+        lookup_counts[index_name] += 1
+        return lookup(index_name, key, state)
+    replace(last_layer, 'lookup', counted_lookup)
+
+    for module_name, class_name, method_name in timed_methods:
+        owner = getattr(import_module(module_name), class_name)
+        replace(owner, method_name, timed(class_name + '.' + method_name, owner.__dict__[method_name]))
+
+def disable():
+    ''' Turn the instrumentation off, putting every original method back.
+        The counters are kept until reset() is called '''
+
+    while originals:
+        owner, name, original = originals.pop()
+        setattr(owner, name, original)
+
+def reset():
+    ''' Set every counter back to zero '''
+
+    for counter in (move_counts, call_counts, seconds, lookup_counts):
+        counter.clear()
+
+def stats():
+    ''' Get a copy of everything counted so far
+        Returns: dictionary with 'moves', 'calls', 'seconds' and 'lookups'
+            dictionaries '''
+
+    return {
+        'enabled': is_enabled(),
+        'moves': dict(move_counts),
+        'calls': dict(call_counts),
+        'seconds': dict(seconds),
+        'lookups': dict(lookup_counts),
+    }
+
+def label_value(value):
+    ''' Escape a label value for the Prometheus text format '''
+
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def to_prometheus():
+    ''' Write the counters in the Prometheus text exposition format
+        Returns: text of every metric '''
+
+    metrics = (
+        ('rubiks_moves_total', 'Moves made, by move token.', 'move', move_counts),
+        ('rubiks_calls_total', 'Calls of each instrumented function.', 'function', call_counts),
+        ('rubiks_seconds_total', 'Seconds spent in each instrumented function, inclusive.', 'function', seconds),
+        ('rubiks_lookups_total', 'Lookups into each last-layer case index.', 'index', lookup_counts),
+    )
+    lines = []
+    for name, help, label, counter in metrics:
+        lines.append('# HELP ' + name + ' ' + help)
+        lines.append('# TYPE ' + name + ' counter')
+        for key, value in sorted(counter.items()):
+            lines.append(name + '{' + label + '="' + label_value(key) + '"} ' + repr(value))
+    return '\n'.join(lines) + '\n'
+
+def export(path, format = 'prometheus'):
+    ''' Write the counters to a file
+        Parameters:
+            path - file to write
+            format - 'prometheus' for the Prometheus text format or 'json' '''
+
+    with open(path, 'w') as file:
+        if format == 'json':
+            json.dump(stats(), file, indent = 2)
+        elif format == 'prometheus':
+            file.write(to_prometheus())
+        else:
+            raise ValueError('unknown format ' + repr(format))
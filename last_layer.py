@@ -0,0 +1,259 @@
+'''
+This file contains the precomputed last-layer case index used to find OLL
+and PLL algorithms without turning the cube
+
+Each case is generated by undoing its algorithm (with every AUF before it,
+and for PLL every AUF after it) on a solved cube and reading the pattern of
+the last layer. Looking a cube up is then one dictionary access on the
+pattern of its own last layer. Patterns are read relative to the centers, so
+the color scheme and orientation of the cube don't matter.
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+from algorithm import compile_algorithm
+from move_tables import compose, inverse
+from rubix_cube import solved_state
+
+OLL_algorithms = {
+    'OLL 1': "R U2 R2 F R F' U2 R' F R F'",
+    'OLL 2': "F R U R' U' F' f R U R' U' f'",
+    'OLL 3': "f R U R' U' f' U' F R U R' U' F'",
+    'OLL 4': "f R U R' U' f' U F R U R' U' F'",
+    'OLL 5': "r' U2 R U R' U r",
+    'OLL 6': "r U2 R' U' R U' r'",
+    'OLL 7': "r U R' U R U2 r'",
+    'OLL 8': "l' U' L U' L' U2 l",
+    'OLL 9': "R U R' U' R' F R2 U R' U' F'",
+    'OLL 10': "R U R' U R' F R F' R U2 R'",
+    'OLL 11': "r U R' U R' F R F' R U2 r'",
+    'OLL 12': "M' R' U' R U' R' U2 R U' R r'",
+    'OLL 13': "F U R U' R2 F' R U R U' R'",
+    'OLL 14': "R' F R U R' F' R F U' F'",
+    'OLL 15': "r' U' r R' U' R U r' U r",
+    'OLL 16': "r U r' R U R' U' r U' r'",
+    'OLL 17': "R U R' U R' F R F' U2 R' F R F'",
+    'OLL 18': "r U R' U R U2 r2 U' R U' R' U2 r",
+    'OLL 19': "r' R U R U R' U' M' R' F R F'",
+    'OLL 20': "r U R' U' M2 U R U' R' U' M'",
+    'OLL 21': "R U2 R' U' R U R' U' R U' R'",
+    'OLL 22': "R U2 R2 U' R2 U' R2 U2 R",
+    'OLL 23': "R2 D' R U2 R' D R U2 R",
+    'OLL 24': "r U R' U' r' F R F'",
+    'OLL 25': "F' r U R' U' r' F R",
+    'OLL 26': "R U2 R' U' R U' R'",
+    'OLL 27': "R U R' U R U2 R'",
+    'OLL 28': "r U R' U' M U R U' R'",
+    'OLL 29': "R U R' U' R U' R' F' U' F R U R'",
+    'OLL 30': "F R' F R2 U' R' U' R U R' F2",
+    'OLL 31': "R' U' F U R U' R' F' R",
+    'OLL 32': "L U F' U' L' U L F L'",
+    'OLL 33': "R U R' U' R' F R F'",
+    'OLL 34': "R U R2 U' R' F R U R U' F'",
+    'OLL 35': "R U2 R2 F R F' R U2 R'",
+    'OLL 36': "L' U' L U' L' U L U L F' L' F",
+    'OLL 37': "F R' F' R U R U' R'",
+    'OLL 38': "R U R' U R U' R' U' R' F R F'",
+    'OLL 39': "L F' L' U' L U F U' L'",
+    'OLL 40': "R' F R U R' U' F' U R",
+    'OLL 41': "R U R' U R U2 R' F R U R' U' F'",
+    'OLL 42': "R' U' R U' R' U2 R F R U R' U' F'",
+    'OLL 43': "F' U' L' U L F",
+    'OLL 44': "F U R U' R' F'",
+    'OLL 45': "F R U R' U' F'",
+    'OLL 46': "R' U' R' F R F' U R",
+    'OLL 47': "R' U' R' F R F' R' F R F' U R",
+    'OLL 48': "F R U R' U' R U R' U' F'",
+    'OLL 49': "r U' r2 U r2 U r2 U' r",
+    'OLL 50': "r' U r2 U' r2 U' r2 U r'",
+    'OLL 51': "F U R U' R' U R U' R' F'",
+    'OLL 52': "R U R' U R U' B U' B' R'",
+    'OLL 53': "l' U2 L U L' U' L U L' U l",
+    'OLL 54': "r U2 R' U' R U R' U' R U' r'",
+    'OLL 55': "R' F R U R U' R2 F' R2 U' R' U R U R'",
+    'OLL 56': "r' U' r U' R' U R U' R' U R r' U r",
+    'OLL 57': "R U R' U' M' U R U' r'",
+}
+''' one algorithm for each of the 57 OLL cases '''
+
+PLL_algorithms = {
+    'PLL Aa': "x R' U R' D2 R U' R' D2 R2 x'",
+    'PLL Ab': "x R2 D2 R U R' D2 R U' R x'",
+    'PLL E': "x' R U' R' D R U R' D' R U R' D R U' R' D' x",
+    'PLL F': "R' U' F' R U R' U' R' F R2 U' R' U' R U R' U R",
+    'PLL Ga': "R2 U R' U R' U' R U' R2 U' D R' U R D'",
+    'PLL Gb': "R' U' R U D' R2 U R' U R U' R U' R2 D",
+    'PLL Gc': "R2 U' R U' R U R' U R2 U D' R U' R' D",
+    'PLL Gd': "R U R' U' D R2 U' R U' R' U R' U R2 D'",
+    'PLL H': "M2 U M2 U2 M2 U M2",
+    'PLL Ja': "R' U L' U2 R U' R' U2 R L U'",
+    'PLL Jb': "R U R' F' R U R' U' R' F R2 U' R' U'",
+    'PLL Na': "R U R' U R U R' F' R U R' U' R' F R2 U' R' U2 R U' R'",
+    'PLL Nb': "R' U R U' R' F' U' F R U R' F R' F' R U' R",
+    'PLL Ra': "R U' R' U' R U R D R' U' R D' R' U2 R'",
+    'PLL Rb': "R2 F R U R U' R' F' R U2 R' U2 R",
+    'PLL T': "R U R' U' R' F R2 U' R' U' R U R' F'",
+    'PLL Ua': "M2 U M U2 M' U M2",
+    'PLL Ub': "M2 U' M U2 M' U' M2",
+    'PLL V': "R' U R' U' y R' F' R2 U' R' U R' F R F",
+    'PLL Y': "F R U' R' U' R U R' F' R U R' U' R' F R F'",
+    'PLL Z': "M' U M2 U M2 U M' U2 M2",
+}
+''' one algorithm for each of the 21 PLL cases '''
+
+OLL_edge_algorithms = {
+    'dot': "F (R U R' U') S (R U R' U') f'",
+    'line': "F (R U R' U') F'",
+    'L-shape': "f (R U R' U') f'",
+}
+''' first look of 2-look OLL, orienting the last-layer edges '''
+
+OLL_corner_algorithms = {
+    'H': "R U2 R' U' R U R' U' R U' R'",
+    'Pi': "R U2 R2 U' R2 U' R2 U2 R",
+    'Sune': "R U R' U R U2 R'",
+    'Antisune': "R U2 R' U' R U' R'",
+    'Headlights': "R2 D R' U2 R D' R' U2 R'",
+    'T': "r U R' U' r' F R F'",
+    'Bowtie': "F' r U R' U' r' F R",
+}
+''' second look of 2-look OLL, orienting the last-layer corners once the edges are done '''
+
+AUFs = ('', 'U', "U'", 'U2')
+''' turns of the U face that can come before or after an algorithm, shortest first '''
+
+top_edges = (1, 3, 5, 7)
+top_corners = (0, 2, 6, 8)
+side_edges = (10, 19, 28, 37)
+side_corners = (9, 11, 18, 20, 27, 29, 36, 38)
+side_tops = (9, 10, 11, 18, 19, 20, 27, 28, 29, 36, 37, 38)
+''' sticker indices of the last layer that each kind of case depends on '''
+
+indexes = None
+''' case indexes, built by get_indexes the first time one is needed '''
+
+def relative_faces(state):
+    ''' Get the face each sticker belongs to, judged by the face centers
+        Parameters:
+            state - 54 color values in Rubiks_Cube.state order
+        Returns: list of 54 face indices in U, F, R, B, L, D order '''
+
+    face_of = {state[9 * face + 4]: face for face in range(6)}
+    return [face_of.get(color, -1) for color in state]
+
+def orientation_key(state, stickers):
+    ''' Get a bit pattern of which of the passed stickers show the U color '''
+
+    top = state[4]
+    key = 0
+    for sticker in stickers:
+        key = 2 * key + (state[sticker] == top)
+    return key
+
+def permutation_key(state):
+    ''' Get the faces that the top row of each side face belongs to '''
+
+    faces = relative_faces(state)
+    return bytes(faces[sticker] for sticker in side_tops)
+
+def OLL_key(state):
+    ''' Key of the full last-layer orientation pattern '''
+
+    return orientation_key(state, top_edges + top_corners + side_edges + side_corners)
+
+def OLL_edge_key(state):
+    ''' Key of the last-layer edge orientation pattern '''
+
+    return orientation_key(state, top_edges)
+
+def OLL_corner_key(state):
+    ''' Key of the last-layer corner orientation pattern '''
+
+    return orientation_key(state, top_corners + side_corners)
+
+def build_index(algorithms, key, post_AUF = False, solved_name = None):
+    ''' Build the index of a set of last-layer cases
+        Parameters:
+            algorithms - dictionary mapping case names to algorithm strings
+            key - function reading the pattern that identifies a case
+            post_AUF - whether cases also differ by a U turn after the algorithm
+            solved_name - name of the case needing no algorithm, if it
+                should be in the index
+        Returns: dictionary mapping keys to (name, AUF before, algorithm, AUF after) '''
+
+    index = {}
+    cases = list(algorithms.items())
+    if solved_name is not None:
+        cases.insert(0, (solved_name, ''))
+
+    for name, algorithm in cases:
+        perm = compile_algorithm(algorithm).perm
+        for before in AUFs:
+            for after in AUFs if post_AUF else ('',):
+                total = compose(compose(compile_algorithm(before).perm, perm), compile_algorithm(after).perm)
+                case = bytes(solved_state[i] for i in inverse(total))
+                index.setdefault(key(case), (name, before, algorithm, after))
+
+    return index
+
+def get_indexes():
+    ''' Get the last-layer case indexes, building them on first use
+        Returns: dictionary with 'OLL', 'PLL', 'OLL edges' and 'OLL corners' indexes '''
+
+    global indexes
+    if indexes is None:
+        indexes = {
+            'OLL': build_index(OLL_algorithms, OLL_key, solved_name = 'OLL skip'),
+            'PLL': build_index(PLL_algorithms, permutation_key, post_AUF = True, solved_name = 'PLL skip'),
+            'OLL edges': build_index(OLL_edge_algorithms, OLL_edge_key, solved_name = 'edges oriented'),
+            'OLL corners': build_index(OLL_corner_algorithms, OLL_corner_key, solved_name = 'corners oriented'),
+        }
+    return indexes
+
+def lookup(index_name, key, state):
+    ''' Find the case of a cube in one of the indexes
+        Parameters:
+            index_name - 'OLL', 'PLL', 'OLL edges' or 'OLL corners'
+            key - function reading the cube's pattern
+            state - 54 color values in Rubiks_Cube.state order
+        Returns: (name, AUF before, algorithm, AUF after) or None if no case matches '''
+
+    return get_indexes()[index_name].get(key(state))
+
+def find_OLL(state):
+    ''' Find the full OLL case of a cube with F2L solved '''
+
+    return lookup('OLL', OLL_key, state)
+
+def find_PLL(state):
+    ''' Find the PLL case of a cube with the last layer oriented '''
+
+    return lookup('PLL', permutation_key, state)
+
+def find_OLL_edges(state):
+    ''' Find the first-look 2-look OLL case of a cube with F2L solved '''
+
+    return lookup('OLL edges', OLL_edge_key, state)
+
+def find_OLL_corners(state):
+    ''' Find the second-look 2-look OLL case of a cube with its last-layer edges oriented '''
+
+    return lookup('OLL corners', OLL_corner_key, state)
+
+def case_to_str(case):
+    ''' Write a case found in an index as a hint, such as "(U) R U R' U R U2 R' (U2)"
+        Parameters:
+            case - (name, AUF before, algorithm, AUF after)
+        Returns: hint string '''
+
+    name, before, algorithm, after = case
+    parts = []
+    if before:
+        parts.append('(' + before + ')')
+    if algorithm:
+        parts.append(algorithm)
+    if after:
+        parts.append('(' + after + ')')
+    return ' '.join(parts)
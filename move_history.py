@@ -0,0 +1,138 @@
+'''
+This file contains the Move_History class which records every move made on
+a Rubiks_Cube so they can be undone, redone and jumped between
+
+Moves are kept in an append-only log and undone with their precomputed
+inverse, so undo and redo each cost one move. Every checkpoint_interval
+moves a copy of the state is saved as well, so jumping to any point of even
+a very long session restores the nearest checkpoint before it and replays
+fewer than checkpoint_interval moves.
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+from algorithm import compile_algorithm
+from move_tables import move_perms
+
+def inverse_move(move):
+    ''' Returns the move token that undoes a move, for a cube of any size '''
+
+    if move.endswith("'"):
+        return move[:-1]
+    if move.endswith('2'):
+        return move
+    return move + "'"
+
+inverse_moves = {move: inverse_move(move) for move in move_perms}
+''' maps every move token of a 3x3 cube to the move that undoes it '''
+
+class Move_History:
+    ''' This class represents the record of moves made on one cube, with a
+        position that can be moved back and forth through it '''
+
+    def __init__(self, cube, checkpoint_interval = 64):
+        ''' Start recording the moves of a cube from its current state
+            Parameters:
+                cube - Rubiks_Cube or NxN_Cube whose moves are recorded
+                checkpoint_interval - number of moves between saved states '''
+
+        self.cube = cube
+        self.checkpoint_interval = checkpoint_interval
+        self.clear()
+
+    def __len__(self):
+        ''' Returns the number of moves recorded, including undone ones that can be redone '''
+
+        return len(self.moves)
+
+    def clear(self):
+        ''' Forget every move and start recording again from the cube's current state '''
+
+        self.moves = []
+        self.position = 0
+        # checkpoints[i] is the state after i * checkpoint_interval moves
+        self.checkpoints = [bytes(self.cube.state)]
+
+    def record(self, move):
+        ''' Add a move that was just made on the cube to the history, throwing
+            away any moves that had been undone
+            Parameters:
+                move - move string in cube notation '''
+
+        if self.position < len(self.moves):
+            del self.moves[self.position:]
+            del self.checkpoints[self.position // self.checkpoint_interval + 1:]
+
+        self.moves.append(move)
+        self.position += 1
+        if self.position % self.checkpoint_interval == 0:
+            self.checkpoints.append(bytes(self.cube.state))
+
+    def apply(self, moves):
+        ''' Make moves on the cube and record them
+            Parameters:
+                moves - list of move strings, or an algorithm string in
+                    the notation accepted by algorithm.compile_algorithm '''
+
+        if isinstance(moves, str):
+            moves = compile_algorithm(moves).moves
+        for move in moves:
+            self.cube.move(move)
+            self.record(move)
+
+    def can_undo(self):
+        ''' Returns True if there is a move to undo '''
+
+        return self.position > 0
+
+    def can_redo(self):
+        ''' Returns True if there is an undone move to redo '''
+
+        return self.position < len(self.moves)
+
+    def undo(self):
+        ''' Undo the last move
+            Returns: the move that was undone, or None if there was none '''
+
+        if not self.can_undo():
+            return None
+        self.position -= 1
+        move = self.moves[self.position]
+        self.cube.move(inverse_moves.get(move) or inverse_move(move))
+        return move
+
+    def redo(self):
+        ''' Make the last undone move again
+            Returns: the move that was redone, or None if there was none '''
+
+        if not self.can_redo():
+            return None
+        move = self.moves[self.position]
+        self.cube.move(move)
+        self.position += 1
+        return move
+
+    def seek(self, position):
+        ''' Put the cube in the state it was in after a number of moves,
+            starting from the closest checkpoint
+            Parameters:
+                position - number of recorded moves to have made, from 0 to len(self) '''
+
+        if not 0 <= position <= len(self.moves):
+            raise IndexError('history position out of range')
+
+        checkpoint = position // self.checkpoint_interval
+        # stepping from the current position is cheaper when it is closer
+        if abs(position - self.position) < position - checkpoint * self.checkpoint_interval:
+            while self.position < position:
+                self.redo()
+            while self.position > position:
+                self.undo()
+            return
+
+        self.cube.state[:] = self.checkpoints[checkpoint]
+        for move in self.moves[checkpoint * self.checkpoint_interval:position]:
+            self.cube.move(move)
+        self.position = position
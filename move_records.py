@@ -0,0 +1,305 @@
+'''
+This file contains the compact binary format for storing large numbers of
+scrambles, solutions and recorded sessions
+
+Every move token accepted by Rubiks_Cube.move is stored as a 6 bit code, so
+four moves take three bytes. A file is a header, the records one after
+another, and an index block at the end giving the offset of every record,
+so any record can be read straight from a memory-mapped file without
+parsing the ones before it. Appending to a file reads its index, writes the
+new records over the old index block and writes a longer index when it is
+closed. If a writer never got to close the file, the index is rebuilt by
+stepping through the records.
+
+Layout (little-endian):
+    header - b'RUBIKREC', format version (H), 6 bytes padding
+    record - kind (B), number of moves (I), packed codes
+    index - offset of each record (Q per record)
+    footer - offset of the index (Q), number of records (Q), b'RUBIKIDX'
+
+Usage:
+    python move_records.py pack scrambles.txt scrambles.rec
+    python move_records.py unpack scrambles.rec
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+magic = b'RUBIKREC'
+index_magic = b'RUBIKIDX'
+file_format = 1
+''' version of the layout of the file itself '''
+
+header_layout = struct.Struct('<8sH6x')
+record_layout = struct.Struct('<BI')
+footer_layout = struct.Struct('<QQ8s')
+''' layouts of the fixed size parts of a file '''
+
+record_kinds = ('scramble', 'solution', 'session')
+''' kinds of record, stored as their index in this tuple '''
+
+code_moves = tuple(letter + suffix for letter in 'RLFBUDMSErlfbudxyz' for suffix in ('', "'", '2'))
+''' every move token, stored as its index in this tuple (0-53) '''
+
+move_codes = {move: code for code, move in enumerate(code_moves)}
+''' maps every move token to its code '''
+
+code_pairs = [(code_moves[pair & 63] if pair & 63 < len(code_moves) else None,
+               code_moves[pair >> 6] if pair >> 6 < len(code_moves) else None) for pair in range(4096)]
+''' maps 12 bits to the two moves whose codes they hold '''
+
+def pack_moves(moves):
+    ''' Pack move tokens into 6 bit codes
+        Parameters:
+            moves - list of move strings
+        Returns: bytes, three for every four moves
+        Raises: ValueError if a move is not a known token '''
+
+    try:
+        codes = [move_codes[move] for move in moves]
+    except KeyError as error:
+        raise ValueError('unknown move ' + repr(error.args[0]))
+    codes += [0] * (-len(codes) % 4)
+
+    packed = bytearray()
+    for i in range(0, len(codes), 4):
+        group = codes[i] | codes[i + 1] << 6 | codes[i + 2] << 12 | codes[i + 3] << 18
+        packed += group.to_bytes(3, 'little')
+    return bytes(packed)
+
+def unpack_moves(data, count):
+    ''' Read move tokens out of packed codes
+        Parameters:
+            data - bytes written by pack_moves
+            count - number of moves packed in data
+        Returns: list of move strings '''
+
+    moves = []
+    for i in range(0, 3 * ((count + 3) // 4), 3):
+        group = data[i] | data[i + 1] << 8 | data[i + 2] << 16
+        moves.extend(code_pairs[group & 4095])
+        moves.extend(code_pairs[group >> 12])
+    del moves[count:]
+    return moves
+
+def packed_size(count):
+    ''' Returns the number of bytes holding count packed moves '''
+
+    return 3 * ((count + 3) // 4)
+
+def from_text(line):
+    ''' Read a line of space separated moves, as shown by scramble_cube
+        Returns: list of move strings '''
+
+    return line.split()
+
+def to_text(moves):
+    ''' Returns the moves written as a line of space separated moves '''
+
+    return ' '.join(moves)
+
+def scan_records(data, start):
+    ''' Find the offset of every record by stepping through them, for files
+        whose writer never wrote an index
+        Parameters:
+            data - contents of the file
+            start - offset of the first record
+        Returns: (list of record offsets, offset where the last record ends) '''
+
+    offsets = []
+    offset = start
+    while offset + record_layout.size <= len(data):
+        kind, count = record_layout.unpack_from(data, offset)
+        end = offset + record_layout.size + packed_size(count)
+        if kind >= len(record_kinds) or end > len(data):
+            break
+        offsets.append(offset)
+        offset = end
+    return offsets, offset
+
+def read_index(data):
+    ''' Find the record offsets of a file from its index, or by scanning if
+        it has none
+        Parameters:
+            data - contents of the file
+        Returns: (record offsets, offset where the records end)
+        Raises: ValueError if the data is not a record file '''
+
+    if len(data) < header_layout.size or header_layout.unpack_from(data)[0] != magic:
+        raise ValueError('not a move record file')
+    if header_layout.unpack_from(data)[1] != file_format:
+        raise ValueError('unsupported move record format ' + str(header_layout.unpack_from(data)[1]))
+
+    if len(data) >= header_layout.size + footer_layout.size:
+        index_offset, count, footer_magic = footer_layout.unpack_from(data, len(data) - footer_layout.size)
+        if footer_magic == index_magic and index_offset + 8 * count + footer_layout.size == len(data):
+            return memoryview(data)[index_offset:index_offset + 8 * count].cast('Q'), index_offset
+
+    return scan_records(data, header_layout.size)
+
+class Record_Writer:
+    ''' This class represents a record file open for writing, new records
+        being streamed onto the end of it '''
+
+    def __init__(self, path, append = False):
+        ''' Open a record file
+            Parameters:
+                path - file to write
+                append - whether to keep the records already in the file '''
+
+        self.offsets = []
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            # mapped rather than read, only the index or the record headers are needed
+            with open(path, 'rb') as file:
+                mapped = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+            try:
+                offsets, end = read_index(mapped)
+                self.offsets = list(offsets)
+                # the index is a view of the map, so it has to go first
+                if isinstance(offsets, memoryview):
+                    offsets.release()
+            finally:
+                mapped.close()
+            self.file = open(path, 'r+b')
+            self.file.seek(end)
+            self.file.truncate()
+        else:
+            self.file = open(path, 'wb')
+            self.file.write(header_layout.pack(magic, file_format))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def __len__(self):
+        ''' Returns the number of records in the file '''
+
+        return len(self.offsets)
+
+    def write(self, moves, kind = 'scramble'):
+        ''' Add a record to the end of the file
+            Parameters:
+                moves - list of move strings, or a line of space separated moves
+                kind - 'scramble', 'solution' or 'session' '''
+
+        if isinstance(moves, str):
+            moves = from_text(moves)
+        # packed before the offset is kept, so a rejected record leaves no trace
+        record = record_layout.pack(record_kinds.index(kind), len(moves)) + pack_moves(moves)
+        self.offsets.append(self.file.tell())
+        self.file.write(record)
+
+    def close(self):
+        ''' Write the index and close the file '''
+
+        if self.file.closed:
+            return
+        index_offset = self.file.tell()
+        self.file.write(struct.pack('<' + str(len(self.offsets)) + 'Q', *self.offsets))
+        self.file.write(footer_layout.pack(index_offset, len(self.offsets), index_magic))
+        self.file.close()
+
+class Record_Reader:
+    ''' This class represents a record file mapped into memory, whose
+        records can be read in any order '''
+
+    def __init__(self, path):
+        ''' Open a record file
+            Parameters:
+                path - file to read
+            Raises: ValueError if the file is not a record file '''
+
+        with open(path, 'rb') as file:
+            self.data = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ) if os.path.getsize(path) else b''
+        self.offsets = read_index(self.data)[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def __len__(self):
+        ''' Returns the number of records in the file '''
+
+        return len(self.offsets)
+
+    def __getitem__(self, i):
+        ''' Returns the moves of record i as a list of move strings '''
+
+        offset = self.offsets[i]
+        kind, count = record_layout.unpack_from(self.data, offset)
+        start = offset + record_layout.size
+        return unpack_moves(self.data[start:start + packed_size(count)], count)
+
+    def __iter__(self):
+        ''' Go through the moves of every record in order '''
+
+        for i in range(len(self.offsets)):
+            yield self[i]
+
+    def kind(self, i):
+        ''' Returns the kind of record i, 'scramble', 'solution' or 'session' '''
+
+        return record_kinds[self.data[self.offsets[i]]]
+
+    def close(self):
+        ''' Unmap the file '''
+
+        # the index is a view of the map, so it has to go first
+        if isinstance(self.offsets, memoryview):
+            self.offsets.release()
+        self.offsets = []
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+def main(argv = None):
+    ''' Convert between text files of moves and record files from the command line
+        Parameters:
+            argv - command line arguments, sys.argv if None
+        Returns: exit status '''
+
+    parser = argparse.ArgumentParser(description = 'Convert lines of space separated moves to and from move record files.')
+    commands = parser.add_subparsers(dest = 'command', required = True)
+    pack = commands.add_parser('pack', help = 'write a text file of moves as a record file')
+    pack.add_argument('input', help = 'text file with one move sequence per line, - for stdin')
+    pack.add_argument('output', help = 'record file to write')
+    pack.add_argument('--kind', choices = record_kinds, default = 'scramble', help = 'kind of every record')
+    pack.add_argument('--append', action = 'store_true', help = 'add to the records already in the output')
+    unpack = commands.add_parser('unpack', help = 'write the records of a record file as text')
+    unpack.add_argument('input', help = 'record file to read')
+    unpack.add_argument('-o', '--output', default = '-', help = 'text file to write, - for stdout')
+    args = parser.parse_args(argv)
+
+    if args.command == 'pack':
+        source = sys.stdin if args.input == '-' else open(args.input)
+        try:
+            with Record_Writer(args.output, args.append) as writer:
+                for line in source:
+                    if line.strip():
+                        writer.write(from_text(line), args.kind)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+    else:
+        output = sys.stdout if args.output == '-' else open(args.output, 'w')
+        try:
+            with Record_Reader(args.input) as reader:
+                for moves in reader:
+                    output.write(to_text(moves) + '\n')
+        finally:
+            if output is not sys.stdout:
+                output.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+'''
+This file contains the precomputed sticker permutations used to turn a Rubiks_Cube
+
+Every sticker of the cube has an index from 0 to 53: square i of face f is
+sticker 9 * f + i, with the faces in the same U, F, R, B, L, D order as
+Rubiks_Cube.cube. A move is stored as a tuple of 54 indices where entry i
+is the sticker that ends up in position i, so any move is a single gather:
+
+    new_state[i] = old_state[perm[i]]
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+from operator import itemgetter
+
+face_offsets = {'U':0, 'F':9, 'R':18, 'B':27, 'L':36, 'D':45}
+''' maps a face name to the index of its first sticker '''
+
+face_turn = (6, 3, 0, 7, 4, 1, 8, 5, 2)
+''' squares of a face that move into squares 0-8 when it turns 90° clockwise '''
+
+# each quarter turn is (turned face, squares that change, squares they take their colors from)
+quarter_turns = {
+    'R': ('R', 'F2 F5 F8 U2 U5 U8 B0 B3 B6 D2 D5 D8', 'D2 D5 D8 F2 F5 F8 U8 U5 U2 B6 B3 B0'),
+    'L': ('L', 'F0 F3 F6 D0 D3 D6 B8 B5 B2 U0 U3 U6', 'U0 U3 U6 F0 F3 F6 D0 D3 D6 B8 B5 B2'),
+    'F': ('F', 'U6 U7 U8 R0 R3 R6 D2 D1 D0 L8 L5 L2', 'L8 L5 L2 U6 U7 U8 R0 R3 R6 D2 D1 D0'),
+    'B': ('B', 'U2 U1 U0 L0 L3 L6 D6 D7 D8 R8 R5 R2', 'R8 R5 R2 U2 U1 U0 L0 L3 L6 D6 D7 D8'),
+    'U': ('U', 'F2 F1 F0 L2 L1 L0 B2 B1 B0 R2 R1 R0', 'R2 R1 R0 F2 F1 F0 L2 L1 L0 B2 B1 B0'),
+    'D': ('D', 'F6 F7 F8 R6 R7 R8 B6 B7 B8 L6 L7 L8', 'L6 L7 L8 F6 F7 F8 R6 R7 R8 B6 B7 B8'),
+    'M': (None, 'U1 U4 U7 F1 F4 F7 D1 D4 D7 B7 B4 B1', 'B7 B4 B1 U1 U4 U7 F1 F4 F7 D1 D4 D7'),
+    'S': (None, 'U3 U4 U5 R1 R4 R7 D5 D4 D3 L7 L4 L1', 'L7 L4 L1 U3 U4 U5 R1 R4 R7 D5 D4 D3'),
+    'E': (None, 'F3 F4 F5 R3 R4 R5 B3 B4 B5 L3 L4 L5', 'L3 L4 L5 F3 F4 F5 R3 R4 R5 B3 B4 B5'),
+}
+
+# wide moves and whole-cube rotations written as sequences of the quarter turns above
+compound_moves = {
+    'r': "R M'", 'l': 'L M', 'f': 'F S', 'b': "B S'", 'u': "U E'", 'd': 'D E',
+    'x': "R M' L'", 'y': "U E' D'", 'z': "F S B'",
+}
+
+identity = tuple(range(54))
+''' permutation that leaves every sticker where it is '''
+
+def compose(first, second):
+    ''' Combine two permutations into one
+        Parameters:
+            first - permutation applied first
+            second - permutation applied after first
+        Returns: permutation equal to applying first then second '''
+
+    return tuple(first[i] for i in second)
+
+def inverse(perm):
+    ''' Get the permutation that undoes the passed one
+        Parameters:
+            perm - permutation to invert
+        Returns: inverse permutation '''
+
+    result = [0] * len(perm)
+    for i, source in enumerate(perm):
+        result[source] = i
+    return tuple(result)
+
+def power(perm, count):
+    ''' Apply a permutation to itself count times
+        Parameters:
+            perm - permutation to repeat
+            count - number of times to apply it
+        Returns: repeated permutation '''
+
+    result = identity
+    for i in range(count):
+        result = compose(result, perm)
+    return result
+
+def sticker_index(name):
+    ''' Convert a sticker name such as 'F5' to its index from 0 to 53 '''
+
+    return face_offsets[name[0]] + int(name[1])
+
+def build_quarter_turn(face, targets, sources):
+    ''' Build the permutation for one 90° clockwise turn
+        Parameters:
+            face - name of the face that rotates, or None for a slice
+            targets - names of the side stickers that change
+            sources - names of the stickers they take their colors from
+        Returns: permutation as a tuple of 54 indices '''
+
+    perm = list(identity)
+    for target, source in zip(targets.split(), sources.split()):
+        perm[sticker_index(target)] = sticker_index(source)
+    if face is not None:
+        offset = face_offsets[face]
+        for i in range(9):
+            perm[offset + i] = offset + face_turn[i]
+    return tuple(perm)
+
+def build_move_perms():
+    ''' Build the permutation for every move token accepted by Rubiks_Cube.move,
+        including the 2 and ' forms of each move
+        Returns: dictionary mapping move strings to permutations '''
+
+    base = {}
+    for name, (face, targets, sources) in quarter_turns.items():
+        base[name] = build_quarter_turn(face, targets, sources)
+    for name, sequence in compound_moves.items():
+        perm = identity
+        for move in sequence.split():
+            perm = compose(perm, base[move[0]] if len(move) == 1 else inverse(base[move[0]]))
+        base[name] = perm
+
+    perms = {}
+    for name, perm in base.items():
+        perms[name] = perm
+        perms[name + '2'] = power(perm, 2)
+        perms[name + "'"] = power(perm, 3)
+    return perms
+
+move_perms = build_move_perms()
+''' maps every move token to its sticker permutation '''
+
+move_gathers = {move: itemgetter(*perm) for move, perm in move_perms.items()}
+''' maps every move token to a function that gathers the stickers of a 54-sticker state '''
@@ -0,0 +1,257 @@
+'''
+This file contains the NxN_Cube class, a model of an N x N x N cube of any
+size from 2x2 up
+
+Stickers are stored the same way as in Rubiks_Cube, one byte each in U, F,
+R, B, L, D order with N * N squares per face read row by row, so a 3x3
+NxN_Cube has exactly the stickers of a Rubiks_Cube. The permutation of every
+move is worked out from the geometry of the cube the first time it is used
+on a cube of that size and cached, so every move on every cube of that size
+after that is a single gather of the stickers, whatever N is.
+
+Moves:
+    R L F B U D - the outer layer, with ' or 2 as usual
+    Rw, r - the outer 2 layers, 3Rw the outer 3 layers and so on
+    2R - only the 2nd layer from the R face, 3R the 3rd and so on
+    M S E - the middle layer, on odd sizes only
+    x y z - the whole cube
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+import re
+from functools import lru_cache
+from operator import itemgetter
+
+face_frames = (
+    ((0, 1, 0), (1, 0, 0), (0, 0, 1)),
+    ((0, 0, 1), (1, 0, 0), (0, -1, 0)),
+    ((1, 0, 0), (0, 0, -1), (0, -1, 0)),
+    ((0, 0, -1), (-1, 0, 0), (0, -1, 0)),
+    ((-1, 0, 0), (0, 0, 1), (0, -1, 0)),
+    ((0, -1, 0), (1, 0, 0), (0, 0, -1)),
+)
+''' (outward normal, direction of the columns, direction of the rows) of the
+    U, F, R, B, L and D faces, x to the right, y up and z to the front '''
+
+face_axes = {'R': (0, 1), 'L': (0, -1), 'U': (1, 1), 'D': (1, -1), 'F': (2, 1), 'B': (2, -1)}
+''' (axis, side) of each face, a turn is clockwise looking at that side '''
+
+slice_axes = {'M': (0, -1), 'E': (1, -1), 'S': (2, 1), 'x': (0, 1), 'y': (1, 1), 'z': (2, 1)}
+''' (axis, side) of the middle slices, which turn like L, D and F, and the rotations '''
+
+move_pattern = re.compile(r"(\d*)([RLFBUD])(w?)(['2]?)$|([rlfbud])(['2]?)$|([MSExyz])(['2]?)$")
+''' matches one move token '''
+
+suffix_turns = {'': 1, '2': 2, "'": 3}
+''' maps a move suffix to its number of clockwise quarter turns '''
+
+@lru_cache(maxsize = None)
+def sticker_positions(n):
+    ''' Work out where every sticker of an n x n x n cube is in space, with
+        the cube spanning -n to n on each axis
+        Returns: tuple of (position, normal) for every sticker '''
+
+    stickers = []
+    for normal, column, row in face_frames:
+        for r in range(n):
+            for c in range(n):
+                stickers.append((tuple(n * normal[k] + (2 * c - n + 1) * column[k] + (2 * r - n + 1) * row[k]
+                                       for k in range(3)), normal))
+    return tuple(stickers)
+
+def rotate(vector, axis, side):
+    ''' Turn a vector 90° clockwise about an axis as seen from one side of it '''
+
+    a, b = [(1, 2), (2, 0), (0, 1)][axis]
+    result = list(vector)
+    result[a] = side * vector[b]
+    result[b] = -side * vector[a]
+    return tuple(result)
+
+def layer_perm(n, axis, side, layers):
+    ''' Build the permutation of a clockwise quarter turn of some layers
+        Parameters:
+            n - size of the cube
+            axis - 0, 1 or 2 for x, y or z
+            side - side of the axis the turn is clockwise from
+            layers - set of layer coordinates to turn, from -(n - 1) to n - 1
+        Returns: permutation as a tuple, new_state[i] = old_state[perm[i]] '''
+
+    stickers = sticker_positions(n)
+    index = {sticker: i for i, sticker in enumerate(stickers)}
+    perm = list(range(len(stickers)))
+    for i, (position, normal) in enumerate(stickers):
+        # stickers on a face perpendicular to the axis turn with the outer layer
+        layer = max(-(n - 1), min(n - 1, position[axis]))
+        if layer in layers:
+            perm[index[rotate(position, axis, side), rotate(normal, axis, side)]] = i
+    return tuple(perm)
+
+@lru_cache(maxsize = None)
+def move_perm(n, move):
+    ''' Get the permutation of a move on a cube of size n, building it
+        the first time it is asked for
+        Parameters:
+            n - size of the cube
+            move - move token, see the top of this file
+        Returns: permutation as a tuple
+        Raises: ValueError if the move doesn't exist on this size of cube '''
+
+    match = move_pattern.match(move)
+    if match is None:
+        raise ValueError('unknown move ' + repr(move))
+    count, face, wide, suffix, wide_face, wide_suffix, slice_, slice_suffix = match.groups()
+
+    if face is not None:
+        axis, side = face_axes[face]
+        depth = int(count) if count else (2 if wide else 1)
+        if not 1 <= depth <= n:
+            raise ValueError(move + ' needs a bigger cube than ' + str(n) + 'x' + str(n))
+        # 2R is the 2nd layer alone, 2Rw and Rw are the outer 2 layers
+        first = 1 if wide or not count else depth
+        layers = {side * (n + 1 - 2 * k) for k in range(first, depth + 1)}
+    elif wide_face is not None:
+        axis, side = face_axes[wide_face.upper()]
+        suffix = wide_suffix
+        layers = {side * (n - 1), side * (n - 3)}
+    else:
+        axis, side = slice_axes[slice_]
+        suffix = slice_suffix
+        if slice_ in 'xyz':
+            layers = set(range(-(n - 1), n, 2))
+        elif n % 2 == 0:
+            raise ValueError(move + ' only exists on odd sized cubes')
+        else:
+            layers = {0}
+
+    quarter = layer_perm(n, axis, side, layers)
+    perm = tuple(range(len(quarter)))
+    for i in range(suffix_turns[suffix]):
+        perm = tuple(perm[j] for j in quarter)
+    return perm
+
+@lru_cache(maxsize = None)
+def move_gather(n, move):
+    ''' Get a function gathering the stickers of a state for a move on a
+        cube of size n, cached like move_perm '''
+
+    return itemgetter(*move_perm(n, move))
+
+@lru_cache(maxsize = None)
+def solved_state(n):
+    ''' Returns the stickers of a solved cube of size n as bytes '''
+
+    return bytes(face for face in range(6) for i in range(n * n))
+
+class NxN_Cube:
+    ''' This class represents an N x N x N cube as a flat array of stickers '''
+
+    def __init__(self, n = 3):
+        ''' Initializes the cube into a solved state
+            Parameters:
+                n - number of squares along each edge, 2 or more '''
+
+        if n < 2:
+            raise ValueError('a cube needs at least 2 squares along each edge')
+        self.n = n
+        self.state = bytearray(solved_state(n))
+
+    def __eq__(self, other):
+        ''' Two cubes are equal when they are the same size and every sticker matches '''
+
+        if not isinstance(other, NxN_Cube):
+            return NotImplemented
+        return self.n == other.n and self.state == other.state
+
+    def __hash__(self):
+        ''' Hash of the size and stickers '''
+
+        return hash((self.n, bytes(self.state)))
+
+    def __str__(self):
+        ''' Returns the faces of the cube, one row of squares per line '''
+
+        n = self.n
+        lines = []
+        for face, name in enumerate('UFRBLD'):
+            lines.append(name + ':')
+            for row in range(n):
+                start = n * n * face + n * row
+                lines.append('  ' + ' '.join(str(color) for color in self.state[start:start + n]))
+        return '\n'.join(lines)
+
+    def clone(self):
+        ''' Returns a separate copy of this cube '''
+
+        cube = NxN_Cube.__new__(NxN_Cube)
+        cube.n = self.n
+        cube.state = bytearray(self.state)
+        return cube
+
+    def get_state(self):
+        ''' Returns the stickers as bytes '''
+
+        return bytes(self.state)
+
+    def set_state(self, state):
+        ''' Replace every sticker
+            Parameters:
+                state - 6 * n * n color values '''
+
+        self.state[:] = state
+
+    def face(self, face):
+        ''' Returns a view of the n * n stickers of a face, 0-5 in U, F, R, B, L, D order '''
+
+        size = self.n * self.n
+        return memoryview(self.state)[size * face:size * face + size]
+
+    def reset(self):
+        ''' Reset the cube to a solved state '''
+
+        self.state[:] = solved_state(self.n)
+
+    def is_solved(self):
+        ''' Returns True if every face is a single color '''
+
+        size = self.n * self.n
+        state = self.state
+        return all(state.count(state[size * face], size * face, size * face + size) == size for face in range(6))
+
+    def move(self, move):
+        ''' Make one move
+            Parameters:
+                move - move token, see the top of this file
+            Raises: ValueError if the move doesn't exist on this size of cube '''
+
+        self.state[:] = move_gather(self.n, move)(self.state)
+
+    def scramble(self, scramble):
+        ''' Make a sequence of moves
+            Parameters:
+                scramble - list of move tokens, or a string of them separated by spaces '''
+
+        if isinstance(scramble, str):
+            scramble = scramble.split()
+        for move in scramble:
+            self.move(move)
+
+    def sequence_perm(self, moves):
+        ''' Compose a sequence of moves into one permutation for this size,
+            so it can be applied to many cubes with apply_perm
+            Parameters:
+                moves - list of move tokens
+            Returns: permutation as a tuple '''
+
+        perm = tuple(range(len(self.state)))
+        for move in moves:
+            perm = tuple(perm[i] for i in move_perm(self.n, move))
+        return perm
+
+    def apply_perm(self, perm):
+        ''' Apply a permutation from sequence_perm with a single gather '''
+
+        self.state[:] = itemgetter(*perm)(self.state)
@@ -0,0 +1,445 @@
+'''
+This file contains the pattern databases, tables of how many moves it takes
+to solve a subset of the corners or edges from every position they can be
+in, and the Pattern_Searcher that uses them to find the shortest solution
+of a cube with IDA*
+
+A database is built with a breadth-first search one depth at a time. Instead
+of a queue, each depth scans the table itself for the entries found at the
+previous depth, so the build needs no memory beyond the table, and the
+table is saved after every depth so an interrupted build picks up where it
+stopped. The scan is split into ranges that worker processes expand in
+parallel, each reading the last saved table. Depths are kept at 4 bits per
+entry, or at 2 bits as the depth mod 3: the depth of a neighbour is always
+one more, the same or one less, so mod 3 is enough to tell which while
+searching and halves the size of the table.
+
+No database ever needs more moves than the cube does, so the largest
+depth over all of them is an admissible heuristic for IDA*.
+
+Usage:
+    python pattern_db.py build -j 4
+    python pattern_db.py build --pattern edges:0,1,2,3,4,5 --format mod3
+    python pattern_db.py solve "R U F' L2 D B'" --compare
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+import argparse
+import os
+import re
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from math import factorial
+from time import perf_counter
+
+from cubie_cube import corner_moves, edge_moves, from_state, move_names
+from table_store import load_tables, save_tables, table_path
+
+table_version = 1
+''' version of the saved databases, to be raised whenever the indexing changes '''
+
+formats = ('nibble', 'mod3')
+''' ways of packing the depths: 4 bits per entry, or 2 bits holding the depth mod 3 '''
+
+unvisited = 15
+''' value of a 4 bit entry the search hasn't reached '''
+
+default_patterns = (('corners', (0, 1, 2, 3)), ('corners', (4, 5, 6, 7)),
+                    ('edges', (0, 1, 2, 3)), ('edges', (4, 5, 6, 7)), ('edges', (8, 9, 10, 11)))
+''' (kind, pieces) of the databases the searcher uses when none are passed:
+    the U and D corners and the U, D and middle slice edges '''
+
+def depth_masks(depth):
+    ''' Returns a translation table marking the bytes of a 4 bit table
+        that hold an entry at depth, 1 for the low entry and 2 for the high '''
+
+    return bytes((byte & 15 == depth) | (byte >> 4 == depth) << 1 for byte in range(256))
+
+def build_mod3_packing():
+    ''' Work out how every two bytes of a 4 bit table, four entries, pack
+        into one byte of a mod 3 table, unvisited entries staying 3
+        Returns: bytes indexed by the two bytes read as a little-endian number '''
+
+    packed = bytearray(65536)
+    for pair in range(65536):
+        byte = 0
+        for i in range(4):
+            depth = pair >> 4 * i & 15
+            byte |= (3 if depth == unvisited else depth % 3) << 2 * i
+        packed[pair] = byte
+    return bytes(packed)
+
+class Pattern_Database:
+    ''' This class represents the table of moves needed to solve a subset
+        of the corners or of the edges from every position '''
+
+    def __init__(self, kind, pieces, format = 'nibble', table = None):
+        ''' Initializes the database, without building or opening its table
+            Parameters:
+                kind - 'corners' or 'edges'
+                pieces - the corners (0-7) or edges (0-11) tracked, in
+                    cubie_cube numbering
+                format - 'nibble' or 'mod3'
+                table - packed depths, if already built '''
+
+        if kind not in ('corners', 'edges'):
+            raise ValueError('kind must be corners or edges')
+        if format not in formats:
+            raise ValueError('format must be ' + ' or '.join(formats))
+        self.kind = kind
+        self.pieces = tuple(pieces)
+        self.format = format
+        self.table = table
+
+        self.positions = 8 if kind == 'corners' else 12
+        self.orientations = 3 if kind == 'corners' else 2
+        self.piece_moves = corner_moves if kind == 'corners' else edge_moves
+        if len(set(self.pieces)) != len(self.pieces) or not all(0 <= piece < self.positions for piece in self.pieces):
+            raise ValueError('pieces must be different ' + kind + ' from 0 to ' + str(self.positions - 1))
+
+        count = len(self.pieces)
+        self.orientation_count = self.orientations ** count
+        self.size = factorial(self.positions) // factorial(self.positions - count) * self.orientation_count
+        self.solved = [self.orientations * piece for piece in self.pieces]
+        self.solved_index = self.index(self.solved)
+
+    @property
+    def name(self):
+        ''' Name the table is saved under, such as 'pattern_edges_0_1_2_3_nibble' '''
+
+        return '_'.join(['pattern', self.kind] + [str(piece) for piece in self.pieces] + [self.format])
+
+    def index(self, coordinates):
+        ''' Rank where the tracked pieces are
+            Parameters:
+                coordinates - get_corner or get_edge coordinate of each tracked piece
+            Returns: index into the table '''
+
+        orientations = self.orientations
+        rank = 0
+        twist = 0
+        # bit p is set once a piece has been found at position p
+        placed = 0
+        for i, coordinate in enumerate(coordinates):
+            position, orientation = divmod(coordinate, orientations)
+            rank = rank * (self.positions - i) + position - (placed & ((1 << position) - 1)).bit_count()
+            placed |= 1 << position
+            twist = twist * orientations + orientation
+        return rank * self.orientation_count + twist
+
+    def coordinates(self, index):
+        ''' Find where the tracked pieces are from an index, undoing index()
+            Returns: list of coordinates '''
+
+        rank, twist = divmod(index, self.orientation_count)
+        count = len(self.pieces)
+        orientations = [0] * count
+        for i in range(count - 1, -1, -1):
+            twist, orientations[i] = divmod(twist, self.orientations)
+        digits = [0] * count
+        for i in range(count - 1, -1, -1):
+            rank, digits[i] = divmod(rank, self.positions - i)
+        free = list(range(self.positions))
+        return [self.orientations * free.pop(digit) + orientation for digit, orientation in zip(digits, orientations)]
+
+    def neighbours(self, index):
+        ''' Returns the index after each of the 18 face turns '''
+
+        coordinates = self.coordinates(index)
+        return [self.index([table[coordinate] for coordinate in coordinates]) for table in self.piece_moves]
+
+    def get(self, index):
+        ''' Returns the stored value of an entry: the depth for a 4 bit
+            table, or the depth mod 3 for a mod 3 table '''
+
+        if self.format == 'nibble':
+            return self.table[index >> 1] >> ((index & 1) << 2) & 15
+        return self.table[index >> 2] >> ((index & 3) << 1) & 3
+
+    def depth(self, coordinates):
+        ''' Find the number of moves that solve the tracked pieces
+            Parameters:
+                coordinates - coordinate of each tracked piece
+            Returns: number of moves '''
+
+        index = self.index(coordinates)
+        if self.format == 'nibble':
+            return self.get(index)
+
+        # walk down to solved, every step to the neighbour one move closer
+        depth = 0
+        while index != self.solved_index:
+            closer = (self.get(index) - 1) % 3
+            index = next(neighbour for neighbour in self.neighbours(index) if self.get(neighbour) == closer)
+            depth += 1
+        return depth
+
+    def child_depth(self, depth, index):
+        ''' Work out the depth of a neighbour of an entry whose depth is known
+            Parameters:
+                depth - depth of the entry
+                index - index of its neighbour
+            Returns: depth of the neighbour '''
+
+        if self.format == 'nibble':
+            return self.get(index)
+        return depth + (0, 1, -1)[(self.get(index) - depth) % 3]
+
+    def load(self):
+        ''' Open the saved table
+            Returns: True if there was one '''
+
+        tables = load_tables(table_path(self.name), table_version)
+        if tables is None:
+            return False
+        self.table = tables['depths']
+        return True
+
+    def build(self, workers = 1, chunk_entries = 1 << 20, log = None):
+        ''' Build the table with a breadth-first search and save it,
+            carrying on from the last saved depth of an unfinished build
+            Parameters:
+                workers - number of worker processes, 1 to build in this process
+                chunk_entries - most entries a worker scans for one task
+                log - called with a line of progress after every depth, or None '''
+
+        checkpoint = table_path(self.name + '.partial')
+        saved = load_tables(checkpoint, table_version)
+        if saved is not None and len(saved['depths']) == (self.size + 1) // 2:
+            table = bytearray(saved['depths'])
+            depth = saved['depth'][0]
+        else:
+            table = bytearray(b'\xff') * ((self.size + 1) // 2)
+            table[self.solved_index >> 1] &= ~(15 << ((self.solved_index & 1) << 2)) & 255
+            depth = 0
+            save_tables(checkpoint, {'depths': table, 'depth': array('I', [depth])}, table_version)
+
+        step = max(8, min(chunk_entries, self.size // (4 * workers) + 1) // 8 * 8)
+        ranges = [(start, min(start + step, self.size)) for start in range(0, self.size, step)]
+        pool = ProcessPoolExecutor(workers) if workers > 1 else None
+        try:
+            while True:
+                start_time = perf_counter()
+                if pool is None:
+                    found = (expand_range(self, table, depth, start, end) for start, end in ranges)
+                else:
+                    found = pool.map(expand_task, [(self.kind, self.pieces, depth, start, end, checkpoint)
+                                                   for start, end in ranges])
+
+                added = 0
+                for neighbours in found:
+                    for index in neighbours:
+                        shift = (index & 1) << 2
+                        if table[index >> 1] >> shift & 15 == unvisited:
+                            table[index >> 1] ^= (unvisited ^ (depth + 1)) << shift
+                            added += 1
+                if added == 0:
+                    break
+                depth += 1
+                if depth >= unvisited - 1:
+                    raise ValueError('pattern is too deep for 4 bit entries')
+                save_tables(checkpoint, {'depths': table, 'depth': array('I', [depth])}, table_version)
+                if log is not None:
+                    log('{} depth {:>2}: {:>12,} entries in {:.1f} s'.format(self.name, depth, added, perf_counter() - start_time))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        if self.format == 'mod3':
+            if len(table) % 2:
+                table.append(255)
+            packing = build_mod3_packing()
+            table = bytearray(packing[pair] for pair in memoryview(table).cast('H'))
+        save_tables(table_path(self.name), {'depths': table}, table_version)
+        os.unlink(checkpoint)
+        self.load()
+
+    def load_or_build(self, workers = 1, log = None):
+        ''' Open the saved table, building it first if there is none '''
+
+        if not self.load():
+            self.build(workers, log = log)
+        return self
+
+def expand_range(database, table, depth, start, end):
+    ''' Find the neighbours of every entry at a depth within a range of a 4 bit table
+        Parameters:
+            database - Pattern_Database being built
+            table - its 4 bit table
+            depth - depth of the entries to expand
+            start, end - range of entries to scan, start even
+        Returns: array of the indices of unvisited neighbours '''
+
+    masked = bytes(table[start >> 1:(end + 1) >> 1]).translate(depth_masks(depth))
+    found = set()
+    for match in re.finditer(b'[^\x00]', masked):
+        byte = match.start()
+        for half in (0, 1):
+            index = start + 2 * byte + half
+            if masked[byte] >> half & 1 and index < end:
+                for neighbour in database.neighbours(index):
+                    if table[neighbour >> 1] >> ((neighbour & 1) << 2) & 15 == unvisited:
+                        found.add(neighbour)
+    return array('I', found)
+
+def expand_task(task):
+    ''' Run expand_range in a worker process on the last saved table
+        Parameters:
+            task - (kind, pieces, depth, start, end, checkpoint path)
+        Returns: array of indices '''
+
+    kind, pieces, depth, start, end, checkpoint = task
+    tables = load_tables(checkpoint, table_version, verify = False)
+    return expand_range(Pattern_Database(kind, pieces), tables['depths'], depth, start, end)
+
+def get_databases(patterns = default_patterns, format = 'nibble', workers = 1, log = None):
+    ''' Open pattern databases, building any that haven't been saved yet
+        Parameters:
+            patterns - (kind, pieces) of each database
+            format - 'nibble' or 'mod3'
+            workers - number of worker processes for building
+            log - called with progress lines while building, or None
+        Returns: list of Pattern_Database '''
+
+    return [Pattern_Database(kind, pieces, format).load_or_build(workers, log) for kind, pieces in patterns]
+
+class Pattern_Searcher:
+    ''' This class represents an IDA* search for the shortest solution of a
+        cube, guided by pattern databases '''
+
+    def __init__(self, databases = None):
+        ''' Initializes the searcher
+            Parameters:
+                databases - list of Pattern_Database, the default ones if
+                    None, an empty list for a blind iterative deepening search '''
+
+        self.databases = get_databases() if databases is None else databases
+        self.nodes = 0
+
+    def solve(self, cube, max_depth = 20):
+        ''' Find a shortest solution
+            Parameters:
+                cube - Rubiks_Cube to solve, it is not changed
+                max_depth - longest solution to look for
+            Returns: list of move strings, or None if there is none within max_depth
+            Raises: ValueError if the cube can't be solved '''
+
+        cubie = from_state(cube.state)
+        problem = cubie.verify()
+        if problem is not None:
+            raise ValueError('cube can not be solved: ' + problem)
+
+        corners = [cubie.get_corner(corner) for corner in range(8)]
+        edges = [cubie.get_edge(edge) for edge in range(12)]
+        self.solved_corners = [3 * corner for corner in range(8)]
+        self.solved_edges = [2 * edge for edge in range(12)]
+        depths = [database.depth([(corners if database.kind == 'corners' else edges)[piece] for piece in database.pieces])
+                  for database in self.databases]
+
+        self.nodes = 0
+        self.path = []
+        bound = max(depths, default = 0)
+        while bound <= max_depth:
+            next_bound = self.search(corners, edges, depths, 0, bound, -1)
+            if next_bound is None:
+                return [move_names[move] for move in self.path]
+            bound = next_bound
+        return None
+
+    def search(self, corners, edges, depths, length, bound, last_face):
+        ''' Look for a solution within bound moves, depth first
+            Parameters:
+                corners, edges - coordinates of every corner and edge
+                depths - depth of the position in each database
+                length - moves made so far
+                bound - most moves allowed
+                last_face - face of the last move, -1 for none
+            Returns: None if a solution was found, in self.path, or else the
+                smallest length + heuristic that went over the bound '''
+
+        self.nodes += 1
+        estimate = length + max(depths, default = 0)
+        if estimate > bound:
+            return estimate
+        if corners == self.solved_corners and edges == self.solved_edges:
+            return None
+
+        smallest = float('inf')
+        for move in range(18):
+            face = move // 3
+            # never turn the same face twice, or opposite faces in both orders
+            if face == last_face or face == last_face - 3:
+                continue
+            corner_table = corner_moves[move]
+            edge_table = edge_moves[move]
+            new_corners = [corner_table[corner] for corner in corners]
+            new_edges = [edge_table[edge] for edge in edges]
+            new_depths = []
+            for database, depth in zip(self.databases, depths):
+                pieces = new_corners if database.kind == 'corners' else new_edges
+                new_depths.append(database.child_depth(depth, database.index([pieces[piece] for piece in database.pieces])))
+
+            self.path.append(move)
+            result = self.search(new_corners, new_edges, new_depths, length + 1, bound, face)
+            if result is None:
+                return None
+            self.path.pop()
+            smallest = min(smallest, result)
+        return smallest
+
+def parse_pattern(text):
+    ''' Read a pattern such as 'edges:0,1,2,3' from the command line
+        Returns: (kind, pieces) '''
+
+    kind, pieces = text.split(':')
+    return kind, tuple(int(piece) for piece in pieces.split(','))
+
+def main(argv = None):
+    ''' Build pattern databases or solve a scramble with them from the command line
+        Parameters:
+            argv - command line arguments, sys.argv if None
+        Returns: exit status '''
+
+    parser = argparse.ArgumentParser(description = 'Build pattern databases and find shortest solutions with them.')
+    commands = parser.add_subparsers(dest = 'command', required = True)
+    for name, help in (('build', 'build and save pattern databases'), ('solve', 'find a shortest solution with IDA*')):
+        command = commands.add_parser(name, help = help)
+        command.add_argument('--pattern', type = parse_pattern, action = 'append',
+                             help = 'kind:pieces of a database, such as edges:0,1,2,3 (default: the U and D corners '
+                             'and the U, D and middle slice edges)')
+        command.add_argument('--format', choices = formats, default = 'nibble', help = 'how the depths are packed')
+        command.add_argument('-j', '--workers', type = int, default = None, help = 'number of worker processes (default: all cores)')
+    commands.choices['solve'].add_argument('scramble', help = 'scramble in cube notation')
+    commands.choices['solve'].add_argument('--max-depth', type = int, default = 20, help = 'longest solution to look for')
+    commands.choices['solve'].add_argument('--compare', action = 'store_true',
+                                           help = 'also run a blind iterative deepening search and compare the nodes expanded')
+    args = parser.parse_args(argv)
+
+    workers = args.workers or os.cpu_count() or 1
+    log = lambda line: print(line, file = sys.stderr)
+    databases = get_databases(args.pattern or default_patterns, args.format, workers, log)
+    if args.command == 'build':
+        for database in databases:
+            print(database.name, '{:,} entries'.format(database.size), len(database.table), 'bytes')
+        return 0
+
+    from rubix_cube import Rubiks_Cube
+
+    cube = Rubiks_Cube()
+    cube.apply_algorithm(args.scramble)
+    searchers = [('pattern databases', Pattern_Searcher(databases))]
+    if args.compare:
+        searchers.append(('blind', Pattern_Searcher([])))
+    for label, searcher in searchers:
+        start = perf_counter()
+        solution = searcher.solve(cube, args.max_depth)
+        print('{:<18} {:<40} {:>12,} nodes {:>8.2f} s'.format(
+            label, ' '.join(solution) if solution is not None else 'no solution', searcher.nodes, perf_counter() - start))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
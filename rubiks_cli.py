@@ -0,0 +1,170 @@
+'''
+This file contains the command line entry point for the cube model, the
+solvers and the GUI
+
+Each command imports only what it needs when it runs, so the model and the
+solvers start quickly and work in processes without a display: tkinter is
+imported by the gui command alone, and the solver tables are loaded the
+first time a solution is asked for.
+
+Usage:
+    python -m rubiks_cli gui
+    python -m rubiks_cli gui --size 5 "Rw U 2R' F"
+    python -m rubiks_cli solve "R U R' F2 D'"
+    python -m rubiks_cli hint "R U2 R' U' R U' R'"
+    python -m rubiks_cli cfop "R U R' F2 D' L B2"
+    python -m rubiks_cli scramble -n 10 --seed 1
+    python -m rubiks_cli batch scrambles.txt --solve
+    python -m rubiks_cli bench --no-gui
+    python -m rubiks_cli serve --port 8642
+    python -m rubiks_cli load --requests 2000 --endpoint solve
+    python -m rubiks_cli --stats stats.prom solve "R U R' F2 D'"
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+import argparse
+import sys
+
+def run_gui(args):
+    ''' Open the GUI window, optionally scrambled and with a cube of another size '''
+
+    from cube_interface import Cube_Interface
+
+    if args.size == 3:
+        interface = Cube_Interface()
+    else:
+        from nxn_cube import NxN_Cube
+        interface = Cube_Interface(NxN_Cube(args.size))
+    if args.scramble:
+        # algorithm strings are 3x3 notation, other sizes take plain moves
+        interface.scramble_cube(args.scramble if args.size == 3 else args.scramble.split())
+    interface.root.mainloop()
+    return 0
+
+def scrambled_cube(scramble):
+    ''' Returns a new Rubiks_Cube with the passed algorithm string applied '''
+
+    from rubix_cube import Rubiks_Cube
+
+    cube = Rubiks_Cube()
+    cube.apply_algorithm(scramble)
+    return cube
+
+def run_solve(args):
+    ''' Print a two-phase solution for a scramble '''
+
+    import two_phase_solver
+
+    solution = two_phase_solver.solve(scrambled_cube(args.scramble), args.max_length, args.max_time)
+    if solution is None:
+        print('No solution found in time')
+        return 1
+    print(' '.join(solution))
+    return 0
+
+def run_hint(args):
+    ''' Print the hint for a scramble '''
+
+    print(scrambled_cube(args.scramble).get_hint())
+    return 0
+
+def run_cfop(args):
+    ''' Print the CFOP stages that solve a scramble, one per line '''
+
+    import cfop_solver
+
+    for step in cfop_solver.solve(scrambled_cube(args.scramble)):
+        print(cfop_solver.step_to_str(step))
+    return 0
+
+def run_scramble(args):
+    ''' Pass the remaining arguments on to scrambler.main '''
+
+    import scrambler
+    return scrambler.main(args.arguments)
+
+def run_batch(args):
+    ''' Pass the remaining arguments on to batch_runner.main '''
+
+    import batch_runner
+    return batch_runner.main(args.arguments)
+
+def run_bench(args):
+    ''' Pass the remaining arguments on to benchmarks.main '''
+
+    import benchmarks
+    return benchmarks.main(args.arguments)
+
+def run_serve(args):
+    ''' Pass the remaining arguments on to solve_service.main serve '''
+
+    import solve_service
+    return solve_service.main(['serve'] + args.arguments)
+
+def run_load(args):
+    ''' Pass the remaining arguments on to solve_service.main load '''
+
+    import solve_service
+    return solve_service.main(['load'] + args.arguments)
+
+def main(argv = None):
+    ''' Run one command from the command line
+        Parameters:
+            argv - command line arguments, sys.argv if None
+        Returns: exit status '''
+
+    parser = argparse.ArgumentParser(prog = 'python -m rubiks_cli', description = "Rubik's Cube model, solvers and GUI.")
+    parser.add_argument('--stats', help = 'count moves and time the hot paths, then write the counters to this '
+                        'file, as JSON if it ends in .json and otherwise in the Prometheus text format')
+    commands = parser.add_subparsers(dest = 'command', required = True)
+
+    gui = commands.add_parser('gui', help = 'open the interactive window')
+    gui.add_argument('scramble', nargs = '?', help = 'algorithm to scramble the cube with first')
+    gui.add_argument('--size', type = int, default = 3, help = 'number of squares along each edge of the cube')
+    gui.set_defaults(run = run_gui)
+
+    solve = commands.add_parser('solve', help = 'print a two-phase solution for a scramble')
+    solve.add_argument('scramble', help = 'scramble in cube notation')
+    solve.add_argument('--max-length', type = int, default = 22, help = 'most moves in a solution')
+    solve.add_argument('--max-time', type = float, default = 3.0, help = 'seconds to search for')
+    solve.set_defaults(run = run_solve)
+
+    hint = commands.add_parser('hint', help = 'print the hint for a scramble')
+    hint.add_argument('scramble', help = 'scramble in cube notation')
+    hint.set_defaults(run = run_hint)
+
+    cfop = commands.add_parser('cfop', help = 'print the CFOP stages that solve a scramble')
+    cfop.add_argument('scramble', help = 'scramble in cube notation')
+    cfop.set_defaults(run = run_cfop)
+
+    for name, run, help in (('scramble', run_scramble, 'write random scrambles, see scrambler.py'),
+                            ('batch', run_batch, 'scramble and solve a file of scrambles, see batch_runner.py'),
+                            ('bench', run_bench, 'run the benchmark suite, see benchmarks.py'),
+                            ('serve', run_serve, 'run the local solve service, see solve_service.py'),
+                            ('load', run_load, 'load test a running solve service, see solve_service.py')):
+        command = commands.add_parser(name, help = help, add_help = False)
+        command.add_argument('arguments', nargs = argparse.REMAINDER)
+        command.set_defaults(run = run)
+
+    # options meant for the passed-on commands aren't known to this parser
+    args, unknown = parser.parse_known_args(argv)
+    if 'arguments' in args:
+        args.arguments = unknown + args.arguments
+    elif unknown:
+        parser.error('unrecognized arguments: ' + ' '.join(unknown))
+
+    if not args.stats:
+        return args.run(args)
+
+    import instrumentation
+    instrumentation.enable()
+    try:
+        return args.run(args)
+    finally:
+        instrumentation.export(args.stats, 'json' if args.stats.endswith('.json') else 'prometheus')
+
+if __name__ == '__main__':
+    sys.exit(main())
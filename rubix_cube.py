@@ -12,9 +12,18 @@ Author: Henry Ham
 Version: 2022.04.25
 '''
 
+from algorithm import compile_algorithm
+from move_tables import move_gathers
+
 str_dict = {0:'U: ', 1:'F: ', 2:'R: ', 3:'B: ', 4:'L: ', 5:'D: '}
 ''' maps values of i variable in __str__ to a string to avoid hassle of conditionals '''
 
+face_names = ('U', 'F', 'R', 'B', 'L', 'D', 'cube')
+''' attributes that view into the cube's sticker state '''
+
+solved_state = bytes([0] * 9 + [1] * 9 + [2] * 9 + [3] * 9 + [4] * 9 + [5] * 9)
+''' stickers of a solved cube in U, F, R, B, L, D order '''
+
 class Rubiks_Cube:
     ''' This class represents a model of a Rubik's Cube puzzle
         that can be turned and scrambled '''
@@ -22,7 +31,7 @@ class Rubiks_Cube:
     def __init__(self):
         ''' Initializes the cube into a solved state
             
-            Each face of the cube is represented by a list of numbers
+            Each face of the cube is represented by 9 numbers
             which represent certain colors as follows:
             
             0 = white
@@ -32,15 +41,48 @@ class Rubiks_Cube:
             4 = orange
             5 = yellow '''
         
-        self.U = [0] * 9
-        self.F = [1] * 9
-        self.R = [2] * 9
-        self.B = [3] * 9
-        self.L = [4] * 9
-        self.D = [5] * 9
+        self.state = bytearray(solved_state)
         
+    def __getattr__(self, name):
+        ''' Create the face views the first time one of them is used
+            
+            All 54 stickers live in self.state in U, F, R, B, L, D order.
+            self.U ... self.D are memoryviews of 9 stickers each and self.cube
+            lists them, so reading or writing a face changes self.state.
+            The views are only made when asked for so that clones used for
+            searching stay a single 54 byte buffer '''
+        
+        if name not in face_names:
+            raise AttributeError(name)
+        
+        view = memoryview(self.state)
+        self.U, self.F, self.R, self.B, self.L, self.D = [view[9 * i:9 * i + 9] for i in range(6)]
         self.cube = [self.U, self.F, self.R, self.B, self.L, self.D]
         
+        return self.__dict__[name]
+    
+    def __eq__(self, other):
+        ''' Two cubes are equal when all of their stickers match '''
+        
+        if not isinstance(other, Rubiks_Cube):
+            return NotImplemented
+        return self.state == other.state
+    
+    def __hash__(self):
+        ''' Hash the current sticker state so cubes can key dicts and sets '''
+        
+        return hash(bytes(self.state))
+    
+    def __getstate__(self):
+        ''' Pickle only the stickers since memoryviews can't be pickled '''
+        
+        return bytes(self.state)
+    
+    def __setstate__(self, state):
+        ''' Restore a cube pickled by __getstate__ '''
+        
+        self.state = bytearray(state)
+        
     def __str__(self):
         ''' Returns a printable representation of the cube's
             current state '''
@@ -63,14 +105,24 @@ class Rubiks_Cube:
             of this one
             Returns: clone of this cube '''
         
-        clone = Rubiks_Cube()
-        
-        for i in range(6):
-            for j in range(9):
-                clone.cube[i][j] = self.cube[i][j]
+        clone = Rubiks_Cube.__new__(Rubiks_Cube)
+        clone.state = bytearray(self.state)
         
         return clone
     
+    def get_state(self):
+        ''' Get an immutable snapshot of the cube's stickers
+            Returns: 54 bytes in U, F, R, B, L, D order '''
+        
+        return bytes(self.state)
+    
+    def set_state(self, state):
+        ''' Overwrite every sticker of the cube
+            Parameters:
+                state - 54 color values in U, F, R, B, L, D order '''
+        
+        self.state[:] = state
+    
     def get_hint(self):
         ''' Read the current state of the cube and return
             the correct hint
@@ -79,84 +131,58 @@ class Rubiks_Cube:
         
         if not self.check_F2L():
             return 'F2L not ready for hints yet!'
-        elif self.check_top_layer() == 'OLL1':
-            return self.get_OLL_first_look()
-        elif self.check_top_layer() == 'OLL2':
-            return self.get_OLL_second_look()
+        elif self.check_top_layer() == 'PLL':
+            return self.get_PLL()
         else:
-            return 'PLL not ready for hints yet!'
+            return self.get_OLL()
+    
+    def get_OLL(self):
+        ''' Get the full OLL algorithm for the current state
+            of the cube without turning it
+            Returns: algorithm as a string '''
+        
+        import last_layer
+        
+        case = last_layer.find_OLL(self.state)
+        if case is None:
+            return 'No OLL case matches this cube!'
+        return last_layer.case_to_str(case)
+    
+    def get_PLL(self):
+        ''' Get the PLL algorithm for the current state of the
+            cube without turning it
+            Returns: algorithm as a string '''
+        
+        import last_layer
+        
+        case = last_layer.find_PLL(self.state)
+        if case is None:
+            return 'No PLL case matches this cube!'
+        return last_layer.case_to_str(case) or 'Cube is solved!'
     
     def get_OLL_first_look(self):
         ''' Get the first part of the 2-look OLL algorithm
             for the current state of the cube
             Returns: algorithm as a string '''
         
-        # check for dot-case
-        top_edges = [self.U[1], self.U[3], self.U[5], self.U[7]]
-        if self.U[4] not in top_edges:
-            return "F (R U R' U') S (R U R' U') f'"
-        
-        count = 0
-        for i in range(4):
-            AUF_str = "(U) " if count == 1 else "(U2) " if count == 2 else "(U') " if count == 3 else ""
-            # check for v-case
-            if self.U[5] == self.U[4] == self.U[7]:
-                self.undo_AUF(count) 
-                return AUF_str + "f (R U R' U') f'"
-            if self.U[3] == self.U[4] == self.U[5]:
-                self.undo_AUF(count)
-                return AUF_str + "F (R U R' U') F'"
-            self.move("U")
-            count += 1
+        import last_layer
+        
+        case = last_layer.find_OLL_edges(self.state)
+        if case is None:
+            return 'No OLL case matches this cube!'
+        return last_layer.case_to_str(case)
             
     def get_OLL_second_look(self):
         ''' Get the second part of the 2-look OLL algorithm
             for the current state of the cube
             Returns: algorithm as a string '''
         
-        oriented_corners = 0
-        top_corners = [self.U[0], self.U[2], self.U[6], self.U[8]]
-        for corner in top_corners:
-            if corner == self.U[4]:
-                oriented_corners += 1
-        
-        count = 0
-        for i in range(4):
-            AUF_str = "(U) " if count == 1 else "(U2) " if count == 2 else "(U') " if count == 3 else ""
-            if oriented_corners == 0:
-                # check for case 1
-                if self.F[0] == self.F[2] == self.U[4] == self.B[0] == self.B[2]:
-                    self.undo_AUF(count)
-                    return AUF_str + "R U2 R' U' R U R' U' R U' R'"
-                # check for case 2
-                elif self.L[0] == self.L[2] == self.U[4] == self.F[2] == self.B[0]:
-                    self.undo_AUF(count)
-                    return AUF_str + "R U2 R2 U' R2 U' R2 U2 R"
-            elif oriented_corners == 1:
-                # check for case 1
-                if self.U[2] == self.U[4] == self.L[0] == self.F[0] == self.R[0]:
-                    self.undo_AUF(count)
-                    return AUF_str + "R U2 R' U' R U' R'"
-                # check for case 2
-                elif self.U[6] == self.U[4] == self.F[2] == self.R[2] == self.B[2]:
-                    self.undo_AUF(count)
-                    return AUF_str + "R U R' U R U2 R'"
-            elif oriented_corners == 2:
-                # check for case 1
-                if self.U[0] == self.U[2] == self.U[4] == self.F[0] == self.F[2]:
-                    self.undo_AUF(count)
-                    return AUF_str + "R2 D R' U2 R D' R' U2 R'"
-                # check for case 2
-                elif self.U[2] == self.U[8] == self.U[4] == self.B[2] == self.F[0]:
-                    self.undo_AUF(count)
-                    return AUF_str + "r U R' U' r' F R F'"
-                # check for case 3
-                elif self.U[2] == self.U[6] == self.U[4] == self.L[0] == self.F[2]:
-                    self.undo_AUF(count)
-                    return AUF_str + "F' r U R' U' r' F R"
-            self.move("U")
-            count += 1
-            
+        import last_layer
+        
+        case = last_layer.find_OLL_corners(self.state)
+        if case is None:
+            return 'No OLL case matches this cube!'
+        return last_layer.case_to_str(case)
             
     def check_F2L(self):
         ''' Check if the first 2 layers have been solved
@@ -173,31 +199,17 @@ class Rubiks_Cube:
                 top cross is solved, or 'PLL' if top face is complete '''
         
         solved_top = [self.U[4]] * 9
-        if self.U == solved_top:
+        if self.U.tolist() == solved_top:
             return 'PLL'
         elif self.U[1] == self.U[3] == self.U[4] == self.U[5] == self.U[7]:
             return 'OLL2'
         else:
             return 'OLL1'
             
-    def undo_AUF(self, count):
-        ''' undo all top-layer turns done to find an OLL or PLL case
-            Parameters:
-                count: number of U turns to undo '''
-        
-        for i in range(count):
-            self.move("U'")
-        
-    
     def reset(self):
         ''' Reset the cube to a solved state '''
         
-        self.U = [0] * 9
-        self.F = [1] * 9
-        self.R = [2] * 9
-        self.B = [3] * 9
-        self.L = [4] * 9
-        self.D = [5] * 9
+        self.state[:] = solved_state
     
     def copy_face(self, face):
         ''' Copy the passed face into a separate list and
@@ -231,175 +243,118 @@ class Rubiks_Cube:
         ''' Takes a list of move strings and executes them
             all in order
             Parameters:
-                scramble - list of move strings '''
+                scramble - list of move strings, or an algorithm
+                    string that is passed to apply_algorithm '''
+        
+        if isinstance(scramble, str):
+            self.apply_algorithm(scramble)
+            return
         
         for move in scramble:
             self.move(move)
     
+    def apply_algorithm(self, algorithm):
+        ''' Apply an algorithm written in cube notation, brackets and
+            repeats included, as one compiled permutation
+            Parameters:
+                algorithm - algorithm string such as "F (R U R' U') F'" '''
+        
+        compile_algorithm(algorithm).apply(self)
+    
     def move(self, move):
         ''' Move the cube based on the move input
             Parameters:
                 move - Specified move as a string in cube notation '''
         
-        # maps cube notation inpute to the method corresponding to that move
-        moves_dict = {"R":self.move_R, "L":self.move_L, "F":self.move_F, "B":self.move_B, "U":self.move_U, "D":self.move_D, \
-                      "M":self.move_M, "S":self.move_S, "E":self.move_E, 'x':self.move_x, 'y':self.move_y, 'z':self.move_z, \
-                      "r":self.move_r, "l":self.move_l, "f":self.move_f, "b":self.move_b, "u":self.move_u, "d":self.move_d}
-        
-        if len(move) == 2:
-            if move[1] == "2":
-                for i in range(2):
-                    moves_dict[move[0]]()
-            elif move[1] == "'":
-                for i in range(3):
-                    moves_dict[move[0]]()
-        else:
-            moves_dict[move]()
+        # every move is one precomputed gather over all 54 stickers
+        self.state[:] = move_gathers[move](self.state)
             
     def move_z(self):
         ''' Rotate the entire cube 90° clockwise along the F face '''
         
-        self.move("F")
-        self.move("S")
-        self.move("B'")
-            
+        self.move("z")
+
     def move_x(self):
         ''' Rotate the entire cube 90° clockwise along the R face '''
         
-        self.move("R")
-        self.move("M'")
-        self.move("L'")
-        
+        self.move("x")
+
     def move_y(self):
         ''' Rotate the entire cube 90° along the U face '''
         
-        self.move("U")
-        self.move("E'")
-        self.move("D'")
-        
+        self.move("y")
+
     def move_r(self):
         ''' Makes a wide R move '''
         
-        self.move("R")
-        self.move("M'")
-            
+        self.move("r")
+
     def move_l(self):
         ''' Makes a wide L move '''
         
-        self.move("L")
-        self.move("M")
-        
+        self.move("l")
+
     def move_f(self):
         ''' Makes a wide F move '''
         
-        self.move("F")
-        self.move("S")
-        
+        self.move("f")
+
     def move_b(self):
         ''' Makes a wide B move '''
         
-        self.move("B")
-        self.move("S'")
-        
+        self.move("b")
+
     def move_u(self):
         ''' Makes a wide U move '''
         
-        self.move("U")
-        self.move("E'")
-        
+        self.move("u")
+
     def move_d(self):
         ''' Makes a wide D move '''
         
-        self.move("D")
-        self.move("E")
-    
+        self.move("d")
+
     def move_M(self):
         ''' Moves the middle slice of the cube 90° clockwise '''
         
-        self.U[1], self.U[4], self.U[7], self.F[1], self.F[4], self.F[7], \
-                   self.D[1], self.D[4], self.D[7], self.B[7], self.B[4], self.B[1] = \
-                   self.B[7], self.B[4], self.B[1], self.U[1], self.U[4], self.U[7], \
-                   self.F[1], self.F[4], self.F[7], self.D[1], self.D[4], self.D[7]
-        
+        self.move("M")
+
     def move_S(self):
         ''' Moves the standing slice of the cube 90° clockwise '''
         
-        self.U[3], self.U[4], self.U[5], self.R[1], self.R[4], self.R[7], \
-                   self.D[5], self.D[4], self.D[3], self.L[7], self.L[4], self.L[1] = \
-                   self.L[7], self.L[4], self.L[1], self.U[3], self.U[4], self.U[5], \
-                   self.R[1], self.R[4], self.R[7], self.D[5], self.D[4], self.D[3]
-        
+        self.move("S")
+
     def move_E(self):
         ''' Moves the equatorial slice of the cube 90° clockwise '''
         
-        self.F[3], self.F[4], self.F[5], self.R[3], self.R[4], self.R[5], \
-                   self.B[3], self.B[4], self.B[5], self.L[3], self.L[4], self.L[5] = \
-                   self.L[3], self.L[4], self.L[5], self.F[3], self.F[4], self.F[5], \
-                   self.R[3], self.R[4], self.R[5], self.B[3], self.B[4], self.B[5]
-    
+        self.move("E")
+
     def move_R(self):
         ''' Moves the right face of the cube 90° clockwise '''
         
-        self.F[2], self.F[5], self.F[8], self.U[2], self.U[5], self.U[8], \
-                   self.B[0], self.B[3], self.B[6], self.D[2], self.D[5], self.D[8] = \
-                   self.D[2], self.D[5], self.D[8], self.F[2], self.F[5], self.F[8], \
-                   self.U[8], self.U[5], self.U[2], self.B[6], self.B[3], self.B[0]
-        
-        self.R[0], self.R[1], self.R[2], self.R[3], self.R[4], self.R[5], self.R[6], self.R[7], self.R[8] = \
-                   self.R[6], self.R[3], self.R[0], self.R[7], self.R[4], self.R[1], self.R[8], self.R[5], self.R[2]
-    
+        self.move("R")
+
     def move_L(self):
         ''' Moves the left face of the cube 90° clockwise '''
         
-        self.F[0], self.F[3], self.F[6], self.D[0], self.D[3], self.D[6], \
-                   self.B[8], self.B[5], self.B[2], self.U[0], self.U[3], self.U[6] = \
-                   self.U[0], self.U[3], self.U[6], self.F[0], self.F[3], self.F[6], \
-                   self.D[0], self.D[3], self.D[6], self.B[8], self.B[5], self.B[2]
-        
-        self.L[0], self.L[1], self.L[2], self.L[3], self.L[4], self.L[5], self.L[6], self.L[7], self.L[8] = \
-                   self.L[6], self.L[3], self.L[0], self.L[7], self.L[4], self.L[1], self.L[8], self.L[5], self.L[2]
-        
+        self.move("L")
+
     def move_F(self):
         ''' Moves the front face of the cube 90° clockwise '''
         
-        self.U[6], self.U[7], self.U[8], self.R[0], self.R[3], self.R[6], \
-                   self.D[2], self.D[1], self.D[0], self.L[8], self.L[5], self.L[2] = \
-                   self.L[8], self.L[5], self.L[2], self.U[6], self.U[7], self.U[8], \
-                   self.R[0], self.R[3], self.R[6], self.D[2], self.D[1], self.D[0]
-        
-        self.F[0], self.F[1], self.F[2], self.F[3], self.F[4], self.F[5], self.F[6], self.F[7], self.F[8] = \
-                   self.F[6], self.F[3], self.F[0], self.F[7], self.F[4], self.F[1], self.F[8], self.F[5], self.F[2]
-        
+        self.move("F")
+
     def move_B(self):
         ''' Moves the back face of the cube 90° clockwise '''
         
-        self.U[2], self.U[1], self.U[0], self.L[0], self.L[3], self.L[6], \
-                   self.D[6], self.D[7], self.D[8], self.R[8], self.R[5], self.R[2] = \
-                   self.R[8], self.R[5], self.R[2], self.U[2], self.U[1], self.U[0], \
-                   self.L[0], self.L[3], self.L[6], self.D[6], self.D[7], self.D[8]
-        
-        self.B[0], self.B[1], self.B[2], self.B[3], self.B[4], self.B[5], self.B[6], self.B[7], self.B[8] = \
-                   self.B[6], self.B[3], self.B[0], self.B[7], self.B[4], self.B[1], self.B[8], self.B[5], self.B[2]
-        
+        self.move("B")
+
     def move_U(self):
         ''' Moves the top face of the cube 90° clockwise '''
-
-        self.F[2], self.F[1], self.F[0], self.L[2], self.L[1], self.L[0], \
-                   self.B[2], self.B[1], self.B[0], self.R[2], self.R[1], self.R[0] = \
-                   self.R[2], self.R[1], self.R[0], self.F[2], self.F[1], self.F[0], \
-                   self.L[2], self.L[1], self.L[0], self.B[2], self.B[1], self.B[0]
-        
-        self.U[0], self.U[1], self.U[2], self.U[3], self.U[4], self.U[5], self.U[6], self.U[7], self.U[8] = \
-                   self.U[6], self.U[3], self.U[0], self.U[7], self.U[4], self.U[1], self.U[8], self.U[5], self.U[2]
         
+        self.move("U")
+
     def move_D(self):
         ''' Moves the bottom face of the cube 90° clockwise '''
-
-        self.F[6], self.F[7], self.F[8], self.R[6], self.R[7], self.R[8], \
-                   self.B[6], self.B[7], self.B[8], self.L[6], self.L[7], self.L[8] = \
-                   self.L[6], self.L[7], self.L[8], self.F[6], self.F[7], self.F[8], \
-                   self.R[6], self.R[7], self.R[8], self.B[6], self.B[7], self.B[8]
-        
-        self.D[0], self.D[1], self.D[2], self.D[3], self.D[4], self.D[5], self.D[6], self.D[7], self.D[8] = \
-                   self.D[6], self.D[3], self.D[0], self.D[7], self.D[4], self.D[1], self.D[8], self.D[5], self.D[2]
-    
\ No newline at end of file
+        
+        self.move("D")
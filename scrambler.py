@@ -0,0 +1,156 @@
+'''
+This file contains the Scrambler class which makes random-move and
+random-state scrambles, one at a time or in bulk
+
+Random-move scrambles never turn the same face twice in a row and never
+turn a face again after turning it and its opposite face (R L R), so no two
+moves in a row can cancel or combine. Each move is drawn from the moves
+still allowed after the last two, so a scramble takes one random draw per
+move and never has to be fixed up or drawn again. Random-state scrambles
+pick a reachable state uniformly at random and solve it with the two-phase
+solver, the scramble being the solution backwards. The solver has no time
+limit for these, so the scrambles depend only on the seed.
+
+Usage:
+    python scrambler.py -n 1000000 --seed 1 -o scrambles.txt
+    python scrambler.py -n 100 --random-state
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+import argparse
+import random
+import sys
+
+from algorithm import invert, parse, to_moves
+from cubie_cube import Cubie_Cube, perm_parity
+
+faces = ('R', 'L', 'F', 'B', 'U', 'D')
+''' faces turned by scrambles, opposite faces next to each other '''
+
+def build_allowed_moves():
+    ''' Work out which moves may follow the last two faces turned
+        Returns: dictionary mapping (last face, face before it) to a tuple
+            of move strings, None standing for no move '''
+
+    allowed = {}
+    for last in faces + (None,):
+        for before in faces + (None,):
+            blocked = set()
+            if last is not None:
+                blocked.add(last)
+                # after R L, neither R nor L may come next
+                if before is not None and faces.index(before) // 2 == faces.index(last) // 2:
+                    blocked.add(before)
+            allowed[last, before] = tuple(face + suffix for face in faces if face not in blocked
+                                          for suffix in ('', "'", '2'))
+    return allowed
+
+allowed_moves = build_allowed_moves()
+''' maps the last two faces turned to the moves that may come next '''
+
+class Scrambler:
+    ''' This class represents a source of scrambles with its own random
+        number generator, so a seed always gives the same scrambles '''
+
+    def __init__(self, seed = None):
+        ''' Initializes the scrambler
+            Parameters:
+                seed - seed for the random number generator, a random one if None '''
+
+        self.rng = random.Random(seed)
+
+    def random_moves(self, length = 20):
+        ''' Make a scramble of random face turns where no moves cancel or combine
+            Parameters:
+                length - number of moves
+            Returns: list of move strings '''
+
+        choice = self.rng.choice
+        scramble = []
+        last = before = None
+        for i in range(length):
+            move = choice(allowed_moves[last, before])
+            scramble.append(move)
+            last, before = move[0], last
+        return scramble
+
+    def random_state(self):
+        ''' Pick a state uniformly at random from every reachable state
+            Returns: Cubie_Cube '''
+
+        cube = Cubie_Cube()
+        self.rng.shuffle(cube.cp)
+        self.rng.shuffle(cube.ep)
+        # only states with the same corner and edge parity can be reached
+        if perm_parity(cube.cp) != perm_parity(cube.ep):
+            cube.ep[0], cube.ep[1] = cube.ep[1], cube.ep[0]
+        cube.set_twist(self.rng.randrange(2187))
+        cube.set_flip(self.rng.randrange(2048))
+        return cube
+
+    def random_state_scramble(self, max_length = 24):
+        ''' Make a scramble that leads to a uniformly random state
+
+            The solver searches until it finds a solution of max_length moves
+            or fewer, with no time limit, so the scramble only depends on the
+            random state and a seed always gives the same scrambles. Every
+            state has a solution of 20 moves, but asking for fewer than 22
+            can make the search take seconds.
+            Parameters:
+                max_length - most moves in the scramble
+            Returns: list of move strings '''
+
+        import two_phase_solver
+        solution = two_phase_solver.solve(self.random_state(), max_length, float('inf'))
+        return to_moves(invert(parse(' '.join(solution))))
+
+    def generate(self, count, length = 20, random_state = False, max_length = 24):
+        ''' Make many scrambles
+            Parameters:
+                count - number of scrambles
+                length - number of moves in each random-move scramble
+                random_state - whether to make random-state scrambles instead
+                max_length - most moves in each random-state scramble
+            Returns: generator of lists of move strings '''
+
+        for i in range(count):
+            if random_state:
+                yield self.random_state_scramble(max_length)
+            else:
+                yield self.random_moves(length)
+
+def main(argv = None):
+    ''' Write scrambles from the command line, one per line
+        Parameters:
+            argv - command line arguments, sys.argv if None
+        Returns: exit status '''
+
+    parser = argparse.ArgumentParser(description = 'Write random scrambles, one per line.')
+    parser.add_argument('-n', '--count', type = int, default = 1, help = 'number of scrambles')
+    parser.add_argument('--length', type = int, default = 20, help = 'moves in each random-move scramble')
+    parser.add_argument('--seed', type = int, default = None, help = 'seed for reproducible scrambles')
+    parser.add_argument('--random-state', action = 'store_true', help = 'make random-state scrambles')
+    parser.add_argument('--max-length', type = int, default = 24, help = 'most moves in each random-state scramble')
+    parser.add_argument('-o', '--output', default = '-', help = 'file to write to, - for stdout')
+    args = parser.parse_args(argv)
+
+    scrambler = Scrambler(args.seed)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        lines = []
+        for scramble in scrambler.generate(args.count, args.length, args.random_state, args.max_length):
+            lines.append(' '.join(scramble) + '\n')
+            if len(lines) == 10000:
+                output.writelines(lines)
+                lines = []
+        output.writelines(lines)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
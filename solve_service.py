@@ -0,0 +1,457 @@
+'''
+This file contains a local HTTP service that answers hint and solution
+requests from a pool of warm worker processes, and a load generator for it
+
+Every worker loads the solver tables once when it starts, so a request only
+pays for the search itself instead of the start-up of a new process.
+Hint and CFOP requests arriving at the same time are gathered into one
+batch for a single round trip to a worker, while solves, which can search
+for seconds, are sent one at a time so they spread over the workers. Every
+request has a deadline: a request that can't be answered before it gets a
+504, and the two-phase search is never given longer than the time left.
+
+Requests are POSTed as JSON to /hint, /cfop or /solve, with the cube as one of:
+    "cube" - 6 lists of 9 color values in U, F, R, B, L, D order, the
+        format of Rubiks_Cube.cube
+    "facelets" - 54 character facelet string in U, R, F, D, L, B order
+    "state" - 54 color digits in U, F, R, B, L, D order
+and for /solve optionally "max_length" and "max_time". GET /health
+reports the workers and the number of requests and batches so far, with a
+503 if the batch thread has stopped or the worker pool is broken. A pool
+that loses a worker is replaced, the requests it was answering get a 503.
+
+Usage:
+    python solve_service.py serve --port 8642 -j 4
+    python solve_service.py load --requests 2000 --concurrency 16 --endpoint solve
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+
+import facelets
+from rubix_cube import Rubiks_Cube
+
+endpoints = ('hint', 'cfop', 'solve')
+''' kinds of request the service answers, each POSTed to /<kind> '''
+
+solution_cache = None
+''' State_Cache of the solutions found by the current worker '''
+
+def init_worker(cache_size):
+    ''' Set up a worker process, loading every solver table up front
+        Parameters:
+            cache_size - solutions the worker remembers, 0 for none '''
+
+    global solution_cache
+    import cfop_solver
+    import two_phase_solver
+    cfop_solver.get_solver()
+    two_phase_solver.get_tables()
+    if cache_size:
+        from state_cache import State_Cache
+        solution_cache = State_Cache(cache_size)
+
+def read_state(request):
+    ''' Read and check the cube described by a request
+        Parameters:
+            request - dictionary with 'cube', 'facelets' or 'state'
+        Returns: 54 color values in Rubiks_Cube.state order, as bytes
+        Raises: ValueError if there is no cube, it can't be read or it
+            can't be solved '''
+
+    if 'cube' in request:
+        faces = request['cube']
+        if len(faces) != 6 or any(len(face) != 9 for face in faces):
+            raise ValueError('cube must be 6 lists of 9 color values')
+        if any(not isinstance(color, int) or not 0 <= color <= 5 for face in faces for color in face):
+            raise ValueError('color values must be 0 to 5')
+        state = bytes(color for face in faces for color in face)
+    elif 'facelets' in request:
+        state = facelets.from_facelets(request['facelets'])
+    elif 'state' in request:
+        state = facelets.from_digits(request['state'])
+    else:
+        raise ValueError("request needs a 'cube', 'facelets' or 'state'")
+
+    problem = facelets.validate_state(state)
+    if problem is not None:
+        raise ValueError('cube can not be solved: ' + problem)
+    return state
+
+def answer(kind, state, request, deadline):
+    ''' Answer one request in a worker
+        Parameters:
+            kind - 'hint', 'cfop' or 'solve'
+            state - the request's cube from read_state, already checked
+            request - decoded JSON body of the request
+            deadline - time.time() by which the answer is needed
+        Returns: dictionary of results, with 'error' if it failed '''
+
+    import cfop_solver
+    import two_phase_solver
+
+    time_left = deadline - time.time()
+    if time_left <= 0:
+        return {'error': 'timed out waiting for a worker', 'timeout': True}
+    cube = Rubiks_Cube()
+    cube.set_state(state)
+    try:
+        if kind == 'hint':
+            return {'hint': cfop_solver.get_hint(cube)}
+        if kind == 'cfop':
+            return {'cfop': [list(step) for step in cfop_solver.solve(cube)]}
+        max_time = min(float(request.get('max_time', 3.0)), time_left)
+        solution = two_phase_solver.solve(cube, int(request.get('max_length', 22)), max_time, solution_cache)
+        if solution is None:
+            return {'solution': None}
+        return {'solution': ' '.join(solution), 'length': len(solution)}
+    except (ValueError, KeyError, TypeError) as error:
+        return {'error': str(error)}
+
+def answer_batch(jobs):
+    ''' Answer a batch of requests in a worker
+        Parameters:
+            jobs - list of (kind, state, request, deadline)
+        Returns: list of result dictionaries in the same order '''
+
+    return [answer(*job) for job in jobs]
+
+class Solve_Service:
+    ''' This class represents the pool of warm workers behind the HTTP
+        server, and the thread gathering requests into batches for them '''
+
+    def __init__(self, workers = None, timeout = 5.0, batch_size = 16, batch_wait = 0.002, cache_size = 100000):
+        ''' Start the workers and wait for them to load their tables
+            Parameters:
+                workers - number of worker processes, all cores if None
+                timeout - seconds a request may take before it gets a 504
+                batch_size - most requests sent to a worker at a time
+                batch_wait - seconds to wait for more requests to fill a batch
+                cache_size - solutions each worker remembers, 0 for none '''
+
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.cache_size = cache_size
+        self.requests = 0
+        self.batches = 0
+        self.restarts = 0
+        self.broken = False
+
+        self.start_pool()
+
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target = self.gather, daemon = True)
+        self.thread.start()
+
+    def start_pool(self):
+        ''' Start the worker processes and wait for them to load their tables '''
+
+        self.pool = ProcessPoolExecutor(self.workers, initializer = init_worker, initargs = (self.cache_size,))
+        # starting every worker now keeps the table loading out of the first requests
+        for future in [self.pool.submit(answer_batch, []) for i in range(self.workers)]:
+            future.result()
+        self.broken = False
+
+    def restart_pool(self):
+        ''' Replace a pool that lost a worker, since a pool whose worker died
+            refuses any more work '''
+
+        self.pool.shutdown(wait = False)
+        self.restarts += 1
+        try:
+            self.start_pool()
+        except (BrokenProcessPool, OSError):
+            # the next batch tries again
+            self.broken = True
+
+    def submit(self, kind, state, request):
+        ''' Queue a request for the next batch
+            Parameters:
+                kind - 'hint', 'cfop' or 'solve'
+                state - the request's cube from read_state
+                request - decoded JSON body of the request
+            Returns: Future of the result dictionary '''
+
+        result = Future()
+        self.queue.put(((kind, state, request, time.time() + self.timeout), result))
+        return result
+
+    def gather(self):
+        ''' Send requests to the workers in batches, forever: each batch is
+            whatever arrives within batch_wait of its first request, with
+            every solve split off into a batch of its own '''
+
+        while True:
+            batch = [self.queue.get()]
+            if batch[0] is None:
+                return
+            end = time.perf_counter() + self.batch_wait
+            while len(batch) < self.batch_size:
+                try:
+                    job = self.queue.get(timeout = max(0, end - time.perf_counter()))
+                except queue.Empty:
+                    break
+                if job is None:
+                    self.queue.put(None)
+                    break
+                batch.append(job)
+
+            self.requests += len(batch)
+            # a solve can search for seconds, so solves go to workers one at a
+            # time where the quick requests behind them can't wait on them
+            quick = [job for job in batch if job[0][0] != 'solve']
+            groups = [[job] for job in batch if job[0][0] == 'solve'] + ([quick] if quick else [])
+            for group in groups:
+                self.batches += 1
+                jobs = [job for job, result in group]
+                results = [result for job, result in group]
+                if self.broken:
+                    self.restart_pool()
+                try:
+                    future = self.pool.submit(answer_batch, jobs)
+                except (BrokenProcessPool, RuntimeError) as error:
+                    # a worker died since the last batch was answered
+                    self.fail(results, error)
+                    self.restart_pool()
+                    continue
+                future.add_done_callback(lambda future, results = results, pool = self.pool: self.deliver(future, results, pool))
+
+    def fail(self, results, error):
+        ''' Answer the requests of a batch that no worker could answer '''
+
+        for result in results:
+            result.set_result({'error': 'worker failed: ' + (str(error) or type(error).__name__), 'failed': True})
+
+    def deliver(self, future, results, pool):
+        ''' Hand the answers of a finished batch to the requests waiting for them
+            Parameters:
+                future - Future of the batch's answers
+                results - Futures of the requests in the batch
+                pool - pool the batch was sent to '''
+
+        error = future.exception()
+        if error is not None:
+            # batches failing in a pool already replaced don't break the new one
+            if isinstance(error, BrokenProcessPool) and pool is self.pool:
+                self.broken = True
+            return self.fail(results, error)
+        for result, value in zip(results, future.result()):
+            result.set_result(value)
+
+    def handle(self, kind, request):
+        ''' Answer a request, waiting no longer than the timeout
+            Returns: (HTTP status, result dictionary) '''
+
+        # a cube that can't be read or solved is turned away before any worker sees it
+        try:
+            state = read_state(request)
+        except (ValueError, KeyError, TypeError) as error:
+            return 400, {'error': str(error)}
+        try:
+            result = self.submit(kind, state, request).result(self.timeout)
+        except TimeoutError:
+            return 504, {'error': 'timed out after ' + str(self.timeout) + ' s'}
+        if result.pop('timeout', False):
+            return 504, result
+        # the request was fine, the worker answering it wasn't
+        if result.pop('failed', False):
+            return 503, result
+        return (400 if 'error' in result else 200), result
+
+    def health(self):
+        ''' Report whether the service can answer requests
+            Returns: (HTTP status, result dictionary) '''
+
+        problems = []
+        if not self.thread.is_alive():
+            problems.append('the batch thread has stopped')
+        if self.broken:
+            problems.append('the worker pool is broken')
+        body = {'status': 'failing' if problems else 'ok', 'workers': self.workers, 'requests': self.requests,
+                'batches': self.batches, 'restarts': self.restarts}
+        if problems:
+            body['problems'] = problems
+        return (503 if problems else 200), body
+
+    def close(self):
+        ''' Stop gathering batches and shut the workers down '''
+
+        self.queue.put(None)
+        self.thread.join()
+        self.pool.shutdown()
+
+class Request_Handler(BaseHTTPRequestHandler):
+    ''' This class represents the handling of one HTTP request, the service
+        it is answered by is set on the server '''
+
+    protocol_version = 'HTTP/1.1'
+
+    def send_json(self, status, body):
+        ''' Send a JSON response '''
+
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        ''' Report the state of the service at /health '''
+
+        if self.path != '/health':
+            return self.send_json(404, {'error': 'not found'})
+        self.send_json(*self.server.service.health())
+
+    def do_POST(self):
+        ''' Answer a request POSTed to /hint, /cfop or /solve '''
+
+        kind = self.path.strip('/')
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        if kind not in endpoints:
+            return self.send_json(404, {'error': 'not found'})
+        try:
+            request = json.loads(body)
+        except ValueError:
+            return self.send_json(400, {'error': 'body must be JSON'})
+        if not isinstance(request, dict):
+            return self.send_json(400, {'error': 'body must be a JSON object'})
+        self.send_json(*self.server.service.handle(kind, request))
+
+    def log_message(self, format, *args):
+        ''' Keep quiet, a load test would otherwise print a line per request '''
+
+def serve(host = '127.0.0.1', port = 8642, **options):
+    ''' Run the service until interrupted
+        Parameters:
+            host - address to listen on
+            port - port to listen on
+            options - passed on to Solve_Service '''
+
+    service = Solve_Service(**options)
+    server = ThreadingHTTPServer((host, port), Request_Handler)
+    server.daemon_threads = True
+    server.service = service
+    print('serving on http://' + host + ':' + str(server.server_address[1]) + ' with ' + str(service.workers) + ' workers')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+def post(url, body, timeout = 30):
+    ''' POST a JSON body
+        Returns: (HTTP status, decoded JSON response) '''
+
+    request = Request(url, json.dumps(body).encode(), {'Content-Type': 'application/json'})
+    try:
+        with urlopen(request, timeout = timeout) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as error:
+        return error.code, json.loads(error.read() or b'{}')
+
+def load_test(url, endpoint = 'hint', requests = 1000, concurrency = 8, seed = 0, max_time = 3.0):
+    ''' Send random scrambled cubes to the service from several threads and
+        time every request
+        Parameters:
+            url - address of the service, such as 'http://127.0.0.1:8642'
+            endpoint - 'hint', 'cfop' or 'solve'
+            requests - number of requests to send
+            concurrency - number of requests in flight at once
+            seed - seed of the scrambles
+            max_time - max_time of each solve request
+        Returns: dictionary with the request count, errors, seconds,
+            requests per second and the p50, p90, p99 and max latency in ms '''
+
+    from scrambler import Scrambler
+
+    scrambler = Scrambler(seed)
+    bodies = []
+    for i in range(requests):
+        cube = Rubiks_Cube()
+        cube.scramble(scrambler.random_moves(20))
+        bodies.append({'facelets': facelets.to_facelets(cube.state), 'max_time': max_time})
+
+    def timed_post(body):
+        start = time.perf_counter()
+        status, response = post(url.rstrip('/') + '/' + endpoint, body)
+        return time.perf_counter() - start, status
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        outcomes = list(pool.map(timed_post, bodies))
+    seconds = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, status in outcomes)
+    def percentile(p):
+        return round(1000 * latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))], 3)
+
+    return {
+        'requests': requests,
+        'errors': sum(status != 200 for latency, status in outcomes),
+        'seconds': round(seconds, 3),
+        'per_second': round(requests / seconds, 1),
+        'p50_ms': percentile(50),
+        'p90_ms': percentile(90),
+        'p99_ms': percentile(99),
+        'max_ms': round(1000 * latencies[-1], 3),
+    }
+
+def main(argv = None):
+    ''' Run the service or the load generator from the command line
+        Parameters:
+            argv - command line arguments, sys.argv if None
+        Returns: exit status '''
+
+    parser = argparse.ArgumentParser(description = 'Serve hints and solutions from warm workers, or load test the service.')
+    commands = parser.add_subparsers(dest = 'command', required = True)
+
+    server = commands.add_parser('serve', help = 'run the service')
+    server.add_argument('--host', default = '127.0.0.1', help = 'address to listen on')
+    server.add_argument('--port', type = int, default = 8642, help = 'port to listen on')
+    server.add_argument('-j', '--workers', type = int, default = None, help = 'number of worker processes (default: all cores)')
+    server.add_argument('--timeout', type = float, default = 5.0, help = 'seconds before a request gets a 504')
+    server.add_argument('--batch-size', type = int, default = 16, help = 'most requests sent to a worker at a time')
+    server.add_argument('--batch-wait', type = float, default = 0.002, help = 'seconds to wait for more requests to fill a batch')
+    server.add_argument('--cache-size', type = int, default = 100000,
+                        help = 'solutions each worker remembers for repeated positions, 0 to turn off')
+
+    load = commands.add_parser('load', help = 'send random cubes to a running service and report the latency')
+    load.add_argument('--url', default = 'http://127.0.0.1:8642', help = 'address of the service')
+    load.add_argument('--endpoint', choices = endpoints, default = 'hint', help = 'kind of request to send')
+    load.add_argument('--requests', type = int, default = 1000, help = 'number of requests to send')
+    load.add_argument('--concurrency', type = int, default = 8, help = 'requests in flight at once')
+    load.add_argument('--seed', type = int, default = 0, help = 'seed of the scrambles')
+    load.add_argument('--max-time', type = float, default = 3.0, help = 'seconds each solve may search for')
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        serve(args.host, args.port, workers = args.workers, timeout = args.timeout, batch_size = args.batch_size,
+              batch_wait = args.batch_wait, cache_size = args.cache_size)
+        return 0
+
+    report = load_test(args.url, args.endpoint, args.requests, args.concurrency, args.seed, args.max_time)
+    print(json.dumps(report, indent = 2))
+    return 1 if report['errors'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
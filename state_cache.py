@@ -0,0 +1,192 @@
+'''
+This file contains the State_Cache class, a bounded transposition table for
+searches over Rubiks_Cube states
+
+Positions are stored under a canonical key that is the same for every cube
+that only differs by a whole-cube rotation and the colour scheme: the state
+is relabelled so each color is named after the face its center is on, viewed
+from each of the 24 orientations made by x, y and z, and the smallest of the
+24 encodings is the key. Moves stored with a position are turned into the
+orientation of the key on the way in and back into the orientation of the
+cube being looked up on the way out, so a result found for one cube can be
+reused for all of its rotations. The least recently used positions are
+evicted once the cache is full, so its memory stays within a set limit.
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+from collections import OrderedDict
+from operator import itemgetter
+
+from move_tables import move_perms, compose, inverse, identity
+
+def build_rotations():
+    ''' Find the 24 whole-cube rotations by turning the cube with x, y and z
+        until no new orientation turns up
+        Returns: list of 24 permutations, the identity first '''
+
+    rotations = [identity]
+    seen = {identity}
+    for perm in rotations:
+        for move in ('x', 'y', 'z'):
+            rotated = compose(perm, move_perms[move])
+            if rotated not in seen:
+                seen.add(rotated)
+                rotations.append(rotated)
+    return rotations
+
+rotations = build_rotations()
+''' the 24 whole-cube rotations as sticker permutations '''
+
+rotation_gathers = [itemgetter(*perm) for perm in rotations]
+''' maps each rotation to a function that gathers the stickers of a state '''
+
+rotation_relabels = [bytes(perm[9 * face + 4] // 9 for face in range(6)).ljust(256, b'\0')
+                     for perm in map(inverse, rotations)]
+''' for each rotation, a bytes.translate table renaming the face a sticker
+    belongs to with the face it is on after the rotation '''
+
+move_by_perm = {}
+for move, perm in move_perms.items():
+    move_by_perm.setdefault(perm, move)
+''' maps a sticker permutation back to its move token '''
+
+def build_conjugates():
+    ''' Work out what every move becomes when the cube is viewed after each rotation
+        Returns: list with a dictionary for each rotation mapping a move in the
+            original orientation to the same move in the rotated orientation '''
+
+    conjugates = []
+    for perm in rotations:
+        undo = inverse(perm)
+        conjugates.append({move: move_by_perm[compose(compose(undo, move_perm), perm)]
+                           for move, move_perm in move_perms.items()})
+    return conjugates
+
+to_rotated = build_conjugates()
+''' for each rotation, maps a move to the same move after the rotation '''
+
+from_rotated = [{rotated: move for move, rotated in moves.items()} for moves in to_rotated]
+''' for each rotation, maps a move after the rotation back to the original move '''
+
+def canonical(state):
+    ''' Get the key shared by a state and all of its rotations and recolorings
+        Parameters:
+            state - 54 color values in Rubiks_Cube.state order
+        Returns: (key as bytes, index of the rotation that gives the key) '''
+
+    relabel = bytearray(256)
+    for face in range(6):
+        relabel[state[9 * face + 4]] = face
+    faces = bytes(state).translate(relabel)
+
+    best = None
+    best_rotation = 0
+    for rotation, gather in enumerate(rotation_gathers):
+        key = bytes(gather(faces)).translate(rotation_relabels[rotation])
+        if best is None or key < best:
+            best = key
+            best_rotation = rotation
+    return best, best_rotation
+
+class State_Cache:
+    ''' This class represents a least recently used cache of search results
+        for cube positions, shared between all rotations of each position '''
+
+    def __init__(self, max_entries = 100000):
+        ''' Initializes the cache
+            Parameters:
+                max_entries - most positions kept before the least recently
+                    used ones are evicted, each takes roughly 300 bytes
+            Raises: ValueError if max_entries is less than 1 '''
+
+        if max_entries < 1:
+            raise ValueError('a cache needs room for at least 1 position')
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        ''' Returns the number of positions in the cache '''
+
+        return len(self.entries)
+
+    def __contains__(self, cube):
+        ''' Check if a position is in the cache without counting a hit or miss '''
+
+        return canonical(cube.state)[0] in self.entries
+
+    def get(self, cube):
+        ''' Look up a position
+            Parameters:
+                cube - Rubiks_Cube to look up
+            Returns: (lower bound, upper bound, list of moves) with the moves
+                turned to the orientation of cube, or None if not cached '''
+
+        key, rotation = canonical(cube.state)
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        lower, upper, moves = entry
+        back = from_rotated[rotation]
+        return lower, upper, [back[move] for move in moves]
+
+    def store(self, cube, lower = 0, upper = None, moves = ()):
+        ''' Record what a search learned about a position, keeping the
+            tightest bounds already known for it
+            Parameters:
+                cube - Rubiks_Cube the search was run on
+                lower - fewest moves the position could need
+                upper - most moves the position needs, None if unknown
+                moves - best moves found from the position, such as the
+                    first move of a search or a whole solution '''
+
+        key, rotation = canonical(cube.state)
+        forward = to_rotated[rotation]
+        moves = tuple(forward[move] for move in moves)
+
+        entry = self.entries.get(key)
+        if entry is not None:
+            old_lower, old_upper, old_moves = entry
+            lower = max(lower, old_lower)
+            if upper is None or (old_upper is not None and old_upper <= upper):
+                # the moves that go with the best known upper bound are kept
+                if old_upper is not None or not moves:
+                    moves = old_moves
+                upper = old_upper
+            self.entries.move_to_end(key)
+        elif len(self.entries) >= self.max_entries:
+            self.entries.popitem(last = False)
+            self.evictions += 1
+
+        self.entries[key] = (lower, upper, moves)
+
+    def clear(self):
+        ''' Remove every position and reset the stats '''
+
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        ''' Returns a dictionary with the hits, misses, evictions, size and
+            hit rate of the cache '''
+
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.entries),
+            'max_entries': self.max_entries,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
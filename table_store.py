@@ -0,0 +1,184 @@
+'''
+This file contains the functions that save precomputed tables to disk and
+open them again with mmap so they never have to be rebuilt
+
+Every set of tables is kept in one binary file laid out as:
+
+    header      magic, file format, byte order, table set version,
+                payload checksum and number of tables
+    directory   name, array typecode, offset and size of each table
+    payload     the raw bytes of each table, 8-byte aligned
+
+Opening a file maps it read-only and hands out memoryviews of the payload,
+so nothing is copied and every process that opens the same file shares
+one copy of its pages. A file with the wrong version, byte order or
+checksum is ignored and rebuilt.
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+magic = b'RUBIKTBL'
+''' first bytes of every table file '''
+
+file_format = 1
+''' version of the file layout itself '''
+
+header_layout = struct.Struct('<8sHBxIIII')
+''' magic, file format, byte order, table set version, checksum, table count, directory size '''
+
+entry_layout = struct.Struct('<cxxxQQ')
+''' typecode, offset and size of one table, followed by its name '''
+
+byte_orders = {'little':0, 'big':1}
+
+def table_dir():
+    ''' Get the directory table files are kept in, which is the
+        RUBIKS_TABLE_DIR environment variable if it is set
+        Returns: directory path '''
+
+    default = os.path.join(os.path.expanduser('~'), '.cache', 'rubiks_gui')
+    return os.environ.get('RUBIKS_TABLE_DIR', default)
+
+def table_path(name):
+    ''' Get the path of the file for a named set of tables '''
+
+    return os.path.join(table_dir(), name + '.tbl')
+
+def save_tables(path, tables, version):
+    ''' Write a set of tables to a file
+
+        The file is written next to its final path and then renamed into
+        place, so a process opening it never sees a half-written file even
+        if several processes build the same tables at once.
+        Parameters:
+            path - file to write
+            tables - dictionary mapping names to arrays or bytearrays
+            version - version of the table set, files with a different
+                version are rebuilt '''
+
+    directory = b''
+    offset = 0
+    chunks = []
+    for name, table in tables.items():
+        typecode = table.typecode if hasattr(table, 'typecode') else 'B'
+        data = table.tobytes() if hasattr(table, 'tobytes') else bytes(table)
+        encoded = name.encode()
+        directory += entry_layout.pack(typecode.encode(), offset, len(data)) + struct.pack('<H', len(encoded)) + encoded
+        padding = -len(data) % 8
+        chunks.append(data + bytes(padding))
+        offset += len(data) + padding
+
+    payload_start = header_layout.size + len(directory)
+    payload_start += -payload_start % 8
+    checksum = 0
+    for chunk in chunks:
+        checksum = zlib.crc32(chunk, checksum)
+
+    header = header_layout.pack(magic, file_format, byte_orders[sys.byteorder], version, checksum,
+                                len(tables), len(directory))
+
+    # tempfile is slow to import and only needed when tables are built
+    import tempfile
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok = True)
+    handle, temp_path = tempfile.mkstemp(dir = os.path.dirname(os.path.abspath(path)), suffix = '.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as file:
+            file.write(header)
+            file.write(directory)
+            file.write(bytes(payload_start - header_layout.size - len(directory)))
+            for chunk in chunks:
+                file.write(chunk)
+        # mkstemp makes the file private, but other users' workers may share it
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+def load_tables(path, version, verify = True):
+    ''' Open a file written by save_tables without copying it
+        Parameters:
+            path - file to open
+            version - version the table set must have
+            verify - whether to check the payload checksum
+        Returns: dictionary mapping names to read-only memoryviews, or None
+            if the file is missing, from another version or damaged '''
+
+    try:
+        with open(path, 'rb') as file:
+            mapped = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    if len(mapped) < header_layout.size:
+        return None
+    found_magic, found_format, order, found_version, checksum, count, directory_size = \
+        header_layout.unpack_from(mapped, 0)
+    if found_magic != magic or found_format != file_format or order != byte_orders[sys.byteorder] \
+            or found_version != version:
+        return None
+
+    entries = []
+    position = header_layout.size
+    try:
+        for i in range(count):
+            typecode, offset, size = entry_layout.unpack_from(mapped, position)
+            position += entry_layout.size
+            name_size, = struct.unpack_from('<H', mapped, position)
+            position += 2
+            if position + name_size > len(mapped):
+                return None
+            entries.append((mapped[position:position + name_size].decode(), typecode.decode(), offset, size))
+            position += name_size
+    except (struct.error, UnicodeDecodeError, ValueError):
+        # a truncated or overwritten directory
+        return None
+
+    payload_start = header_layout.size + directory_size
+    payload_start += -payload_start % 8
+    view = memoryview(mapped)
+    if verify and zlib.crc32(view[payload_start:]) != checksum:
+        return None
+
+    tables = {}
+    for name, typecode, offset, size in entries:
+        if payload_start + offset + size > len(view):
+            return None
+        table = view[payload_start + offset:payload_start + offset + size]
+        try:
+            tables[name] = table.cast(typecode) if typecode != 'B' else table
+        except (TypeError, ValueError):
+            # an unknown typecode, or a size that isn't whole items
+            return None
+    return tables
+
+def load_or_build(name, version, build):
+    ''' Open a named set of tables, building and saving them first if
+        there is no usable file for them yet
+        Parameters:
+            name - name of the table set, used for its file name
+            version - version of the table set
+            build - function with no parameters that returns the tables
+        Returns: dictionary mapping names to read-only memoryviews, or to
+            the built tables themselves if they could not be saved '''
+
+    path = table_path(name)
+    tables = load_tables(path, version)
+    if tables is None:
+        built = build()
+        try:
+            save_tables(path, built, version)
+        except OSError:
+            # nowhere to cache them, so this process keeps its own copy
+            return built
+        tables = load_tables(path, version, verify = False)
+    return tables
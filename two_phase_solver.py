@@ -0,0 +1,361 @@
+'''
+This file contains the Two_Phase_Solver class which finds short solutions for
+any state of a Rubiks_Cube
+
+Phase 1 turns the cube into the group generated by U, D, R2, L2, F2 and B2,
+where every corner and edge is oriented and the FR, FL, BL and BR edges are
+back in the middle slice. Phase 2 then solves the cube using only those moves.
+Both phases are iterative deepening searches over integer coordinates of a
+Cubie_Cube, pruned by tables that hold the exact number of moves needed to
+solve pairs of coordinates. Phase 2 is never searched deeper than the
+length asked for allows, since moving on to a longer phase 1 finds a
+solution far sooner than a deep phase 2 search. The tables are built once,
+saved by table_store and mapped into memory by every process after that.
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+from array import array
+from time import perf_counter
+
+from cubie_cube import Cubie_Cube, from_state, move_cubes, move_names, phase_2_moves, perm_rank
+from table_store import load_or_build
+
+twist_count = 2187
+flip_count = 2048
+slice_count = 495
+slice_sorted_count = 11880
+corners_count = 40320
+ud_edges_count = 40320
+slice_perm_count = 24
+
+phase_2_god_number = 18
+''' no state in the phase 2 group needs more than 18 phase 2 moves '''
+
+def follow_moves(moves):
+    ''' Work out which moves may follow a turn of each face, never the same
+        face again and never the opposite face in the other order (U D but not D U)
+        Parameters:
+            moves - moves the search uses
+        Returns: dictionary mapping the last face turned, -1 for none, to a tuple of moves '''
+
+    return {last_face: tuple(move for move in moves if move // 3 != last_face and move // 3 != last_face - 3)
+            for last_face in range(-1, 6)}
+
+phase_1_follow_moves = follow_moves(range(18))
+phase_2_follow_moves = follow_moves(phase_2_moves)
+''' moves each phase may make after a turn of each face '''
+
+table_version = 1
+''' version of the saved tables, to be raised whenever build_tables changes '''
+
+tables = None
+''' tables shared by every solver, filled in by get_tables '''
+
+class Search_Stop(Exception):
+    ''' Raised inside the search to unwind it once a short enough solution
+        is found or the time budget is spent '''
+
+def build_move_table(size, get_coord, set_coord, moves = range(18)):
+    ''' Build the table giving each coordinate after each face turn
+        Parameters:
+            size - number of values the coordinate can take
+            get_coord - Cubie_Cube method reading the coordinate
+            set_coord - Cubie_Cube method setting the coordinate
+            moves - moves to fill in, the others are left at 0
+        Returns: array where entry 18 * coord + move is the new coordinate '''
+
+    table = array('H', bytes(2 * 18 * size))
+    faces = sorted({move // 3 for move in moves})
+    cube = Cubie_Cube()
+
+    for coord in range(size):
+        set_coord(cube, coord)
+        for face in faces:
+            turned = cube.clone()
+            for power in range(3):
+                turned.multiply(move_cubes[3 * face])
+                table[18 * coord + 3 * face + power] = get_coord(turned)
+
+    return table
+
+def build_prune_table(size_a, move_a, size_b, move_b, moves):
+    ''' Find how many moves every pair of coordinates is from solved with a
+        breadth-first search outward from the solved pair (0, 0)
+        Parameters:
+            size_a, size_b - number of values of each coordinate
+            move_a, move_b - move tables of each coordinate
+            moves - moves the search may use
+        Returns: bytearray where entry size_b * a + b is the distance '''
+
+    table = bytearray(b'\xff') * (size_a * size_b)
+    table[0] = 0
+    frontier = [0]
+    depth = 0
+
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for index in frontier:
+            a, b = divmod(index, size_b)
+            row_a = 18 * a
+            row_b = 18 * b
+            for move in moves:
+                neighbour = size_b * move_a[row_a + move] + move_b[row_b + move]
+                if table[neighbour] == 255:
+                    table[neighbour] = depth
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+
+    return table
+
+def build_tables():
+    ''' Build every move and pruning table the solver uses
+        Returns: dictionary mapping table names to arrays '''
+
+    built = {}
+    built['twist_move'] = build_move_table(twist_count, Cubie_Cube.get_twist, Cubie_Cube.set_twist)
+    built['flip_move'] = build_move_table(flip_count, Cubie_Cube.get_flip, Cubie_Cube.set_flip)
+    built['slice_sorted_move'] = build_move_table(slice_sorted_count, Cubie_Cube.get_slice_sorted,
+                                                  Cubie_Cube.set_slice_sorted)
+    built['corners_move'] = build_move_table(corners_count, Cubie_Cube.get_corners, Cubie_Cube.set_corners)
+    built['ud_edges_move'] = build_move_table(ud_edges_count, Cubie_Cube.get_ud_edges,
+                                              Cubie_Cube.set_ud_edges, phase_2_moves)
+
+    # the positions of the slice edges alone, and their order once phase 1 is done
+    slice_sorted_move = built['slice_sorted_move']
+    slice_move = array('H', [slice_sorted_move[18 * 24 * s + m] // 24 for s in range(slice_count) for m in range(18)])
+    slice_perm_move = array('H', slice_sorted_move[:18 * slice_perm_count])
+
+    built['slice_twist_prune'] = build_prune_table(slice_count, slice_move, twist_count,
+                                                   built['twist_move'], range(18))
+    built['slice_flip_prune'] = build_prune_table(slice_count, slice_move, flip_count,
+                                                  built['flip_move'], range(18))
+    built['corners_slice_prune'] = build_prune_table(corners_count, built['corners_move'], slice_perm_count,
+                                                     slice_perm_move, phase_2_moves)
+    built['ud_edges_slice_prune'] = build_prune_table(ud_edges_count, built['ud_edges_move'], slice_perm_count,
+                                                      slice_perm_move, phase_2_moves)
+    return built
+
+def get_tables():
+    ''' Get the shared solver tables, opening them from the table store
+        or building and saving them on first use
+        Returns: dictionary mapping table names to arrays '''
+
+    global tables
+    if tables is None:
+        tables = load_or_build('two_phase', table_version, build_tables)
+    return tables
+
+class Two_Phase_Solver:
+    ''' This class represents a two-phase solver that finds short solutions
+        for Rubik's Cube states '''
+
+    def __init__(self, tables = None):
+        ''' Initializes the solver
+            Parameters:
+                tables - tables from build_tables, the shared tables are used if not passed '''
+
+        tables = tables if tables is not None else get_tables()
+        self.cancelled = False
+        self.twist_move = tables['twist_move']
+        self.flip_move = tables['flip_move']
+        self.slice_sorted_move = tables['slice_sorted_move']
+        self.corners_move = tables['corners_move']
+        self.ud_edges_move = tables['ud_edges_move']
+        self.slice_twist_prune = tables['slice_twist_prune']
+        self.slice_flip_prune = tables['slice_flip_prune']
+        self.corners_slice_prune = tables['corners_slice_prune']
+        self.ud_edges_slice_prune = tables['ud_edges_slice_prune']
+
+    def solve(self, cube, max_length = 22, max_time = 3.0):
+        ''' Find a solution for the passed cube
+
+            The search returns the first solution of max_length moves or
+            fewer that it finds, and gives up once max_time seconds have
+            passed. With the tables loaded, a random state takes around 40 ms
+            for 22 moves (300 ms for 1 in 100 states), but every move asked
+            for below that costs several times more: 21 moves can take
+            seconds and 20 moves often takes longer than is worth waiting.
+            Parameters:
+                cube - Rubiks_Cube or Cubie_Cube to solve, it is not changed
+                max_length - most moves in the solution
+                max_time - seconds to search for before giving up
+            Returns: list of move strings, or None if no solution was found in time
+            Raises: ValueError if the cube can't be solved '''
+
+        cubie = cube if isinstance(cube, Cubie_Cube) else from_state(cube.state)
+        problem = cubie.verify()
+        if problem is not None:
+            raise ValueError('cube can not be solved: ' + problem)
+
+        self.start = cubie
+        self.max_length = max_length
+        self.deadline = perf_counter() + max_time
+        # cancel may have been called before the deadline above was set
+        if self.cancelled:
+            self.deadline = 0
+        self.best = None
+        self.path = []
+
+        twist = cubie.get_twist()
+        flip = cubie.get_flip()
+        slice_sorted = cubie.get_slice_sorted()
+        corners = cubie.get_corners()
+        estimate = self.phase_1_estimate(twist, flip, slice_sorted // 24)
+
+        try:
+            depth = estimate
+            while self.best is None and depth <= max_length:
+                self.phase_1(twist, flip, slice_sorted, corners, depth, -1)
+                depth += 1
+        except Search_Stop:
+            pass
+        self.cancelled = False
+
+        return [move_names[move] for move in self.best] if self.best is not None else None
+
+    def cancel(self):
+        ''' Stop a search running on another thread, or the next one if it
+            hasn't started yet, solve then returns None '''
+
+        self.cancelled = True
+        self.deadline = 0
+
+    def phase_1_estimate(self, twist, flip, slice_):
+        ''' Returns the fewest moves needed to finish phase 1 '''
+
+        return max(self.slice_twist_prune[twist_count * slice_ + twist],
+                   self.slice_flip_prune[flip_count * slice_ + flip])
+
+    def phase_1(self, twist, flip, slice_sorted, corners, togo, last_face):
+        ''' Search for phase 1 solutions of exactly togo more moves and try
+            to finish each one with phase 2
+            Raises: Search_Stop once the time budget is spent '''
+
+        if togo == 0:
+            # a phase 1 solution ending in a phase 2 move was already tried one move shorter
+            if not self.path or self.path[-1] not in phase_2_moves:
+                self.start_phase_2(slice_sorted, corners, last_face)
+            return
+
+        if perf_counter() > self.deadline:
+            raise Search_Stop()
+
+        # the tables are looked up thousands of times per call, so they are kept local
+        twist_move = self.twist_move
+        flip_move = self.flip_move
+        slice_sorted_move = self.slice_sorted_move
+        slice_twist_prune = self.slice_twist_prune
+        slice_flip_prune = self.slice_flip_prune
+        path = self.path
+        twist_row = 18 * twist
+        flip_row = 18 * flip
+        slice_row = 18 * slice_sorted
+
+        for move in phase_1_follow_moves[last_face]:
+            # the same as phase_1_estimate, checking the twist before looking up the flip
+            new_twist = twist_move[twist_row + move]
+            new_slice_sorted = slice_sorted_move[slice_row + move]
+            new_slice = new_slice_sorted // 24
+            if slice_twist_prune[twist_count * new_slice + new_twist] >= togo:
+                continue
+            new_flip = flip_move[flip_row + move]
+            if slice_flip_prune[flip_count * new_slice + new_flip] >= togo:
+                continue
+
+            path.append(move)
+            self.phase_1(new_twist, new_flip, new_slice_sorted, self.corners_move[18 * corners + move],
+                         togo - 1, move // 3)
+            path.pop()
+
+    def start_phase_2(self, slice_perm, corners, last_face):
+        ''' Try to solve the cube left by the current phase 1 solution
+            with phase 2 moves, in no more moves than would make the whole
+            solution max_length long
+            Raises: Search_Stop once a solution is found '''
+
+        length = len(self.path)
+        # searching phase 2 deeper than the length wanted costs far more
+        # than carrying on with a longer phase 1
+        limit = min(self.max_length - length, phase_2_god_number)
+        if self.corners_slice_prune[24 * corners + slice_perm] > limit:
+            return
+
+        # the U and D edge coordinate only exists once phase 1 is done
+        ep = self.start.ep
+        for move in self.path:
+            move_ep = move_cubes[move].ep
+            ep = [ep[move_ep[i]] for i in range(12)]
+        ud_edges = perm_rank(ep[:8])
+
+        estimate = max(self.corners_slice_prune[24 * corners + slice_perm],
+                       self.ud_edges_slice_prune[24 * ud_edges + slice_perm])
+        for depth in range(estimate, limit + 1):
+            if self.phase_2(corners, ud_edges, slice_perm, depth, last_face):
+                self.best = list(self.path)
+                raise Search_Stop()
+
+    def phase_2(self, corners, ud_edges, slice_perm, togo, last_face):
+        ''' Search for phase 2 solutions of exactly togo more moves
+            Returns: True if one was found, with its moves left in self.path
+            Raises: Search_Stop once the time budget is spent '''
+
+        if togo == 0:
+            return corners == 0 and ud_edges == 0 and slice_perm == 0
+
+        if perf_counter() > self.deadline:
+            raise Search_Stop()
+
+        corners_move = self.corners_move
+        ud_edges_move = self.ud_edges_move
+        slice_sorted_move = self.slice_sorted_move
+        corners_slice_prune = self.corners_slice_prune
+        ud_edges_slice_prune = self.ud_edges_slice_prune
+        path = self.path
+        corners_row = 18 * corners
+        ud_edges_row = 18 * ud_edges
+        slice_row = 18 * slice_perm
+
+        for move in phase_2_follow_moves[last_face]:
+            new_corners = corners_move[corners_row + move]
+            new_slice_perm = slice_sorted_move[slice_row + move]
+            if corners_slice_prune[24 * new_corners + new_slice_perm] >= togo:
+                continue
+            new_ud_edges = ud_edges_move[ud_edges_row + move]
+            if ud_edges_slice_prune[24 * new_ud_edges + new_slice_perm] >= togo:
+                continue
+
+            path.append(move)
+            if self.phase_2(new_corners, new_ud_edges, new_slice_perm, togo - 1, move // 3):
+                return True
+            path.pop()
+
+        return False
+
+solver = None
+''' solver shared by calls to solve '''
+
+def solve(cube, max_length = 22, max_time = 3.0, cache = None):
+    ''' Find a solution for the passed cube with a shared Two_Phase_Solver,
+        see Two_Phase_Solver.solve
+        Parameters:
+            cache - optional state_cache.State_Cache, a solution already found
+                for any rotation of the cube is reused instead of searching again
+        Returns: list of move strings, or None if no solution was found in time '''
+
+    if cache is not None:
+        entry = cache.get(cube)
+        if entry is not None and entry[1] is not None and entry[1] <= max_length:
+            return entry[2]
+
+    global solver
+    if solver is None:
+        solver = Two_Phase_Solver()
+    solution = solver.solve(cube, max_length, max_time)
+
+    if cache is not None and solution is not None:
+        cache.store(cube, 0, len(solution), solution)
+    return solution
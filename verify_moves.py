@@ -0,0 +1,418 @@
+'''
+This file contains the verification harness for the move model
+
+The group checks rebuild every move token from the geometry of the cube,
+turning the 3D position of each sticker about the move's axis, and make
+sure the permutations in move_tables and NxN_Cube match. They also check
+that every move has the right order and inverse, that moves on opposite
+layers commute, and that x, y and z are real rotations of the whole cube,
+and the size checks do
+the same for the moves NxN_Cube builds for every size from 2x2 to 7x7. The
+engine checks then compare Rubiks_Cube against every other engine (compiled
+algorithms, Cube_Batch, Cubie_Cube and a 3x3 NxN_Cube) over random move
+sequences, spread over all cores, and report the first sequences that
+disagree.
+
+Usage:
+    python verify_moves.py --sequences 1000000 --length 25
+
+Author: Henry Ham
+
+Version: 2026.10.17
+'''
+
+import argparse
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+from move_tables import move_perms, compose, inverse, power, identity
+from rubix_cube import Rubiks_Cube, solved_state
+
+face_frames = {
+    'U': ((0, 1, 0), (1, 0, 0), (0, 0, 1)),
+    'F': ((0, 0, 1), (1, 0, 0), (0, -1, 0)),
+    'R': ((1, 0, 0), (0, 0, -1), (0, -1, 0)),
+    'B': ((0, 0, -1), (-1, 0, 0), (0, -1, 0)),
+    'L': ((-1, 0, 0), (0, 0, 1), (0, -1, 0)),
+    'D': ((0, -1, 0), (1, 0, 0), (0, 0, -1)),
+}
+''' (outward normal, direction of the columns, direction of the rows) of each
+    face as it is laid out in Rubiks_Cube.state, x to the right, y up and z
+    to the front '''
+
+move_geometry = {
+    'R': (0, 1, (2,)), 'L': (0, -1, (-2,)), 'M': (0, -1, (0,)),
+    'r': (0, 1, (0, 2)), 'l': (0, -1, (-2, 0)), 'x': (0, 1, (-2, 0, 2)),
+    'U': (1, 1, (2,)), 'D': (1, -1, (-2,)), 'E': (1, -1, (0,)),
+    'u': (1, 1, (0, 2)), 'd': (1, -1, (-2, 0)), 'y': (1, 1, (-2, 0, 2)),
+    'F': (2, 1, (2,)), 'B': (2, -1, (-2,)), 'S': (2, 1, (0,)),
+    'f': (2, 1, (0, 2)), 'b': (2, -1, (-2, 0)), 'z': (2, 1, (-2, 0, 2)),
+}
+''' (axis, side the turn is clockwise when looked at from, layers turned) of
+    every move letter on a 3x3 cube, whose layers are at -2, 0 and 2 '''
+
+opposite_pairs = [('R', 'L'), ('U', 'D'), ('F', 'B'), ('R', 'M'), ('L', 'M'), ('U', 'E'), ('D', 'E'),
+                  ('F', 'S'), ('B', 'S'), ('r', 'L'), ('l', 'R'), ('u', 'D'), ('d', 'U'), ('f', 'B'), ('b', 'F')]
+''' moves on parallel layers that must commute '''
+
+face_turns = [face + suffix for face in 'RLFBUD' for suffix in ('', "'", '2')]
+''' the 18 face turns '''
+
+def sticker_positions(n = 3):
+    ''' Work out where every sticker is in space, as the center of the piece
+        it is on and the direction it faces
+        Parameters:
+            n - size of the cube
+        Returns: list of (position, normal) for the 6 * n * n stickers, each a
+            tuple of 3 coordinates from -(n - 1) to n - 1 in steps of 2 '''
+
+    stickers = []
+    for face in 'UFRBLD':
+        normal, column, row = face_frames[face]
+        for square in range(n * n):
+            r, c = divmod(square, n)
+            position = tuple((n - 1) * normal[k] + (2 * c - n + 1) * column[k] + (2 * r - n + 1) * row[k]
+                             for k in range(3))
+            stickers.append((position, normal))
+    return stickers
+
+def rotate(vector, axis, side):
+    ''' Turn a vector 90° clockwise about an axis as seen from one side of it
+        Parameters:
+            vector - tuple of 3 coordinates
+            axis - 0, 1 or 2 for x, y or z
+            side - 1 to look from the positive end of the axis, -1 from the negative end
+        Returns: turned vector '''
+
+    a, b = [(1, 2), (2, 0), (0, 1)][axis]
+    result = list(vector)
+    # clockwise from the positive end is a negative turn by the right-hand rule
+    result[a] = side * vector[b]
+    result[b] = -side * vector[a]
+    return tuple(result)
+
+def reference_perm(n, axis, side, layers):
+    ''' Build the permutation of one clockwise quarter turn of some layers
+        from the geometry of the cube
+
+        This model is kept apart from the one nxn_cube builds its moves
+        with, so that both engines are checked against something they
+        don't share.
+        Parameters:
+            n - size of the cube
+            axis - 0, 1 or 2 for x, y or z
+            side - 1 if the turn is clockwise seen from the positive end of the axis
+            layers - coordinates of the layers turned
+        Returns: permutation in the same form as move_tables.move_perms '''
+
+    stickers = sticker_positions(n)
+    index = {sticker: i for i, sticker in enumerate(stickers)}
+
+    perm = list(range(len(stickers)))
+    for i, (position, normal) in enumerate(stickers):
+        if position[axis] in layers:
+            perm[index[rotate(position, axis, side), rotate(normal, axis, side)]] = i
+    return tuple(perm)
+
+def geometric_perm(letter):
+    ''' Build the permutation of one clockwise quarter turn of a 3x3 cube
+        Parameters:
+            letter - move letter such as 'R', 'M', 'r' or 'x'
+        Returns: permutation in the same form as move_tables.move_perms '''
+
+    return reference_perm(3, *move_geometry[letter])
+
+def size_geometric_perm(n, move):
+    ''' Build the permutation of a move on an n x n x n cube from the
+        geometry of the cube, for the moves the size checks make
+        Parameters:
+            n - size of the cube
+            move - a face turn, such as R, R' or R2, an inner layer such
+                as 2R, a wide turn such as Rw, or x, y or z
+        Returns: permutation as a tuple '''
+
+    suffix = move[-1] if move[-1] in "'2" else ''
+    body = move[:len(move) - len(suffix)]
+    wide = body.endswith('w')
+    body = body.rstrip('w')
+    letter = body[-1]
+    depth = int(body[:-1]) if body[:-1] else (2 if wide else 1)
+
+    axis, side, layers = move_geometry[letter]
+    if letter in 'xyz':
+        layers = range(-(n - 1), n, 2)
+    else:
+        # layer k counted in from the face is at side * (n + 1 - 2k)
+        depths = range(1, depth + 1) if wide else (depth,)
+        layers = {side * (n + 1 - 2 * k) for k in depths}
+
+    quarter = reference_perm(n, axis, side, set(layers))
+    perm = tuple(range(len(quarter)))
+    for i in range({'': 1, '2': 2, "'": 3}[suffix]):
+        perm = compose(perm, quarter)
+    return perm
+
+def check(results, name, passed):
+    ''' Record the outcome of one check '''
+
+    results.append((name, passed))
+
+def check_group():
+    ''' Check the group properties of every move token
+        Returns: list of (check name, passed) '''
+
+    results = []
+
+    from nxn_cube import move_perm
+
+    for letter in move_geometry:
+        quarter = geometric_perm(letter)
+        check(results, letter + ' matches the geometry',
+              move_perms[letter] == quarter and move_perms[letter + '2'] == power(quarter, 2)
+              and move_perms[letter + "'"] == power(quarter, 3))
+        check(results, letter + ' matches the geometry on a 3x3 NxN_Cube',
+              move_perm(3, letter) == quarter and move_perm(3, letter + '2') == power(quarter, 2)
+              and move_perm(3, letter + "'") == power(quarter, 3))
+
+    for move, perm in move_perms.items():
+        order = 2 if move.endswith('2') else 4
+        check(results, move + ' has order ' + str(order),
+              power(perm, order) == identity and all(power(perm, n) != identity for n in range(1, order)))
+
+    for letter in move_geometry:
+        check(results, letter + "' undoes " + letter, compose(move_perms[letter], move_perms[letter + "'"]) == identity)
+
+    for first, second in opposite_pairs:
+        check(results, first + ' commutes with ' + second,
+              compose(move_perms[first], move_perms[second]) == compose(move_perms[second], move_perms[first]))
+
+    rotations = [move_perms[letter] for letter in 'xyz']
+    for letter, perm in zip('xyz', rotations):
+        state = bytes(solved_state[i] for i in perm)
+        check(results, letter + ' turns the whole cube',
+              all(len(set(state[9 * face:9 * face + 9])) == 1 for face in range(6)))
+
+    face_perms = {move_perms[move] for move in face_turns}
+    for letter, perm in zip('xyz', rotations):
+        check(results, letter + ' maps face turns to face turns',
+              all(compose(compose(inverse(perm), move_perms[move]), perm) in face_perms for move in face_turns))
+
+    check(results, 'r is L x', move_perms['r'] == compose(move_perms['L'], move_perms['x']))
+    check(results, 'u is D y', move_perms['u'] == compose(move_perms['D'], move_perms['y']))
+    check(results, 'f is B z', move_perms['f'] == compose(move_perms['B'], move_perms['z']))
+
+    return results
+
+def check_sizes(sizes = range(2, 8)):
+    ''' Check the moves NxN_Cube builds for other sizes against the geometry
+        of the cube, and their group properties
+        Parameters:
+            sizes - sizes of cube to check
+        Returns: list of (check name, passed) '''
+
+    from nxn_cube import move_perm, solved_state as nxn_solved_state
+
+    results = []
+    for n in sizes:
+        name = str(n) + 'x' + str(n) + ' '
+        size_identity = tuple(range(6 * n * n))
+        perm = lambda move: move_perm(n, move)
+        # move_tables.power starts from the 3x3 identity
+        repeat = lambda perm, count: reduce(compose, [perm] * count)
+
+        moves = [face + suffix for face in 'RLFBUD' for suffix in ('', "'", '2')]
+        moves += [str(k) + face for face in 'RUF' for k in range(2, n)] + [face + 'w' for face in 'RUF']
+        for move in moves + ['x', 'y', 'z']:
+            check(results, name + move + ' matches the geometry', perm(move) == size_geometric_perm(n, move))
+        for move in moves:
+            order = 2 if move.endswith('2') else 4
+            check(results, name + move + ' has order ' + str(order),
+                  repeat(perm(move), order) == size_identity and repeat(perm(move), order - 1) != size_identity)
+
+        for first, second in (('R', 'L'), ('U', 'D'), ('F', 'B')):
+            for k in range(2, n):
+                check(results, name + first + ' commutes with ' + str(k) + second,
+                      compose(perm(first), perm(str(k) + second)) == compose(perm(str(k) + second), perm(first)))
+
+        for face, letter in (('R', 'x'), ('U', 'y'), ('F', 'z')):
+            layers = perm(face)
+            for k in range(2, n + 1):
+                layers = compose(layers, perm(str(k) + face))
+            check(results, name + letter + ' turns every layer like ' + face, layers == perm(letter))
+            state = bytes(nxn_solved_state(n)[i] for i in perm(letter))
+            check(results, name + letter + ' turns the whole cube',
+                  all(len(set(state[n * n * face:n * n * face + n * n])) == 1 for face in range(6)))
+
+        check(results, name + 'Rw is R 2R', perm('Rw') == compose(perm('R'), perm('2R')))
+    return results
+
+def reference_states(sequences):
+    ''' Apply each move sequence to a Rubiks_Cube one move at a time
+        Returns: list of states as bytes '''
+
+    states = []
+    for sequence in sequences:
+        cube = Rubiks_Cube()
+        for move in sequence:
+            cube.move(move)
+        states.append(bytes(cube.state))
+    return states
+
+def algorithm_states(sequences):
+    ''' Apply each move sequence as one compiled algorithm '''
+
+    from algorithm import compile_algorithm
+
+    states = []
+    for sequence in sequences:
+        cube = Rubiks_Cube()
+        compile_algorithm(' '.join(sequence)).apply(cube)
+        states.append(bytes(cube.state))
+    return states
+
+def batch_states(sequences):
+    ''' Apply all the move sequences together in a Cube_Batch '''
+
+    from cube_batch import Cube_Batch
+
+    batch = Cube_Batch(len(sequences))
+    batch.scramble_each(sequences)
+    return [row.tobytes() for row in batch.states]
+
+def cubie_states(sequences):
+    ''' Apply each face turn sequence to a Cubie_Cube and write its stickers '''
+
+    from cubie_cube import Cubie_Cube, move_names, to_state
+
+    indices = {move: i for i, move in enumerate(move_names)}
+    states = []
+    for sequence in sequences:
+        cube = Cubie_Cube()
+        for move in sequence:
+            cube.move(indices[move])
+        states.append(to_state(cube))
+    return states
+
+def nxn_states(sequences):
+    ''' Apply each move sequence to a 3x3 NxN_Cube, whose moves are built
+        from the geometry of the cube rather than taken from move_tables '''
+
+    from nxn_cube import NxN_Cube
+
+    states = []
+    for sequence in sequences:
+        cube = NxN_Cube(3)
+        cube.scramble(sequence)
+        states.append(bytes(cube.state))
+    return states
+
+engines = {
+    'algorithm': (list(move_perms), algorithm_states),
+    'batch': (list(move_perms), batch_states),
+    'cubie': (face_turns, cubie_states),
+    'nxn': (list(move_perms), nxn_states),
+}
+''' maps each engine name to (moves it supports, function applying a list
+    of move sequences and returning the states as bytes) '''
+
+def check_engine(name, seed, count, length):
+    ''' Compare one engine against Rubiks_Cube on random move sequences
+        Parameters:
+            name - key of engines
+            seed - seed for the random sequences
+            count - number of sequences
+            length - moves in each sequence
+        Returns: (sequences checked, list of up to 5 sequences that disagree) '''
+
+    moves, run = engines[name]
+    rng = random.Random(seed)
+    sequences = [[rng.choice(moves) for i in range(length)] for j in range(count)]
+
+    mismatches = []
+    for sequence, expected, actual in zip(sequences, reference_states(sequences), run(sequences)):
+        if expected != actual and len(mismatches) < 5:
+            mismatches.append(' '.join(sequence))
+    return count, mismatches
+
+def check_engines(names, sequences, length, workers = None, chunk_size = 10000, seed = 0):
+    ''' Compare engines against Rubiks_Cube on all cores
+        Parameters:
+            names - engine names to check
+            sequences - number of random sequences per engine
+            length - moves in each sequence
+            workers - number of worker processes, all cores if None
+            chunk_size - sequences checked per task
+            seed - seed of the first chunk, each chunk uses the next one
+        Returns: dictionary mapping engine names to (sequences checked, mismatches) '''
+
+    workers = workers or os.cpu_count() or 1
+    tasks = []
+    for name in names:
+        for start in range(0, sequences, chunk_size):
+            tasks.append((name, seed + len(tasks), min(chunk_size, sequences - start), length))
+
+    if workers == 1:
+        outcomes = [check_engine(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            outcomes = list(pool.map(check_engine, *zip(*tasks)))
+
+    results = {name: (0, []) for name in names}
+    for (name, seed, count, length), (checked, mismatches) in zip(tasks, outcomes):
+        total, found = results[name]
+        results[name] = (total + checked, (found + mismatches)[:5])
+    return results
+
+def main(argv = None):
+    ''' Run the verification harness from the command line
+        Parameters:
+            argv - command line arguments, sys.argv if None
+        Returns: exit status, 1 if any check failed '''
+
+    parser = argparse.ArgumentParser(description = 'Verify the move model and cross-check faster engines against it.')
+    parser.add_argument('--sequences', type = int, default = 100000, help = 'random sequences per engine')
+    parser.add_argument('--length', type = int, default = 25, help = 'moves in each sequence')
+    parser.add_argument('--engines', nargs = '*', default = None, help = 'engines to check (default: all available)')
+    parser.add_argument('--seed', type = int, default = 0, help = 'seed of the random sequences')
+    parser.add_argument('-j', '--workers', type = int, default = None, help = 'number of worker processes (default: all cores)')
+    parser.add_argument('--chunk-size', type = int, default = 10000, help = 'sequences checked per task')
+    args = parser.parse_args(argv)
+
+    failed = False
+    for name, passed in check_group():
+        if not passed:
+            print('FAIL', name)
+            failed = True
+    print('group checks', 'failed' if failed else 'passed')
+
+    size_failed = False
+    for name, passed in check_sizes():
+        if not passed:
+            print('FAIL', name)
+            size_failed = True
+    print('size checks', 'failed' if size_failed else 'passed')
+    failed = failed or size_failed
+
+    names = args.engines
+    if names is None:
+        names = list(engines)
+        try:
+            import numpy
+        except ImportError:
+            print('batch skipped (NumPy is not installed)')
+            names.remove('batch')
+
+    results = check_engines(names, args.sequences, args.length, args.workers, args.chunk_size, args.seed)
+    for name, (checked, mismatches) in results.items():
+        print('{:<10} {:>10,} sequences {}'.format(name, checked, 'FAIL' if mismatches else 'ok'))
+        for sequence in mismatches:
+            print('    ' + sequence)
+        failed = failed or bool(mismatches)
+
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())